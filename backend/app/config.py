@@ -1,10 +1,24 @@
 from pydantic_settings import BaseSettings
 import json
+import time
+from typing import Optional
 import os
 
 
 class Settings(BaseSettings):
     database_url: str
+    database_mode: str = "sync"  # "sync" (threadpool) or "async" (AsyncSession on aiosqlite/asyncpg)
+    async_database_url: Optional[str] = None  # defaults to database_url with the async driver
+    read_database_url: Optional[str] = None  # replica for GET handlers; unset means reads use the primary
+    async_read_database_url: Optional[str] = None  # defaults to read_database_url with the async driver
+    read_your_writes_seconds: float = 5.0  # after a write, that client's reads stay on the primary this long
+    # Connection pools (PostgreSQL; SQLite uses SQLAlchemy's defaults)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    read_pool_size: int = 5
+    read_max_overflow: int = 10
+    read_pool_timeout: float = 30.0
     cors_origins: list[str] = [
         "http://localhost:3000",
         "http://localhost:5173",
@@ -16,6 +30,47 @@ class Settings(BaseSettings):
         "http://127.0.0.1:5175",
     ]
     api_v1_prefix: str = "/api/v1"
+    default_page_size: int = 100
+    max_page_size: int = 1000
+    stream_batch_size: int = 1000
+    import_chunk_size: int = 1000
+    import_max_errors: int = 1000  # per-row errors listed in an import report; the rest are only counted
+    attendance_group_commit: bool = False  # batch POST /attendance writes into shared transactions
+    group_commit_max_batch: int = 500
+    group_commit_max_wait_ms: float = 5.0  # how long the first queued mark waits for others to join its batch
+    # Marks waiting for a batch before further ones get a 503 with admission_retry_after_seconds;
+    # they skip the write admission class, so this is their admission_write_queue
+    group_commit_max_queue: int = 1000
+    employee_directory_max_entries: int = 100000  # employees kept in the in-process directory
+    employee_directory_check_seconds: float = 2.0  # how often lookups check for writes by other workers
+    dashboard_stream_max_clients: int = 10000  # open /dashboard/stream connections per worker
+    dashboard_stream_queue_size: int = 100  # undelivered events per client before it is dropped
+    dashboard_stream_heartbeat_seconds: float = 15.0
+    dashboard_stream_check_seconds: float = 2.0  # how often to look for writes by other workers while clients listen
+    # Admission control: requests per class allowed to run at once and to wait, per worker. Keep the
+    # three limits' sum within db_pool_size + db_max_overflow so admitted requests do not queue on the pool.
+    admission_control: bool = True
+    admission_write_limit: int = 6
+    admission_write_queue: int = 200
+    admission_read_limit: int = 6
+    admission_read_queue: int = 200
+    admission_heavy_limit: int = 2  # exports, imports, reports, searches, streamed or unpaginated lists
+    admission_heavy_queue: int = 8
+    admission_queue_timeout_seconds: float = 5.0  # longest wait for a slot before a 503
+    admission_retry_after_seconds: int = 2
+    report_default_days: int = 90
+    report_max_days: int = 366
+    search_default_limit: int = 50
+    search_max_limit: int = 200
+    metrics_enabled: bool = True  # query timing hooks, Server-Timing header and /metrics
+    query_diagnostics: bool = False  # fingerprint statements per request; needs metrics_enabled
+    query_repeat_threshold: int = 5  # warn when one statement fingerprint runs more often per request
+    slow_query_ms: float = 200.0
+    cache_backend: str = "memory"  # "memory" or "none"
+    cache_max_entries: int = 1024
+    cache_ttl_seconds: float = 30.0
+    cache_max_result_rows: int = 5000
+    cache_max_result_bytes: int = 4 * 1024 * 1024
     
     class Config:
         env_file = ".env"
@@ -30,4 +85,7 @@ class Settings(BaseSettings):
                 self.cors_origins = [cors_env] if cors_env else self.cors_origins
 
 
+_started = time.perf_counter()
 settings = Settings()
+# Reported in the startup timing log
+settings_load_seconds = time.perf_counter() - _started
@@ -1,26 +1,135 @@
-from sqlalchemy import create_engine
+import hashlib
+import time
+from typing import List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, delete, event, insert, inspect, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.utils.cache import cache_bypass
+from app.utils.logger import logger
+from app.utils.metrics import instrument_engine, timed_pool_class
+from app.utils.replica import reads_from_primary
 
-connect_args = {}
-if settings.database_url.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
-    engine = create_engine(settings.database_url, connect_args=connect_args)
-else:
-    engine = create_engine(
-        settings.database_url,
-        pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10
-    )
+
+def _pool_options(read: bool) -> dict:
+    if read:
+        return {
+            "pool_size": settings.read_pool_size,
+            "max_overflow": settings.read_max_overflow,
+            "pool_timeout": settings.read_pool_timeout,
+        }
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+
+
+def _read_only(engine: Engine) -> None:
+    """Refuse writes on replica connections, so a misrouted write fails instead of diverging."""
+    @event.listens_for(engine, "connect")
+    def set_read_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if engine.dialect.name == "sqlite":
+            cursor.execute("PRAGMA query_only = ON")
+        elif engine.dialect.name == "postgresql":
+            cursor.execute("SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY")
+        cursor.close()
+
+
+def _enforce_foreign_keys(engine: Engine) -> None:
+    """SQLite ignores foreign keys (and so ON DELETE CASCADE) unless each connection turns them on."""
+    @event.listens_for(engine, "connect")
+    def set_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.close()
+
+
+def _engine_options(url: str, name: str, read: bool) -> dict:
+    options = {"poolclass": timed_pool_class(url, name)} if settings.metrics_enabled else {}
+    if url.startswith("sqlite"):
+        return options
+    return {"pool_pre_ping": True, **options, **_pool_options(read)}
+
+
+def _instrument(engine: Engine, url: str, name: str, read: bool = False) -> None:
+    if settings.metrics_enabled:
+        # SQLite keeps SQLAlchemy's default pool sizing, so its saturation is not known here
+        max_overflow = None if url.startswith("sqlite") else _pool_options(read)["max_overflow"]
+        instrument_engine(engine, name, max_overflow)
+
+
+def _sync_engine(url: str, name: str, read: bool = False) -> Engine:
+    if url.startswith("sqlite"):
+        sqlite_engine = create_engine(
+            url, connect_args={"check_same_thread": False}, **_engine_options(url, name, read)
+        )
+        _enforce_foreign_keys(sqlite_engine)
+        return sqlite_engine
+    return create_engine(url, **_engine_options(url, name, read))
+
+
+# Writes (and reads when no replica is configured) go to the primary
+engine = _sync_engine(settings.database_url, "sync")
+_instrument(engine, settings.database_url, "sync")
+read_engine = engine
+if settings.read_database_url:
+    read_engine = _sync_engine(settings.read_database_url, "sync-read", read=True)
+    _read_only(read_engine)
+    _instrument(read_engine, settings.read_database_url, "sync-read", read=True)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
 
-def get_db():
+def _async_database_url(url: str, configured: Optional[str] = None) -> str:
+    if configured:
+        return configured
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+# In async mode requests use these; the sync engine above still serves startup DDL and scripts
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if settings.database_mode == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    def _async_engine(url: str, name: str, read: bool = False):
+        if url.startswith("sqlite"):
+            sqlite_engine = create_async_engine(url, **_engine_options(url, name, read))
+            _enforce_foreign_keys(sqlite_engine.sync_engine)
+            return sqlite_engine
+        return create_async_engine(url, **_engine_options(url, name, read))
+
+    _async_url = _async_database_url(settings.database_url, settings.async_database_url)
+    async_engine = _async_engine(_async_url, "async")
+    # Events attach to the sync core that AsyncEngine wraps
+    _instrument(async_engine.sync_engine, _async_url, "async")
+    async_read_engine = async_engine
+    if settings.read_database_url:
+        _async_read_url = _async_database_url(settings.read_database_url, settings.async_read_database_url)
+        async_read_engine = _async_engine(_async_read_url, "async-read", read=True)
+        _read_only(async_read_engine.sync_engine)
+        _instrument(async_read_engine.sync_engine, _async_read_url, "async-read", read=True)
+    # Objects are serialized after the greenlet bridge returns, so they must not expire on commit
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
@@ -28,5 +137,170 @@ def get_db():
         db.close()
 
 
-def init_db():
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+get_db = get_async_db if AsyncSessionLocal is not None else get_sync_db
+
+
+async def get_read_db(request: Request):
+    """Session for GET handlers: the replica when configured, unless this client wrote recently.
+
+    Reads that stay on the primary also skip the result cache, which may
+    hold rows loaded from a lagging replica.
+    """
+    primary = read_engine is engine or reads_from_primary(request, time.time())
+    # Set on every read (not reset afterwards) so the flag never leaks from one request into the next
+    cache_bypass.set(primary and read_engine is not engine)
+    if primary:
+        sessions = _sessions(AsyncSessionLocal, SessionLocal)
+    else:
+        sessions = _sessions(AsyncReadSessionLocal, ReadSessionLocal)
+    async for db in sessions:
+        yield db
+
+
+async def _sessions(async_factory, sync_factory):
+    if async_factory is not None:
+        async with async_factory() as db:
+            yield db
+        return
+    db = sync_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """Run sync repository/service code against either session kind without blocking the event loop.
+
+    A sync Session runs in the threadpool; an AsyncSession runs the same code
+    through SQLAlchemy's greenlet bridge on the async driver.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args, **kwargs)
+    return await db.run_sync(lambda session: fn(session, *args, **kwargs))
+
+
+def db_loader(db, fn, *args, **kwargs):
+    """fn(db, ...) as a zero-argument loader for use while streaming.
+
+    Calling it runs fn directly on a sync Session (streams are iterated in
+    the threadpool) and returns an awaitable on an AsyncSession.
+    """
+    if isinstance(db, Session):
+        return lambda: fn(db, *args, **kwargs)
+    return lambda: db.run_sync(lambda session: fn(session, *args, **kwargs))
+
+
+async def run_in_session(fn, *args, **kwargs):
+    """run_db on a session of its own, for work that doesn't belong to one request."""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            return await run_db(db, fn, *args, **kwargs)
+    db = SessionLocal()
+    try:
+        return await run_db(db, fn, *args, **kwargs)
+    finally:
+        db.close()
+
+
+async def stream_scalars(db, statement, batch_size: int):
+    """Execute a select for incremental iteration; returns a sync or async iterable to match the session."""
+    statement = statement.execution_options(yield_per=batch_size)
+    if isinstance(db, Session):
+        return await run_in_threadpool(db.scalars, statement)
+    return await db.stream_scalars(statement)
+
+
+async def stream_rows(db, statement, batch_size: int):
+    """Like stream_scalars, for statements that select individual columns."""
+    statement = statement.execution_options(yield_per=batch_size)
+    if isinstance(db, Session):
+        return await run_in_threadpool(db.execute, statement)
+    return await db.stream(statement)
+
+
+def schema_fingerprint() -> str:
+    """Hash of every table, column, index and constraint the models declare."""
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"{table.name} {sorted(table.dialect_kwargs.items())}")
+        for column in table.columns:
+            foreign_keys = sorted(fk.target_fullname for fk in column.foreign_keys)
+            parts.append(f"  {column.name} {column.type!r} {column.nullable} {column.primary_key} {foreign_keys}")
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            parts.append(f"  index {index.name} {[c.name for c in index.columns]} {index.unique}")
+        # table.constraints is a set and unnamed ones share a name, so sort the descriptions
+        parts += sorted(
+            f"  constraint {type(constraint).__name__} {constraint.name} {sorted(c.name for c in constraint.columns)}"
+            for constraint in table.constraints
+        )
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _create_missing_indexes() -> None:
+    """create_all skips tables that already exist, and with them any index added to a model later."""
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+
+
+def _missing_schema() -> List[str]:
+    """Tables, columns and indexes the models declare that the database lacks."""
+    inspector = inspect(engine)
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            missing.append(table.name)
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing += [f"{table.name}.{column.name}" for column in table.columns if column.name not in columns]
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing += [index.name for index in table.indexes if index.name not in indexes]
+    return missing
+
+
+def init_db() -> bool:
+    """Create missing tables and indexes unless schema_version shows they are current.
+
+    A current schema costs one primary-key lookup instead of create_all's
+    per-table inspection. The fingerprint is only recorded once every
+    declared table, column and index exists; create_all cannot add columns
+    to existing tables, so until they are added by hand every start checks
+    again. Returns True when the schema was checked and (re)created.
+    """
+    from app.models import SchemaVersion
+    from app.repositories import employee_search
+    
+    # Core columns, so the check does not pull in mapper configuration
+    version = SchemaVersion.__table__
+    fingerprint = schema_fingerprint()
+    try:
+        with engine.connect() as connection:
+            current = connection.execute(
+                select(version.c.fingerprint, version.c.search_backend).where(version.c.id == 1)
+            ).first()
+    except DBAPIError:
+        current = None  # no schema_version table yet
+    if current is not None and current.fingerprint == fingerprint:
+        employee_search.use_search(current.search_backend)
+        return False
+    
     Base.metadata.create_all(bind=engine)
+    _create_missing_indexes()
+    search_backend = employee_search.setup_search(engine)
+    missing = _missing_schema()
+    if missing:
+        logger.warning(f"Schema not marked current, the database lacks: {', '.join(missing)}")
+        return True
+    with engine.begin() as connection:
+        connection.execute(delete(version))
+        connection.execute(
+            insert(version).values(id=1, fingerprint=fingerprint, search_backend=search_backend)
+        )
+    return True
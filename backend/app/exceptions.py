@@ -16,3 +16,15 @@ class DuplicateAttendanceError(HRMSException):
 
 class InvalidDateError(HRMSException):
     pass
+
+
+class InvalidCursorError(HRMSException):
+    pass
+
+
+class ArchiveError(HRMSException):
+    pass
+
+
+class InvalidCsvError(HRMSException):
+    pass
@@ -1,8 +1,13 @@
+import asyncio
+import time
+
+_started = time.perf_counter()
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from app.config import settings
-from app.routers.v1 import health, employees, attendance, dashboard
+from app.config import settings, settings_load_seconds
+from app.routers.v1 import health, metrics, employees, attendance, dashboard, reports
 from app.exceptions import (
     HRMSException,
     EmployeeNotFoundError,
@@ -10,11 +15,22 @@ from app.exceptions import (
     DuplicateAttendanceError,
     InvalidDateError
 )
+from app.utils.admission import AdmissionMiddleware
 from app.utils.logger import logger
-from app.database import init_db
+from app.utils.metrics import MetricsMiddleware
+from app.utils.replica import ReadYourWritesMiddleware
+from app.database import engine, init_db, run_in_session
+from app.services import backfill_service
+from app.services.employee_directory import employee_directory
+
+import_seconds = time.perf_counter() - _started
 
 app = FastAPI(title="HRMS Lite API", version="1.0.0")
 
+# Added before CORS so that 503s from admission control still carry the CORS headers
+if settings.admission_control:
+    app.add_middleware(AdmissionMiddleware)
+
 cors_origins_list = settings.cors_origins if isinstance(settings.cors_origins, list) else [settings.cors_origins]
 
 # Allow Vercel deployments (main + previews); exact list from CORS_ORIGINS still applied
@@ -25,8 +41,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization", "Accept"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
+if settings.read_database_url:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 
 @app.exception_handler(HRMSException)
 async def hrms_exception_handler(request: Request, exc: HRMSException):
@@ -40,13 +63,59 @@ async def hrms_exception_handler(request: Request, exc: HRMSException):
     )
 
 
+_backfill_task = None
+
+
+async def _backfill_derived_tables():
+    logger.warning("Attendance rollup and bitmaps have never been built; backfilling them from attendance history")
+    started = time.perf_counter()
+    try:
+        rollup_rows, bitmaps = await run_in_session(backfill_service.backfill)
+    except Exception:
+        # Left unmarked, so the next start tries again; scripts/rebuild_rollup.py does the same by hand
+        logger.exception("Backfill of the attendance rollup and bitmaps failed")
+        return
+    logger.info(
+        f"Backfilled {rollup_rows} rollup rows and {bitmaps} attendance bitmaps "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+
+
 @app.on_event("startup")
 async def startup_event():
-    init_db()
-    logger.info("HRMS Lite API started")
+    global _backfill_task
+    started = time.perf_counter()
+    with engine.connect():
+        pass
+    connected = time.perf_counter()
+    created = init_db()
+    checked = time.perf_counter()
+    employees = await run_in_session(employee_directory.load)
+    warmed = time.perf_counter()
+    if await run_in_session(backfill_service.needs_backfill):
+        # In the background, so a large history doesn't hold up the health check
+        _backfill_task = asyncio.create_task(_backfill_derived_tables())
+    if settings.attendance_group_commit:
+        await attendance.attendance_writer.start()
+    await dashboard.start_stream()
+    logger.info(
+        f"HRMS Lite API started: imports {import_seconds * 1000:.0f} ms, "
+        f"settings {settings_load_seconds * 1000:.0f} ms, "
+        f"engine connect {(connected - started) * 1000:.0f} ms, "
+        f"schema check {(checked - connected) * 1000:.0f} ms ({'created' if created else 'current'}), "
+        f"employee directory {(warmed - checked) * 1000:.0f} ms ({employees} employees)"
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await dashboard.stop_stream()
+    await attendance.attendance_writer.stop()
 
 
 app.include_router(health.router, prefix="/health", tags=["health"])
+app.include_router(metrics.router, prefix="/metrics", tags=["health"])
 app.include_router(dashboard.router, prefix=settings.api_v1_prefix + "/dashboard", tags=["dashboard"])
 app.include_router(employees.router, prefix=settings.api_v1_prefix + "/employees", tags=["employees"])
 app.include_router(attendance.router, prefix=settings.api_v1_prefix + "/attendance", tags=["attendance"])
+app.include_router(reports.router, prefix=settings.api_v1_prefix + "/reports", tags=["reports"])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, LargeBinary, Enum as SQLEnum, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import date
@@ -21,7 +21,8 @@ class Employee(Base):
     department = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    attendance = relationship("Attendance", back_populates="employee", cascade="all, delete-orphan")
+    # The database deletes attendance with its employee (ON DELETE CASCADE); the ORM never loads it to do so
+    attendance = relationship("Attendance", back_populates="employee", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Attendance(Base):
@@ -37,4 +38,83 @@ class Attendance(Base):
     
     __table_args__ = (
         UniqueConstraint('employee_id', 'date', name='unique_employee_date'),
+        # Serves keyset pagination ordered by (date desc, id desc)
+        Index('ix_attendance_date_id', 'date', 'id'),
+        # Never reuse ids on SQLite: archived rows keep theirs and may be restored
+        {'sqlite_autoincrement': True},
     )
+
+
+class AttendanceDailyRollup(Base):
+    """Present/absent counters per department per day, maintained alongside attendance writes."""
+    __tablename__ = "attendance_daily_rollup"
+    
+    date = Column(Date, primary_key=True)
+    department = Column(String, primary_key=True)
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+
+
+class AttendanceBitmap(Base):
+    """One employee's attendance for one year as two bitsets, maintained alongside attendance writes.
+
+    Bit n (little-endian bytes) is day n of the year, counting 1 January as
+    day 0. `marked` has a bit per day with any record, `present` per day
+    marked Present.
+    """
+    __tablename__ = "attendance_bitmaps"
+    
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    marked = Column(LargeBinary, nullable=False)
+    present = Column(LargeBinary, nullable=False)
+
+
+class AttendanceArchive(Base):
+    """One employee's attendance for one archived month, moved out of the attendance table.
+
+    `days` and `present` are bitsets over the days of the month (bit 0 is the
+    1st). `payload` holds the remaining columns for the marked days in day
+    order, zlib-compressed (see archive_repo).
+    """
+    __tablename__ = "attendance_archive"
+    
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month
+    days = Column(Integer, nullable=False)
+    present = Column(Integer, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+    
+    __table_args__ = (
+        Index('ix_attendance_archive_month', 'month'),
+    )
+
+
+class AttendanceArchiveMonth(Base):
+    """Manifest entry for an archived month: row count and an order-independent checksum of its rows."""
+    __tablename__ = "attendance_archive_months"
+    
+    month = Column(Date, primary_key=True)
+    rows = Column(Integer, nullable=False)
+    checksum = Column(String, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class SchemaVersion(Base):
+    """Single row recording which schema startup last created (see database.init_db)."""
+    __tablename__ = "schema_version"
+    
+    id = Column(Integer, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    search_backend = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class TableVersion(Base):
+    """Change counter per table, bumped in the same transaction as each write (see version_repo)."""
+    __tablename__ = "table_versions"
+    
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
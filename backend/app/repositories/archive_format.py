@@ -0,0 +1,100 @@
+"""Compressed storage format for one employee-month of archived attendance.
+
+A month is a bitmask of marked days, a bitmask of present days and a
+zlib payload: a header (flags, row count), then one int64 column of ids and
+one of created_at in microseconds since the epoch, both in day order.
+"""
+
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+import hashlib
+import struct
+import zlib
+from app.models import AttendanceStatus
+
+_HEADER = struct.Struct("<BH")
+_TZ_AWARE = 1
+_NO_TIMESTAMP = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1)
+
+
+class ArchivedRow(NamedTuple):
+    """Same shape as the (id, employee_id, date, status, created_at) rows of attendance_repo."""
+    id: int
+    employee_id: int
+    date: date
+    status: AttendanceStatus
+    created_at: Optional[datetime]
+
+
+def _micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return _NO_TIMESTAMP
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _timestamp(micros: int, aware: bool) -> Optional[datetime]:
+    if micros == _NO_TIMESTAMP:
+        return None
+    value = _EPOCH + timedelta(microseconds=micros)
+    return value.replace(tzinfo=timezone.utc) if aware else value
+
+
+def marked_days(mask: int) -> List[int]:
+    """Days of the month (1-based) whose bit is set."""
+    return [bit + 1 for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+
+def encode(records: Iterable[Tuple[int, date, AttendanceStatus, Optional[datetime]]]) -> Tuple[int, int, bytes]:
+    """Pack one employee-month of (id, date, status, created_at) into (days, present, payload)."""
+    records = sorted(records, key=lambda record: record[1])
+    days = present = 0
+    ids, created = array("q"), array("q")
+    aware = False
+    for record_id, on_date, status, created_at in records:
+        bit = 1 << (on_date.day - 1)
+        days |= bit
+        if status == AttendanceStatus.PRESENT:
+            present |= bit
+        ids.append(record_id)
+        created.append(_micros(created_at))
+        aware = aware or (created_at is not None and created_at.tzinfo is not None)
+    header = _HEADER.pack(_TZ_AWARE if aware else 0, len(records))
+    return days, present, zlib.compress(header + ids.tobytes() + created.tobytes())
+
+
+def decode(employee_id: int, month: date, days: int, present: int, payload: bytes) -> List[ArchivedRow]:
+    data = zlib.decompress(payload)
+    flags, count = _HEADER.unpack_from(data)
+    ids, created = array("q"), array("q")
+    offset = _HEADER.size
+    ids.frombytes(data[offset:offset + 8 * count])
+    created.frombytes(data[offset + 8 * count:offset + 16 * count])
+    aware = bool(flags & _TZ_AWARE)
+    return [
+        ArchivedRow(
+            ids[i],
+            employee_id,
+            month.replace(day=day),
+            AttendanceStatus.PRESENT if present >> (day - 1) & 1 else AttendanceStatus.ABSENT,
+            _timestamp(created[i], aware)
+        )
+        for i, day in enumerate(marked_days(days))
+    ]
+
+
+def row_hash(row_id: int, employee_id: int, on_date: date, status: AttendanceStatus, created_at: Optional[datetime]) -> int:
+    digest = hashlib.blake2b(
+        struct.pack("<qqiBq", row_id, employee_id, on_date.toordinal(),
+                    status == AttendanceStatus.PRESENT, _micros(created_at)),
+        digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+def checksum(value: int) -> str:
+    return f"{value:016x}"
@@ -0,0 +1,411 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select, text
+from app.models import Attendance, AttendanceArchive, AttendanceArchiveMonth, AttendanceStatus, Employee
+from app.repositories import archive_format, employee_repo, version_repo
+from app.repositories.archive_format import ArchivedRow, decode, encode
+from app.exceptions import ArchiveError
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from datetime import date, datetime, timedelta
+
+
+class MonthCheck(NamedTuple):
+    month: date
+    expected_rows: int
+    rows: int
+    expected_checksum: str
+    checksum: str
+    hot_rows: int
+
+    @property
+    def ok(self) -> bool:
+        return self.rows == self.expected_rows and self.checksum == self.expected_checksum
+
+
+def month_start(on_date: date) -> date:
+    return on_date.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def first_open_month() -> date:
+    """Months before this one are closed and may be archived."""
+    return month_start(date.today())
+
+
+def get_months(db: Session) -> List[AttendanceArchiveMonth]:
+    return db.scalars(select(AttendanceArchiveMonth).order_by(AttendanceArchiveMonth.month)).all()
+
+
+def has_months(db: Session) -> bool:
+    return db.scalar(select(AttendanceArchiveMonth.month).limit(1)) is not None
+
+
+def get_archived_months(
+    db: Session,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None
+) -> List[date]:
+    """Archived months overlapping [from_date, to_date], newest first. Skips the query for open months."""
+    if from_date and from_date >= first_open_month():
+        return []
+    stmt = select(AttendanceArchiveMonth.month)
+    if from_date:
+        stmt = stmt.where(AttendanceArchiveMonth.month >= month_start(from_date))
+    if to_date:
+        stmt = stmt.where(AttendanceArchiveMonth.month <= to_date)
+    return db.scalars(stmt.order_by(AttendanceArchiveMonth.month.desc())).all()
+
+
+def get_rows(
+    db: Session,
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None,
+    after: Optional[Tuple[date, int]] = None,
+    limit: Optional[int] = None
+) -> List[ArchivedRow]:
+    """Archived rows with attendance_repo.get_attendance_rows' filters and (date desc, id desc) order.
+
+    Months are read newest first and reading stops once `limit` rows are
+    collected. Within a month the day bitsets pick out the employee-months
+    that can reach the page before any payload is decompressed.
+    """
+    if after:
+        to_date = min(to_date, after[0]) if to_date else after[0]
+    months = get_archived_months(db, from_date, to_date)
+
+    rows: List[ArchivedRow] = []
+    for month in months:
+        stmt = select(
+            AttendanceArchive.employee_id,
+            AttendanceArchive.days,
+            AttendanceArchive.present,
+            AttendanceArchive.payload
+        ).where(AttendanceArchive.month == month)
+        if employee_id:
+            stmt = stmt.where(AttendanceArchive.employee_id == employee_id)
+        if departments and len(departments) > 0:
+            stmt = stmt.join(Employee, Employee.id == AttendanceArchive.employee_id).where(
+                Employee.department.in_(departments)
+            )
+
+        first_day = from_date.day if from_date and month_start(from_date) == month else 1
+        last_day = to_date.day if to_date and month_start(to_date) == month else 31
+        in_range = sum(1 << (day - 1) for day in range(first_day, last_day + 1))
+        candidates = [archive for archive in db.execute(stmt) if archive.days & in_range]
+
+        if limit:
+            # Only employee-months with a day at or after the limit-th newest day can make the page
+            needed = limit - len(rows)
+            # (the cursor's own day is not counted: some of its rows precede the cursor)
+            uncounted = after[0].day if after and month_start(after[0]) == month else 0
+            day_counts: Dict[int, int] = {}
+            for archive in candidates:
+                for day in archive_format.marked_days(archive.days & in_range):
+                    if day == uncounted:
+                        continue
+                    day_counts[day] = day_counts.get(day, 0) + 1
+            cutoff, seen = 1, 0
+            for day in sorted(day_counts, reverse=True):
+                seen += day_counts[day]
+                if seen >= needed:
+                    cutoff = day
+                    break
+            cutoff_mask = in_range & ~((1 << (cutoff - 1)) - 1)
+            candidates = [archive for archive in candidates if archive.days & cutoff_mask]
+
+        month_rows = [
+            row
+            for archive in candidates
+            for row in decode(archive.employee_id, month, archive.days, archive.present, archive.payload)
+            if in_range >> (row.date.day - 1) & 1
+            and (after is None or (row.date, row.id) < after)
+        ]
+        month_rows.sort(key=lambda row: (row.date, row.id), reverse=True)
+        rows.extend(month_rows)
+        if limit and len(rows) >= limit:
+            return rows[:limit]
+    return rows
+
+
+def has_record(db: Session, employee_id: int, on_date: date) -> bool:
+    if on_date >= first_open_month():
+        return False
+    days = db.scalar(
+        select(AttendanceArchive.days).where(
+            AttendanceArchive.employee_id == employee_id,
+            AttendanceArchive.month == month_start(on_date)
+        )
+    )
+    return bool(days and days >> (on_date.day - 1) & 1)
+
+
+def get_existing_keys(
+    db: Session,
+    employee_ids: Iterable[int],
+    from_date: date,
+    to_date: date
+) -> Set[Tuple[int, date]]:
+    """(employee_id, date) pairs within the range that are already archived."""
+    if from_date >= first_open_month():
+        return set()
+    ids = sorted(set(employee_ids))
+    existing: Set[Tuple[int, date]] = set()
+    for start in range(0, len(ids), employee_repo.IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start:start + employee_repo.IN_CLAUSE_CHUNK_SIZE]
+        rows = db.execute(
+            select(AttendanceArchive.employee_id, AttendanceArchive.month, AttendanceArchive.days).where(
+                AttendanceArchive.employee_id.in_(chunk),
+                AttendanceArchive.month >= month_start(from_date),
+                AttendanceArchive.month <= to_date
+            )
+        )
+        for employee_id, month, days in rows:
+            existing.update(
+                (employee_id, month.replace(day=day))
+                for day in archive_format.marked_days(days)
+                if from_date <= month.replace(day=day) <= to_date
+            )
+    return existing
+
+
+def get_history(db: Session, employee_ids: Iterable[int]) -> List[Tuple[str, date, AttendanceStatus]]:
+    """(department, date, status) of every archived row of these employees, read from the bitsets alone."""
+    ids = sorted(set(employee_ids))
+    history = []
+    for start in range(0, len(ids), employee_repo.IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start:start + employee_repo.IN_CLAUSE_CHUNK_SIZE]
+        rows = db.execute(
+            select(Employee.department, AttendanceArchive.month, AttendanceArchive.days, AttendanceArchive.present)
+            .join(Employee, Employee.id == AttendanceArchive.employee_id)
+            .where(AttendanceArchive.employee_id.in_(chunk))
+        )
+        history += [
+            (department, month.replace(day=day), AttendanceStatus.PRESENT if present >> (day - 1) & 1 else AttendanceStatus.ABSENT)
+            for department, month, days, present in rows
+            for day in archive_format.marked_days(days)
+        ]
+    return history
+
+
+def iter_history(db: Session, batch_size: int = 10_000) -> Iterator[Tuple[int, str, date, AttendanceStatus]]:
+    """(employee_id, department, date, status) for every archived row, for rebuilding derived tables."""
+    rows = db.execute(
+        select(
+            AttendanceArchive.employee_id,
+            Employee.department,
+            AttendanceArchive.month,
+            AttendanceArchive.days,
+            AttendanceArchive.present
+        )
+        .join(Employee, Employee.id == AttendanceArchive.employee_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for employee_id, department, month, days, present in rows:
+        for day in archive_format.marked_days(days):
+            status = AttendanceStatus.PRESENT if present >> (day - 1) & 1 else AttendanceStatus.ABSENT
+            yield employee_id, department, month.replace(day=day), status
+
+
+def remove_employees(db: Session, employee_ids: Iterable[int]) -> None:
+    """Take these employees' archived rows out of the manifest; the caller owns the commit.
+
+    The archive rows themselves go when the employees are deleted (ON DELETE CASCADE).
+    """
+    ids = sorted(set(employee_ids))
+    archives = []
+    for start in range(0, len(ids), employee_repo.IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start:start + employee_repo.IN_CLAUSE_CHUNK_SIZE]
+        archives += db.execute(
+            select(
+                AttendanceArchive.employee_id,
+                AttendanceArchive.month,
+                AttendanceArchive.days,
+                AttendanceArchive.present,
+                AttendanceArchive.payload
+            ).where(AttendanceArchive.employee_id.in_(chunk))
+        ).all()
+    if not archives:
+        return
+    manifests = {
+        manifest.month: manifest
+        for manifest in db.scalars(
+            select(AttendanceArchiveMonth)
+            .where(AttendanceArchiveMonth.month.in_({archive.month for archive in archives}))
+            .with_for_update()
+        )
+    }
+    checksums = {month: int(manifest.checksum, 16) for month, manifest in manifests.items()}
+    for archive in archives:
+        rows = decode(archive.employee_id, archive.month, archive.days, archive.present, archive.payload)
+        for row in rows:
+            checksums[archive.month] ^= archive_format.row_hash(*row)
+        manifests[archive.month].rows -= len(rows)
+    for month, checksum in checksums.items():
+        manifests[month].checksum = archive_format.checksum(checksum)
+    db.flush()
+
+
+def _write_batch(
+    db: Session,
+    month: date,
+    batch: Dict[int, List[Tuple[int, date, AttendanceStatus, Optional[datetime]]]],
+    merge: bool
+) -> int:
+    """Insert one batch of employee-months; with merge, fold in what is already archived for them."""
+    if merge:
+        existing = db.execute(
+            select(
+                AttendanceArchive.employee_id,
+                AttendanceArchive.days,
+                AttendanceArchive.present,
+                AttendanceArchive.payload
+            ).where(AttendanceArchive.month == month, AttendanceArchive.employee_id.in_(list(batch)))
+        ).all()
+        for archive in existing:
+            batch[archive.employee_id] += [
+                (row.id, row.date, row.status, row.created_at)
+                for row in decode(archive.employee_id, month, archive.days, archive.present, archive.payload)
+            ]
+        if existing:
+            db.execute(delete(AttendanceArchive).where(
+                AttendanceArchive.month == month,
+                AttendanceArchive.employee_id.in_([archive.employee_id for archive in existing])
+            ))
+
+    values = []
+    for employee_id, records in batch.items():
+        days, present, payload = encode(records)
+        values.append({
+            "employee_id": employee_id, "month": month,
+            "days": days, "present": present, "payload": payload
+        })
+    db.execute(insert(AttendanceArchive), values)
+    return len(values)
+
+
+def _check_ids_not_reused(db: Session) -> None:
+    """SQLite hands out max(id) + 1 unless the table is AUTOINCREMENT, which would reuse archived ids."""
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    table_sql = db.scalar(
+        select(text("sql")).select_from(text("sqlite_master")).where(text("name = :name")),
+        {"name": Attendance.__tablename__}
+    )
+    if table_sql and "AUTOINCREMENT" not in table_sql.upper():
+        raise ArchiveError(
+            "The SQLite attendance table was created without AUTOINCREMENT and would reuse archived ids; "
+            "recreate the database file before archiving"
+        )
+
+
+def archive_month(db: Session, month: date, batch_size: int = 1000) -> int:
+    """Move a closed month's attendance rows into the archive in one transaction; returns rows moved.
+
+    Rows marked into an already archived month since it was archived are
+    merged into the existing archive. The rollup and bitmaps still count
+    archived rows, so they are left alone.
+    """
+    month = month_start(month)
+    if month >= first_open_month():
+        raise ArchiveError(f"{month:%Y-%m} is not a closed month")
+    _check_ids_not_reused(db)
+    end = next_month(month)
+    manifest = db.scalars(
+        select(AttendanceArchiveMonth).where(AttendanceArchiveMonth.month == month).with_for_update()
+    ).first()
+    merge = manifest is not None
+
+    rows = db.execute(
+        select(Attendance.id, Attendance.employee_id, Attendance.date, Attendance.status, Attendance.created_at)
+        .where(Attendance.date >= month, Attendance.date < end)
+        .order_by(Attendance.employee_id)
+        .execution_options(yield_per=batch_size * 31)
+    )
+    moved = 0
+    checksum = int(manifest.checksum, 16) if merge else 0
+    batch: Dict[int, List[Tuple[int, date, AttendanceStatus, Optional[datetime]]]] = {}
+    for row_id, employee_id, on_date, status, created_at in rows:
+        # Rows arrive grouped by employee, so flushing between employees never splits an employee-month
+        if employee_id not in batch and len(batch) >= batch_size:
+            _write_batch(db, month, batch, merge)
+            batch = {}
+        batch.setdefault(employee_id, []).append((row_id, on_date, status, created_at))
+        checksum ^= archive_format.row_hash(row_id, employee_id, on_date, status, created_at)
+        moved += 1
+    if batch:
+        _write_batch(db, month, batch, merge)
+
+    if merge:
+        manifest.rows += moved
+        manifest.checksum = archive_format.checksum(checksum)
+        manifest.archived_at = func.now()
+    else:
+        db.add(AttendanceArchiveMonth(month=month, rows=moved, checksum=archive_format.checksum(checksum)))
+    db.execute(delete(Attendance).where(Attendance.date >= month, Attendance.date < end))
+    version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    return moved
+
+
+def restore_month(db: Session, month: date, batch_size: int = 1000) -> int:
+    """Move an archived month back into the attendance table with its original ids; returns rows restored."""
+    month = month_start(month)
+    manifest = db.get(AttendanceArchiveMonth, month)
+    if manifest is None:
+        raise ArchiveError(f"{month:%Y-%m} is not archived")
+
+    archives = db.execute(
+        select(
+            AttendanceArchive.employee_id,
+            AttendanceArchive.days,
+            AttendanceArchive.present,
+            AttendanceArchive.payload
+        )
+        .where(AttendanceArchive.month == month)
+    ).all()
+    restored = 0
+    for start in range(0, len(archives), batch_size):
+        values = [
+            row._asdict()
+            for archive in archives[start:start + batch_size]
+            for row in decode(archive.employee_id, month, archive.days, archive.present, archive.payload)
+        ]
+        if values:
+            db.execute(insert(Attendance), values)
+        restored += len(values)
+    db.execute(delete(AttendanceArchive).where(AttendanceArchive.month == month))
+    db.delete(manifest)
+    version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    return restored
+
+
+def verify_month(db: Session, month: date) -> MonthCheck:
+    """Decode every employee-month and compare row count and checksum with the manifest."""
+    month = month_start(month)
+    manifest = db.get(AttendanceArchiveMonth, month)
+    if manifest is None:
+        raise ArchiveError(f"{month:%Y-%m} is not archived")
+
+    rows = 0
+    checksum = 0
+    archives = db.execute(
+        select(
+            AttendanceArchive.employee_id,
+            AttendanceArchive.days,
+            AttendanceArchive.present,
+            AttendanceArchive.payload
+        ).where(AttendanceArchive.month == month)
+    )
+    for archive in archives:
+        for row in decode(archive.employee_id, month, archive.days, archive.present, archive.payload):
+            checksum ^= archive_format.row_hash(*row)
+            rows += 1
+    hot_rows = db.scalar(
+        select(func.count(Attendance.id)).where(Attendance.date >= month, Attendance.date < next_month(month))
+    )
+    return MonthCheck(month, manifest.rows, rows, manifest.checksum, archive_format.checksum(checksum), hot_rows or 0)
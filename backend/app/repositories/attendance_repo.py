@@ -1,60 +1,279 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.models import Attendance, Employee
+from sqlalchemy import Row, Select, and_, or_, func, insert, select
+from app.models import Attendance, AttendanceStatus, Employee
 from app.schemas import AttendanceCreate
-from typing import List, Optional
+from app.repositories import archive_repo, bitmap_repo, bulk_load, rollup_repo, version_repo
+from app.repositories.employee_repo import IN_CLAUSE_CHUNK_SIZE
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import date
 
 
-def create_attendance(db: Session, attendance_data: AttendanceCreate) -> Attendance:
+def create_attendance(db: Session, attendance_data: AttendanceCreate, department: str) -> Attendance:
     attendance = Attendance(
         employee_id=attendance_data.employee_id,
         date=attendance_data.date,
         status=attendance_data.status
     )
     db.add(attendance)
+    deltas: rollup_repo.RollupDeltas = {}
+    rollup_repo.add_delta(deltas, attendance_data.date, department, attendance_data.status)
+    rollup_repo.apply_deltas(db, deltas)
+    marks: bitmap_repo.BitmapMarks = {}
+    bitmap_repo.add_mark(marks, attendance_data.employee_id, attendance_data.date, attendance_data.status)
+    bitmap_repo.apply_marks(db, marks)
+    version_repo.bump(db, version_repo.ATTENDANCE)
     db.commit()
     db.refresh(attendance)
     return attendance
 
 
+def _filter_dates(stmt: Select, from_date: Optional[date], to_date: Optional[date]) -> Select:
+    if from_date:
+        stmt = stmt.where(Attendance.date >= from_date)
+    if to_date:
+        stmt = stmt.where(Attendance.date <= to_date)
+    return stmt
+
+
+def _order_after(stmt: Select, after: Optional[Tuple[date, int]]) -> Select:
+    """Order newest first on (date, id) and continue after the given keyset position."""
+    if after:
+        after_date, after_id = after
+        stmt = stmt.where(
+            or_(
+                Attendance.date < after_date,
+                and_(Attendance.date == after_date, Attendance.id < after_id)
+            )
+        )
+    return stmt.order_by(Attendance.date.desc(), Attendance.id.desc())
+
+
+def attendance_statement(
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None,
+    after: Optional[Tuple[date, int]] = None,
+    limit: Optional[int] = None
+) -> Select:
+    stmt = select(Attendance)
+    if employee_id:
+        stmt = stmt.where(Attendance.employee_id == employee_id)
+    stmt = _filter_dates(stmt, from_date, to_date)
+    if departments and len(departments) > 0:
+        stmt = stmt.join(Employee).where(Employee.department.in_(departments))
+    stmt = _order_after(stmt, after)
+    if limit:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+ATTENDANCE_COLUMNS = (
+    Attendance.id,
+    Attendance.employee_id,
+    Attendance.date,
+    Attendance.status,
+    Attendance.created_at
+)
+
+
+def get_attendance_rows(
+    db: Session,
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None,
+    after: Optional[Tuple[date, int]] = None,
+    limit: Optional[int] = None
+) -> List[Row]:
+    """Same filters as attendance_statement, returned as plain column tuples without ORM objects."""
+    stmt = attendance_statement(employee_id, from_date, to_date, departments, after, limit)
+    return db.execute(stmt.with_only_columns(*ATTENDANCE_COLUMNS)).all()
+
+
+def get_attendance_rows_by_ids(db: Session, ids: Iterable[int]) -> List[Row]:
+    ids = sorted(set(ids))
+    rows: List[Row] = []
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+        rows += db.execute(select(*ATTENDANCE_COLUMNS).where(Attendance.id.in_(chunk))).all()
+    return rows
+
+
+def export_statement(
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> Select:
+    """Attendance joined with employee name, code and department, newest first."""
+    stmt = (
+        select(
+            Attendance.id,
+            Attendance.date,
+            Attendance.status,
+            Attendance.created_at,
+            Attendance.employee_id,
+            Employee.employee_id.label("employee_code"),
+            Employee.full_name,
+            Employee.department
+        )
+        .join(Employee, Employee.id == Attendance.employee_id)
+    )
+    if employee_id:
+        stmt = stmt.where(Attendance.employee_id == employee_id)
+    stmt = _filter_dates(stmt, from_date, to_date)
+    if departments and len(departments) > 0:
+        stmt = stmt.where(Employee.department.in_(departments))
+    return _order_after(stmt, None)
+
+
 def get_attendance_by_employee(
     db: Session, 
     employee_id: int, 
     from_date: Optional[date] = None, 
-    to_date: Optional[date] = None
+    to_date: Optional[date] = None,
+    after: Optional[Tuple[date, int]] = None,
+    limit: Optional[int] = None
 ) -> List[Attendance]:
-    query = db.query(Attendance).filter(Attendance.employee_id == employee_id)
-    
-    if from_date:
-        query = query.filter(Attendance.date >= from_date)
-    if to_date:
-        query = query.filter(Attendance.date <= to_date)
-    
-    return query.order_by(Attendance.date.desc()).all()
+    return db.scalars(
+        attendance_statement(employee_id, from_date, to_date, after=after, limit=limit)
+    ).all()
 
 
 def get_all_attendance(
     db: Session, 
     from_date: Optional[date] = None, 
     to_date: Optional[date] = None,
-    departments: Optional[List[str]] = None
+    departments: Optional[List[str]] = None,
+    after: Optional[Tuple[date, int]] = None,
+    limit: Optional[int] = None
 ) -> List[Attendance]:
-    query = db.query(Attendance)
-    
-    if from_date:
-        query = query.filter(Attendance.date >= from_date)
-    if to_date:
-        query = query.filter(Attendance.date <= to_date)
-    
-    if departments and len(departments) > 0:
-        query = query.join(Employee).filter(Employee.department.in_(departments))
-    
-    return query.order_by(Attendance.date.desc()).all()
+    return db.scalars(
+        attendance_statement(None, from_date, to_date, departments, after=after, limit=limit)
+    ).all()
 
 
 def check_duplicate_attendance(db: Session, employee_id: int, date: date) -> bool:
     attendance = db.query(Attendance).filter(
         and_(Attendance.employee_id == employee_id, Attendance.date == date)
     ).first()
-    return attendance is not None
+    return attendance is not None or archive_repo.has_record(db, employee_id, date)
+
+
+def get_existing_attendance_keys(
+    db: Session,
+    employee_ids: Iterable[int],
+    from_date: date,
+    to_date: date
+) -> Set[Tuple[int, date]]:
+    ids = sorted(set(employee_ids))
+    existing: Set[Tuple[int, date]] = set()
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+        rows = db.execute(
+            select(Attendance.employee_id, Attendance.date).where(
+                Attendance.employee_id.in_(chunk),
+                Attendance.date >= from_date,
+                Attendance.date <= to_date
+            )
+        )
+        existing.update((row.employee_id, row.date) for row in rows)
+    existing.update(archive_repo.get_existing_keys(db, ids, from_date, to_date))
+    return existing
+
+
+def _insert_ignoring_duplicates(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(Attendance)
+    return dialect_insert(Attendance).on_conflict_do_nothing(
+        index_elements=[Attendance.employee_id, Attendance.date]
+    )
+
+
+def bulk_create_attendance(
+    db: Session,
+    rows: List[dict],
+    departments: Dict[int, str]
+) -> Dict[Tuple[int, date], int]:
+    """Insert all rows in one transaction; returns the new id keyed by (employee_id, date).
+
+    Rows that lose a race against a concurrent insert are skipped by the
+    database and are absent from the returned mapping. `departments` maps
+    employee ids to departments for the rollup update.
+    """
+    if not rows:
+        return {}
+    stmt = _insert_ignoring_duplicates(db).returning(
+        Attendance.id, Attendance.employee_id, Attendance.date
+    )
+    created = {(row.employee_id, row.date): row.id for row in db.execute(stmt, rows)}
+    
+    deltas: rollup_repo.RollupDeltas = {}
+    marks: bitmap_repo.BitmapMarks = {}
+    for row in rows:
+        if (row["employee_id"], row["date"]) in created:
+            rollup_repo.add_delta(deltas, row["date"], departments[row["employee_id"]], row["status"])
+            bitmap_repo.add_mark(marks, row["employee_id"], row["date"], row["status"])
+    rollup_repo.apply_deltas(db, deltas)
+    bitmap_repo.apply_marks(db, marks)
+    if created:
+        version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    return created
+
+
+def import_attendance_rows(
+    db: Session,
+    rows: List[dict],
+    departments: Dict[int, str]
+) -> int:
+    """Load pre-checked rows with COPY on PostgreSQL, executemany elsewhere; returns rows inserted."""
+    if not rows:
+        return 0
+    if not bulk_load.copy_into(db, Attendance.__tablename__, ("employee_id", "date", "status"), rows):
+        return len(bulk_create_attendance(db, rows, departments))
+    
+    deltas: rollup_repo.RollupDeltas = {}
+    marks: bitmap_repo.BitmapMarks = {}
+    for row in rows:
+        rollup_repo.add_delta(deltas, row["date"], departments[row["employee_id"]], row["status"])
+        bitmap_repo.add_mark(marks, row["employee_id"], row["date"], row["status"])
+    rollup_repo.apply_deltas(db, deltas)
+    bitmap_repo.apply_marks(db, marks)
+    version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    return len(rows)
+
+
+def has_records(db: Session) -> bool:
+    return db.scalar(select(Attendance.id).limit(1)) is not None
+
+
+def count_by_status(db: Session, on_date: date) -> Dict[AttendanceStatus, int]:
+    rows = db.execute(
+        select(Attendance.status, func.count(Attendance.id))
+        .where(Attendance.date == on_date)
+        .group_by(Attendance.status)
+    )
+    return {status: count for status, count in rows}
+
+
+def get_recent_activity(db: Session, limit: int = 10):
+    """Latest attendance rows; callers resolve employee names through the employee directory."""
+    return db.execute(
+        select(
+            Attendance.id,
+            Attendance.employee_id,
+            Attendance.date,
+            Attendance.status,
+            Attendance.created_at
+        )
+        .order_by(Attendance.created_at.desc())
+        .limit(limit)
+    ).all()
@@ -0,0 +1,177 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Row, delete, func, insert, select
+from app.models import Attendance, AttendanceBitmap, AttendanceStatus, Employee
+from app.repositories import archive_repo, employee_repo
+from typing import Dict, List, Optional, Tuple
+from datetime import date
+
+# 366 days rounded up to whole bytes
+YEAR_BYTES = 46
+
+# (employee_id, year) -> (marked bits, present bits) to OR into the stored bitmaps
+BitmapMarks = Dict[Tuple[int, int], Tuple[int, int]]
+
+
+def day_index(on_date: date) -> int:
+    return on_date.toordinal() - date(on_date.year, 1, 1).toordinal()
+
+
+def to_bytes(bits: int) -> bytes:
+    return bits.to_bytes(YEAR_BYTES, "little")
+
+
+def from_bytes(data: bytes) -> int:
+    return int.from_bytes(data, "little")
+
+
+def add_mark(marks: BitmapMarks, employee_id: int, on_date: date, status: AttendanceStatus) -> None:
+    bit = 1 << day_index(on_date)
+    marked, present = marks.get((employee_id, on_date.year), (0, 0))
+    marks[(employee_id, on_date.year)] = (
+        marked | bit,
+        present | bit if status == AttendanceStatus.PRESENT else present
+    )
+
+
+def _insert_missing_statement(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert(AttendanceBitmap).on_conflict_do_nothing(
+        index_elements=[AttendanceBitmap.employee_id, AttendanceBitmap.year]
+    )
+
+
+def _lock_rows(db: Session, keys) -> Dict[Tuple[int, int], AttendanceBitmap]:
+    employee_ids = sorted({employee_id for employee_id, _ in keys})
+    years = [year for _, year in keys]
+    rows: Dict[Tuple[int, int], AttendanceBitmap] = {}
+    chunk_size = employee_repo.IN_CLAUSE_CHUNK_SIZE
+    for start in range(0, len(employee_ids), chunk_size):
+        chunk = employee_ids[start:start + chunk_size]
+        rows.update(((row.employee_id, row.year), row) for row in db.scalars(
+            select(AttendanceBitmap)
+            .where(
+                AttendanceBitmap.employee_id.in_(chunk),
+                AttendanceBitmap.year.between(min(years), max(years))
+            )
+            .with_for_update()
+        ))
+    return rows
+
+
+def apply_marks(db: Session, marks: BitmapMarks) -> None:
+    """OR the marks into the stored bitmaps; the caller owns the commit.
+
+    Existing rows are read with FOR UPDATE (ignored by SQLite, which
+    serializes writers) so concurrent marks for one employee-year don't lose
+    each other's bits. FOR UPDATE locks nothing for a row that doesn't exist
+    yet, so missing employee-years are inserted empty with ON CONFLICT DO
+    NOTHING and then locked: two first marks of a year, or a mark racing
+    the backfill, wait for each other instead of failing on the primary key.
+    """
+    if not marks:
+        return
+    existing = _lock_rows(db, marks)
+    missing = sorted(key for key in marks if key not in existing)
+    stmt = _insert_missing_statement(db) if missing else None
+    if stmt is not None:
+        empty = to_bytes(0)
+        db.execute(stmt, [
+            {"employee_id": employee_id, "year": year, "marked": empty, "present": empty}
+            for employee_id, year in missing
+        ])
+        existing.update(_lock_rows(db, missing))
+    
+    new_rows = []
+    for key, (marked, present) in marks.items():
+        bitmap = existing.get(key)
+        if bitmap is None:
+            new_rows.append({
+                "employee_id": key[0], "year": key[1],
+                "marked": to_bytes(marked), "present": to_bytes(present)
+            })
+        else:
+            bitmap.marked = to_bytes(from_bytes(bitmap.marked) | marked)
+            bitmap.present = to_bytes(from_bytes(bitmap.present) | present)
+    if new_rows:
+        db.execute(insert(AttendanceBitmap), new_rows)
+    db.flush()
+
+
+def get_bitmaps(db: Session, employee_id: int, year: Optional[int] = None) -> List[AttendanceBitmap]:
+    stmt = select(AttendanceBitmap).where(AttendanceBitmap.employee_id == employee_id)
+    if year is not None:
+        stmt = stmt.where(AttendanceBitmap.year == year)
+    return db.scalars(stmt.order_by(AttendanceBitmap.year)).all()
+
+
+def get_year_bitmaps(
+    db: Session,
+    from_year: int,
+    to_year: int,
+    departments: Optional[List[str]] = None,
+    first_id: Optional[int] = None,
+    last_id: Optional[int] = None
+) -> List[Row]:
+    """(employee_id, department, year, marked, present) for every bitmap in the years, by employee then year."""
+    stmt = (
+        select(
+            AttendanceBitmap.employee_id,
+            Employee.department,
+            AttendanceBitmap.year,
+            AttendanceBitmap.marked,
+            AttendanceBitmap.present
+        )
+        .join(Employee, Employee.id == AttendanceBitmap.employee_id)
+        .where(AttendanceBitmap.year.between(from_year, to_year))
+    )
+    if departments:
+        stmt = stmt.where(Employee.department.in_(departments))
+    if first_id is not None:
+        stmt = stmt.where(AttendanceBitmap.employee_id.between(first_id, last_id))
+    # Core execution: ORM result processing roughly doubles the fetch time for 100k rows
+    return db.connection().execute(stmt.order_by(AttendanceBitmap.employee_id, AttendanceBitmap.year)).all()
+
+
+def rebuild(db: Session, batch_size: int = 10_000) -> int:
+    """Recompute every bitmap from the attendance table and the archive and commit; returns the number of rows."""
+    db.execute(delete(AttendanceBitmap))
+    rows = db.execute(
+        select(Attendance.employee_id, Attendance.date, Attendance.status)
+        .order_by(Attendance.employee_id)
+        .execution_options(yield_per=batch_size)
+    )
+    marks: BitmapMarks = {}
+    previous = None
+    for employee_id, on_date, status in rows:
+        # Rows arrive grouped by employee, so flushing between employees never splits a bitmap
+        if employee_id != previous and len(marks) >= batch_size:
+            _insert_marks(db, marks)
+            marks = {}
+        previous = employee_id
+        add_mark(marks, employee_id, on_date, status)
+    _insert_marks(db, marks)
+    
+    # Archived months, merged into the bitmaps just written
+    marks = {}
+    for employee_id, _, on_date, status in archive_repo.iter_history(db, batch_size):
+        if len(marks) >= batch_size:
+            apply_marks(db, marks)
+            marks = {}
+        add_mark(marks, employee_id, on_date, status)
+    apply_marks(db, marks)
+    db.commit()
+    return db.query(func.count()).select_from(AttendanceBitmap).scalar() or 0
+
+
+def _insert_marks(db: Session, marks: BitmapMarks) -> None:
+    if marks:
+        db.execute(insert(AttendanceBitmap), [
+            {"employee_id": employee_id, "year": year, "marked": to_bytes(marked), "present": to_bytes(present)}
+            for (employee_id, year), (marked, present) in marks.items()
+        ])
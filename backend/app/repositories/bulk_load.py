@@ -0,0 +1,50 @@
+import csv
+import enum
+import io
+from datetime import date, datetime
+from typing import Any, Iterable, List, Sequence
+from sqlalchemy.orm import Session
+
+
+def copy_value(value: Any) -> Any:
+    """Convert a bound value to the text form stored for its column type."""
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store member names
+        return value.name
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def copy_records(db: Session, table: str, columns: Sequence[str], records: Iterable[Sequence[Any]]) -> bool:
+    """Load already-converted tuples with PostgreSQL COPY on the session's connection and transaction.
+
+    Returns False without touching the database when the driver has no COPY
+    support (SQLite, asyncpg behind the sync bridge), so callers can fall
+    back to executemany.
+    """
+    connection = db.connection()
+    if connection.dialect.name != "postgresql":
+        return False
+    dbapi_connection = connection.connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    try:
+        if not hasattr(cursor, "copy_expert"):
+            return False
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+        return True
+    finally:
+        cursor.close()
+
+
+def copy_into(db: Session, table: str, columns: Sequence[str], rows: List[dict]) -> bool:
+    """COPY mapping rows (as passed to insert()); see copy_records."""
+    return copy_records(
+        db, table, columns, ([copy_value(row[column]) for column in columns] for row in rows)
+    )
@@ -1,10 +1,16 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, delete, func, insert, select
 from app.models import Employee
 from app.schemas import EmployeeCreate
-from typing import List, Optional
+from app.repositories import archive_repo, bulk_load, employee_search, rollup_repo, version_repo
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+# Keeps IN (...) lists well under SQLite's bound-parameter limit
+IN_CLAUSE_CHUNK_SIZE = 500
 
-def create_employee(db: Session, employee_data: EmployeeCreate) -> Employee:
+
+def create_employee(db: Session, employee_data: EmployeeCreate) -> Tuple[Employee, int]:
+    """Insert the employee; returns it and the employees table version the insert committed."""
     employee = Employee(
         employee_id=employee_data.employee_id,
         full_name=employee_data.full_name,
@@ -12,40 +18,147 @@ def create_employee(db: Session, employee_data: EmployeeCreate) -> Employee:
         department=employee_data.department
     )
     db.add(employee)
+    db.flush()
+    version = version_repo.bump(db, version_repo.EMPLOYEES)
     db.commit()
     db.refresh(employee)
-    return employee
+    return employee, version
+
+
+def bulk_insert_employees(db: Session, rows: List[dict]) -> None:
+    """Insert pre-validated rows with COPY on PostgreSQL, executemany elsewhere."""
+    if not rows:
+        return
+    if not bulk_load.copy_into(db, Employee.__tablename__, ("employee_id", "full_name", "email", "department"), rows):
+        db.execute(insert(Employee), rows)
+    version_repo.bump(db, version_repo.EMPLOYEES)
+    db.commit()
+
+
+EMPLOYEE_COLUMNS = (
+    Employee.id,
+    Employee.employee_id,
+    Employee.full_name,
+    Employee.email,
+    Employee.department,
+    Employee.created_at
+)
+
+
+def get_employee_rows(
+    db: Session,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    departments: Optional[List[str]] = None
+) -> List[Row]:
+    """Employees in id order as plain column tuples without ORM objects."""
+    stmt = select(*EMPLOYEE_COLUMNS)
+    if after_id is not None:
+        stmt = stmt.where(Employee.id > after_id)
+    if departments:
+        stmt = stmt.where(Employee.department.in_(departments))
+    stmt = stmt.order_by(Employee.id)
+    if limit:
+        stmt = stmt.limit(limit)
+    return db.execute(stmt).all()
+
 
+def all_employees_statement() -> Select:
+    return select(Employee).order_by(Employee.id)
 
-def get_all_employees(db: Session) -> List[Employee]:
-    return db.query(Employee).all()
+
+def count_employees(db: Session) -> int:
+    return db.scalar(select(func.count(Employee.id))) or 0
+
+
+def get_employee_rows_by_ids(db: Session, ids: Iterable[int]) -> List[Row]:
+    """Column tuples for each existing id; unknown ids are omitted."""
+    ids = sorted(set(ids))
+    rows: List[Row] = []
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+        rows += db.execute(select(*EMPLOYEE_COLUMNS).where(Employee.id.in_(chunk))).all()
+    return rows
+
+
+def get_employee_row_by_code(db: Session, employee_id: str) -> Optional[Row]:
+    return db.execute(select(*EMPLOYEE_COLUMNS).where(Employee.employee_id == employee_id)).first()
+
+
+def get_employee_row_by_email(db: Session, email: str) -> Optional[Row]:
+    """Case-insensitive match, like the directory's email index."""
+    return db.execute(select(*EMPLOYEE_COLUMNS).where(func.lower(Employee.email) == email.lower())).first()
 
 
 def get_employee_by_id(db: Session, id: int) -> Optional[Employee]:
     return db.query(Employee).filter(Employee.id == id).first()
 
 
-def get_employee_by_employee_id(db: Session, employee_id: str) -> Optional[Employee]:
-    return db.query(Employee).filter(Employee.employee_id == employee_id).first()
+def get_existing_codes_and_emails(
+    db: Session,
+    codes: Iterable[str],
+    emails: Iterable[str]
+) -> Tuple[Set[str], Set[str]]:
+    """Codes that exist, and emails that exist in any case (returned lowercased)."""
+    codes, emails = sorted(set(codes)), sorted({email.lower() for email in emails})
+    existing_codes: Set[str] = set()
+    existing_emails: Set[str] = set()
+    for start in range(0, len(codes), IN_CLAUSE_CHUNK_SIZE):
+        chunk = codes[start:start + IN_CLAUSE_CHUNK_SIZE]
+        existing_codes.update(db.scalars(select(Employee.employee_id).where(Employee.employee_id.in_(chunk))))
+    for start in range(0, len(emails), IN_CLAUSE_CHUNK_SIZE):
+        chunk = emails[start:start + IN_CLAUSE_CHUNK_SIZE]
+        existing_emails.update(
+            email.lower() for email in db.scalars(select(Employee.email).where(func.lower(Employee.email).in_(chunk)))
+        )
+    return existing_codes, existing_emails
 
 
-def get_employee_by_email(db: Session, email: str) -> Optional[Employee]:
-    return db.query(Employee).filter(Employee.email == email).first()
+def get_ids_by_codes(db: Session, codes: Iterable[str]) -> Dict[str, int]:
+    """Map employee codes (the business employee_id) to primary keys; unknown codes are omitted."""
+    codes = sorted(set(codes))
+    ids: Dict[str, int] = {}
+    for start in range(0, len(codes), IN_CLAUSE_CHUNK_SIZE):
+        chunk = codes[start:start + IN_CLAUSE_CHUNK_SIZE]
+        rows = db.execute(select(Employee.employee_id, Employee.id).where(Employee.employee_id.in_(chunk)))
+        ids.update((row.employee_id, row.id) for row in rows)
+    return ids
 
 
-def delete_employee(db: Session, id: int) -> bool:
-    employee = get_employee_by_id(db, id)
-    if employee:
-        db.delete(employee)
-        db.commit()
-        return True
-    return False
+def delete_employees(db: Session, ids: Iterable[int]) -> Tuple[List[Row], Optional[int]]:
+    """Delete employees in one transaction, a fixed number of statements per IN_CLAUSE_CHUNK_SIZE ids.
+
+    Their attendance, bitmaps and archived months go with them through ON
+    DELETE CASCADE; the rollup and archive manifest are adjusted first, while
+    the history they subtract still exists. Returns the (id, employee_id,
+    department) rows of the employees that existed and the employees table
+    version, or None when there were none.
+    """
+    ids = sorted(set(ids))
+    found: List[Row] = []
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+        found += db.execute(
+            select(Employee.id, Employee.employee_id, Employee.department)
+            .where(Employee.id.in_(chunk))
+            .with_for_update()
+        ).all()
+    if not found:
+        db.rollback()
+        return [], None
+    
+    found_ids = [row.id for row in found]
+    rollup_repo.remove_employees_history(db, found_ids)
+    archive_repo.remove_employees(db, found_ids)
+    for start in range(0, len(found_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = found_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+        db.execute(delete(Employee).where(Employee.id.in_(chunk)).execution_options(synchronize_session=False))
+    version = version_repo.bump(db, version_repo.EMPLOYEES)
+    # Their attendance went with them
+    version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    return found, version
 
 
-def search_employees(db: Session, search_query: str) -> List[Employee]:
-    search_term = f"%{search_query.lower()}%"
-    return db.query(Employee).filter(
-        (Employee.full_name.ilike(search_term)) |
-        (Employee.employee_id.ilike(search_term)) |
-        (Employee.email.ilike(search_term))
-    ).all()
+def search_employees(db: Session, search_query: str, limit: int) -> List[Employee]:
+    return employee_search.search(db, search_query, limit)
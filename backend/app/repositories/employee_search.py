@@ -0,0 +1,158 @@
+"""Employee search backends.
+
+PostgreSQL uses pg_trgm GIN indexes (substring ILIKE plus trigram similarity),
+SQLite uses an FTS5 trigram shadow table kept in sync by triggers, and any
+other database (or one where the index setup fails) falls back to an
+unindexed ILIKE scan. All backends rank exact employee_id matches first,
+then prefix matches, then the remaining substring/fuzzy matches.
+"""
+
+from sqlalchemy import Integer, case, column, func, or_, select, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from typing import List
+from app.models import Employee
+from app.utils.logger import logger
+
+SEARCH_COLUMNS = (Employee.employee_id, Employee.full_name, Employee.email)
+LIKE_ESCAPE = "!"
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def _rank(term: str):
+    prefix = f"{_escape_like(term)}%"
+    return case(
+        (func.lower(Employee.employee_id) == term, 0),
+        (or_(*(func.lower(col).like(prefix, escape=LIKE_ESCAPE) for col in SEARCH_COLUMNS)), 1),
+        else_=2
+    )
+
+
+def _substring_filter(term: str):
+    pattern = f"%{_escape_like(term)}%"
+    return or_(*(col.ilike(pattern, escape=LIKE_ESCAPE) for col in SEARCH_COLUMNS))
+
+
+class LikeSearch:
+    name = "like"
+
+    def setup(self, connection: Connection) -> None:
+        pass
+
+    def search(self, db: Session, term: str, limit: int) -> List[Employee]:
+        return db.scalars(
+            select(Employee)
+            .where(_substring_filter(term))
+            .order_by(_rank(term), Employee.full_name, Employee.id)
+            .limit(limit)
+        ).all()
+
+
+class PostgresTrigramSearch(LikeSearch):
+    name = "pg_trgm"
+
+    def setup(self, connection: Connection) -> None:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for column in ("employee_id", "full_name", "email"):
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_employees_{column}_trgm "
+                f"ON employees USING gin ({column} gin_trgm_ops)"
+            ))
+
+    def search(self, db: Session, term: str, limit: int) -> List[Employee]:
+        similarity = func.greatest(*(func.similarity(col, term) for col in SEARCH_COLUMNS))
+        return db.scalars(
+            select(Employee)
+            .where(or_(_substring_filter(term), Employee.full_name.op("%")(term)))
+            .order_by(_rank(term), similarity.desc(), Employee.full_name, Employee.id)
+            .limit(limit)
+        ).all()
+
+
+_FTS_TABLE = table("employees_fts", column("rowid", Integer), column("employees_fts"))
+
+
+class SqliteFtsSearch(LikeSearch):
+    name = "fts5"
+    # The trigram tokenizer only matches terms of at least three characters
+    MIN_TERM_LENGTH = 3
+
+    def setup(self, connection: Connection) -> None:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'employees_fts'")
+        ).first()
+        if exists:
+            return
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE employees_fts USING fts5("
+            "employee_id, full_name, email, "
+            "content='employees', content_rowid='id', tokenize='trigram')"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER employees_fts_ai AFTER INSERT ON employees BEGIN "
+            "INSERT INTO employees_fts(rowid, employee_id, full_name, email) "
+            "VALUES (new.id, new.employee_id, new.full_name, new.email); END"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER employees_fts_ad AFTER DELETE ON employees BEGIN "
+            "INSERT INTO employees_fts(employees_fts, rowid, employee_id, full_name, email) "
+            "VALUES ('delete', old.id, old.employee_id, old.full_name, old.email); END"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER employees_fts_au AFTER UPDATE ON employees BEGIN "
+            "INSERT INTO employees_fts(employees_fts, rowid, employee_id, full_name, email) "
+            "VALUES ('delete', old.id, old.employee_id, old.full_name, old.email); "
+            "INSERT INTO employees_fts(rowid, employee_id, full_name, email) "
+            "VALUES (new.id, new.employee_id, new.full_name, new.email); END"
+        ))
+        # Index rows that existed before the shadow table
+        connection.execute(text("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')"))
+
+    def search(self, db: Session, term: str, limit: int) -> List[Employee]:
+        if len(term) < self.MIN_TERM_LENGTH:
+            return super().search(db, term, limit)
+        match = '"' + term.replace('"', '""') + '"'
+        matching_ids = select(_FTS_TABLE.c.rowid).where(_FTS_TABLE.c.employees_fts.op("MATCH")(match))
+        return db.scalars(
+            select(Employee)
+            .where(Employee.id.in_(matching_ids))
+            .order_by(_rank(term), Employee.full_name, Employee.id)
+            .limit(limit)
+        ).all()
+
+
+_BACKENDS = {
+    "postgresql": PostgresTrigramSearch,
+    "sqlite": SqliteFtsSearch,
+}
+
+_backend: LikeSearch = LikeSearch()
+
+
+def setup_search(engine: Engine) -> str:
+    """Create the dialect's search indexes and select the matching backend; returns its name."""
+    global _backend
+    backend = _BACKENDS.get(engine.dialect.name, LikeSearch)()
+    try:
+        with engine.begin() as connection:
+            backend.setup(connection)
+    except Exception as e:
+        logger.warning(f"Employee search index setup failed ({backend.name}), using ILIKE scan: {e}")
+        backend = LikeSearch()
+    _backend = backend
+    logger.info(f"Employee search backend: {_backend.name}")
+    return _backend.name
+
+
+def use_search(name: str) -> None:
+    """Select a backend whose indexes an earlier setup_search already created."""
+    global _backend
+    backends = {cls.name: cls for cls in (LikeSearch, *_BACKENDS.values())}
+    _backend = backends.get(name, LikeSearch)()
+
+
+def search(db: Session, term: str, limit: int) -> List[Employee]:
+    return _backend.search(db, term.lower(), limit)
@@ -0,0 +1,123 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func, insert, select
+from app.models import Attendance, AttendanceDailyRollup, AttendanceStatus, Employee
+from app.repositories import archive_repo, employee_repo, version_repo
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date
+
+# (date, department) -> (present delta, absent delta)
+RollupDeltas = Dict[Tuple[date, str], Tuple[int, int]]
+
+
+def add_delta(deltas: RollupDeltas, on_date: date, department: str, status: AttendanceStatus, sign: int = 1) -> None:
+    present, absent = deltas.get((on_date, department), (0, 0))
+    if status == AttendanceStatus.PRESENT:
+        present += sign
+    else:
+        absent += sign
+    deltas[(on_date, department)] = (present, absent)
+
+
+def _upsert_statement(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(AttendanceDailyRollup)
+    return stmt.on_conflict_do_update(
+        index_elements=[AttendanceDailyRollup.date, AttendanceDailyRollup.department],
+        set_={
+            "present": AttendanceDailyRollup.present + stmt.excluded.present,
+            "absent": AttendanceDailyRollup.absent + stmt.excluded.absent,
+            "total": AttendanceDailyRollup.total + stmt.excluded.total,
+        }
+    )
+
+
+def apply_deltas(db: Session, deltas: RollupDeltas) -> None:
+    """Add the deltas to the rollup counters; the caller owns the commit."""
+    rows = [
+        {"date": d, "department": dept, "present": present, "absent": absent, "total": present + absent}
+        for (d, dept), (present, absent) in deltas.items()
+        if present or absent
+    ]
+    if not rows:
+        return
+    
+    stmt = _upsert_statement(db)
+    if stmt is not None:
+        db.execute(stmt, rows)
+        return
+    
+    for row in rows:
+        rollup = db.get(AttendanceDailyRollup, (row["date"], row["department"]))
+        if rollup is None:
+            db.add(AttendanceDailyRollup(**row))
+        else:
+            rollup.present += row["present"]
+            rollup.absent += row["absent"]
+            rollup.total += row["total"]
+    db.flush()
+
+
+def remove_employees_history(db: Session, employee_ids: Iterable[int]) -> None:
+    """Subtract all attendance of these employees, archived months included, from the rollup; the caller owns the commit."""
+    ids = sorted(set(employee_ids))
+    deltas: RollupDeltas = {}
+    for start in range(0, len(ids), employee_repo.IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start:start + employee_repo.IN_CLAUSE_CHUNK_SIZE]
+        rows = db.execute(
+            select(Employee.department, Attendance.date, Attendance.status, func.count(Attendance.id))
+            .join(Employee, Employee.id == Attendance.employee_id)
+            .where(Attendance.employee_id.in_(chunk))
+            .group_by(Employee.department, Attendance.date, Attendance.status)
+        )
+        for department, on_date, status, count in rows:
+            add_delta(deltas, on_date, department, status, -count)
+    for department, on_date, status in archive_repo.get_history(db, ids):
+        add_delta(deltas, on_date, department, status, -1)
+    apply_deltas(db, deltas)
+
+
+def get_trends(
+    db: Session,
+    from_date: date,
+    to_date: date,
+    departments: Optional[List[str]] = None
+) -> List[AttendanceDailyRollup]:
+    query = db.query(AttendanceDailyRollup).filter(
+        AttendanceDailyRollup.date >= from_date,
+        AttendanceDailyRollup.date <= to_date,
+        AttendanceDailyRollup.total > 0
+    )
+    if departments and len(departments) > 0:
+        query = query.filter(AttendanceDailyRollup.department.in_(departments))
+    return query.order_by(AttendanceDailyRollup.date, AttendanceDailyRollup.department).all()
+
+
+def rebuild(db: Session) -> int:
+    """Recompute the whole rollup from the attendance table and the archive in one transaction."""
+    db.execute(delete(AttendanceDailyRollup))
+    present = func.sum(case((Attendance.status == AttendanceStatus.PRESENT, 1), else_=0))
+    absent = func.sum(case((Attendance.status == AttendanceStatus.ABSENT, 1), else_=0))
+    aggregate = (
+        select(Attendance.date, Employee.department, present, absent, func.count(Attendance.id))
+        .join(Employee, Employee.id == Attendance.employee_id)
+        .group_by(Attendance.date, Employee.department)
+    )
+    db.execute(
+        insert(AttendanceDailyRollup).from_select(
+            ["date", "department", "present", "absent", "total"], aggregate
+        )
+    )
+    deltas: RollupDeltas = {}
+    for _, department, on_date, status in archive_repo.iter_history(db):
+        add_delta(deltas, on_date, department, status)
+    apply_deltas(db, deltas)
+    # Attendance itself is unchanged, but figures derived from it (the dashboard) may be corrected
+    version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    return db.query(func.count()).select_from(AttendanceDailyRollup).scalar() or 0
@@ -0,0 +1,113 @@
+"""Per-table change versions.
+
+Write paths call bump() before committing, so a table's version moves in
+the same transaction as the change itself. Any worker process can then
+tell whether a table changed since it last looked with one primary-key
+lookup.
+
+Each session also remembers the versions its committed transactions set
+(committed_versions), so this process can tell its own writes apart from
+other workers'. Write paths that evicted their own cache entries record
+those versions with mark_evicted, and version_service drops whole cache
+namespaces only for versions it finds no record of.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.models import TableVersion
+
+EMPLOYEES = "employees"
+ATTENDANCE = "attendance"
+# Not a table: bumped by each full rebuild of the rollup and the bitmaps, so 0 means they were never backfilled
+DERIVED = "attendance_derived"
+
+# Session.info keys: versions set by the open transaction, and by committed ones not yet taken
+_PENDING = "table_versions_pending"
+_COMMITTED = "table_versions_committed"
+
+# Versions this process committed whose cache entries it has already evicted, per table
+_evicted: Dict[str, Set[int]] = {}
+_evicted_lock = threading.Lock()
+
+
+@event.listens_for(Session, "after_commit")
+def _versions_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        session.info.setdefault(_COMMITTED, []).extend(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _versions_rolled_back(session: Session) -> None:
+    # Another transaction will set the same numbers
+    session.info.pop(_PENDING, None)
+
+
+def _upsert_statement(db: Session, name: str):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(TableVersion).values(name=name, version=1)
+    return stmt.on_conflict_do_update(
+        index_elements=[TableVersion.name],
+        set_={"version": TableVersion.version + 1, "updated_at": func.now()}
+    ).returning(TableVersion.version)
+
+
+def bump(db: Session, name: str) -> int:
+    """Increment the table's version in the current transaction; returns the new version."""
+    stmt = _upsert_statement(db, name)
+    if stmt is not None:
+        version = db.scalar(stmt)
+    else:
+        updated = db.execute(
+            update(TableVersion).where(TableVersion.name == name).values(version=TableVersion.version + 1)
+        )
+        if not updated.rowcount:
+            db.execute(insert(TableVersion).values(name=name, version=1))
+        version = get_version(db, name)
+    db.info.setdefault(_PENDING, []).append((name, version))
+    return version
+
+
+def committed_versions(db: Session, name: str) -> List[int]:
+    """Versions of the table that this session's commits set since the last call; each is returned once."""
+    committed = db.info.get(_COMMITTED, [])
+    versions = [version for table, version in committed if table == name]
+    db.info[_COMMITTED] = [(table, version) for table, version in committed if table != name]
+    return versions
+
+
+def get_version(db: Session, name: str) -> int:
+    return db.scalar(select(TableVersion.version).where(TableVersion.name == name)) or 0
+
+
+def get_versions(db: Session, names: Iterable[str]) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """(version, updated_at) per table in one query; tables never written are absent."""
+    rows = db.execute(
+        select(TableVersion.name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.name.in_(list(names)))
+    )
+    return {name: (version, updated_at) for name, version, updated_at in rows}
+
+
+def mark_evicted(db: Session) -> None:
+    """Record the versions this session committed as already evicted from this process's caches."""
+    with _evicted_lock:
+        for table, version in db.info.get(_COMMITTED, []):
+            _evicted.setdefault(table, set()).add(version)
+
+
+def take_evicted(name: str, up_to: int) -> Set[int]:
+    """The table's versions up to up_to recorded by mark_evicted; each is returned once."""
+    with _evicted_lock:
+        versions = _evicted.get(name, set())
+        _evicted[name] = {version for version in versions if version > up_to}
+    return {version for version in versions if version <= up_to}
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import date
-from app.database import get_db
-from app.schemas import AttendanceCreate, AttendanceResponse, AttendanceQuery
-from app.services import attendance_service
+from app.config import settings
+from app.database import db_loader, get_db, get_read_db, run_db, run_in_session, stream_rows, stream_scalars
+from app.schemas import (
+    AttendanceCreate,
+    AttendanceResponse,
+    AttendanceQuery,
+    AttendanceBulkCreate,
+    AttendanceBulkResponse,
+    ImportReport
+)
+from app.repositories import version_repo
+from app.services import attendance_service, import_service, version_service
+from app.utils.conditional import not_modified
+from app.utils.group_commit import GroupCommitter, QueueFull
+from app.utils.serialization import RawJSONResponse
+from app.utils.streaming import merge_batches, spool_upload, stream_csv, stream_json_array, stream_ndjson, utf8_lines
 from app.exceptions import (
     DuplicateAttendanceError, 
     InvalidDateError, 
@@ -14,10 +28,46 @@ from app.exceptions import (
 router = APIRouter()
 
 
+async def _write_marks(records: List[AttendanceCreate]) -> list:
+    return await run_in_session(attendance_service.mark_attendance_batch, records)
+
+
+# Started on app startup when ATTENDANCE_GROUP_COMMIT is on
+attendance_writer = GroupCommitter(
+    "attendance",
+    _write_marks,
+    settings.group_commit_max_batch,
+    settings.group_commit_max_wait_ms,
+    settings.group_commit_max_queue
+)
+
+
+async def _with_archived(db: Session, rows, load_month, employee_id, from_date, to_date, departments):
+    """Merge the archived months the range reaches into a newest-first stream of hot rows, a month at a time."""
+    months = await run_db(db, attendance_service.get_archived_months, from_date, to_date)
+    batches = [
+        (
+            attendance_service.archived_month_bound(month),
+            db_loader(db, load_month, month, employee_id, from_date, to_date, departments)
+        )
+        for month in months
+    ]
+    return merge_batches(rows, batches, attendance_service.stream_key)
+
+
 @router.post("", response_model=AttendanceResponse, status_code=status.HTTP_201_CREATED)
-def mark_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db)) -> AttendanceResponse:
+async def mark_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db)) -> AttendanceResponse:
     try:
-        return attendance_service.mark_attendance(db, attendance)
+        if attendance_writer.running:
+            return AttendanceResponse.model_validate(await attendance_writer.submit(attendance))
+        return await run_db(db, attendance_service.mark_attendance, attendance)
+    except QueueFull:
+        # Answered like a full admission queue, since these marks bypass the write class
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(settings.admission_retry_after_seconds)}
+        )
     except (DuplicateAttendanceError, InvalidDateError, EmployeeNotFoundError) as e:
         status_code = status.HTTP_400_BAD_REQUEST
         if isinstance(e, EmployeeNotFoundError):
@@ -28,12 +78,101 @@ def mark_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db))
         )
 
 
+@router.post("/bulk", response_model=AttendanceBulkResponse)
+async def mark_attendance_bulk(payload: AttendanceBulkCreate, db: Session = Depends(get_db)) -> AttendanceBulkResponse:
+    return await run_db(db, attendance_service.mark_attendance_bulk, payload.records)
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_attendance(request: Request, db: Session = Depends(get_db)) -> ImportReport:
+    """Import attendance from a raw CSV request body (Content-Type: text/csv)."""
+    upload = await spool_upload(request)
+    try:
+        return await run_db(db, import_service.import_attendance, utf8_lines(upload))
+    finally:
+        upload.close()
+
+
+@router.get("/export")
+async def export_attendance(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    employee_id: Optional[int] = Query(None),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    departments: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_read_db)
+) -> StreamingResponse:
+    rows = await stream_rows(
+        db,
+        attendance_service.export_statement(employee_id, from_date, to_date, departments),
+        settings.stream_batch_size
+    )
+    rows = await _with_archived(
+        db, rows, attendance_service.get_archived_month_export_rows, employee_id, from_date, to_date, departments
+    )
+    if export_format == "csv":
+        body = stream_csv(rows, attendance_service.EXPORT_FIELDS, attendance_service.export_row_values)
+        media_type = "text/csv"
+    else:
+        body = stream_ndjson(rows, attendance_service.export_row_dict)
+        media_type = "application/x-ndjson"
+    filename = f"attendance-{date.today().isoformat()}.{export_format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("", response_model=List[AttendanceResponse])
-def get_attendance(
+async def get_attendance(
+    request: Request,
     employee_id: Optional[int] = Query(None),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     departments: Optional[List[str]] = Query(None),
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=settings.max_page_size, description="Page size; enables keyset pagination"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    stream: bool = Query(False, description="Stream the full result as a JSON array"),
+    db: Session = Depends(get_read_db)
 ) -> List[AttendanceResponse]:
-    return attendance_service.get_attendance(db, employee_id, from_date, to_date, departments)
+    validators = await run_db(
+        db, version_service.get_validators, (version_repo.ATTENDANCE,), request.query_params.multi_items()
+    )
+    unchanged = not_modified(request, validators)
+    if unchanged:
+        return unchanged
+    headers = validators.headers()
+    
+    if stream:
+        records = await stream_scalars(
+            db,
+            attendance_service.attendance_stream_statement(employee_id, from_date, to_date, departments),
+            settings.stream_batch_size
+        )
+        records = await _with_archived(
+            db, records, attendance_service.get_archived_month_rows, employee_id, from_date, to_date, departments
+        )
+        return StreamingResponse(
+            stream_json_array(records, AttendanceResponse),
+            media_type="application/json",
+            headers=headers
+        )
+    
+    if limit or cursor:
+        body, next_cursor = await run_db(
+            db,
+            attendance_service.get_attendance_page,
+            limit or settings.default_page_size,
+            cursor,
+            employee_id,
+            from_date,
+            to_date,
+            departments
+        )
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return RawJSONResponse(body, headers=headers)
+    
+    body = await run_db(db, attendance_service.get_attendance_json, employee_id, from_date, to_date, departments)
+    return RawJSONResponse(body, headers=headers)
@@ -1,58 +1,105 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import AsyncIterator, List, Optional
 from datetime import date
-from app.database import get_db
-from app.models import Employee, Attendance, AttendanceStatus
-from pydantic import BaseModel
-from typing import List
+from app.config import settings
+from app.database import get_read_db, run_db, run_in_session
+from app.repositories import version_repo
+from app.schemas import AttendanceTrendPoint, DashboardStats
+from app.services import dashboard_feed, dashboard_service, version_service
+from app.utils.broadcast import Subscription, encode_event
+from app.utils.conditional import not_modified
+from app.utils.logger import logger
 
 router = APIRouter()
 
+DASHBOARD_TABLES = (version_repo.EMPLOYEES, version_repo.ATTENDANCE)
+# Tells EventSource how long to wait before reconnecting, e.g. after a slow client is dropped
+STREAM_RETRY_MS = 3000
 
-class DashboardStats(BaseModel):
-    total_employees: int
-    today_present: int
-    today_absent: int
-    today_total: int
-    recent_activity: List[dict]
+_watcher: Optional[asyncio.Task] = None
+
+
+async def _watch_for_changes() -> None:
+    while True:
+        await asyncio.sleep(settings.dashboard_stream_check_seconds)
+        if not dashboard_feed.hub.active:
+            continue
+        try:
+            await run_in_session(dashboard_feed.publish_snapshot_if_changed)
+        except Exception as e:
+            logger.error(f"Dashboard stream check failed: {e}")
+
+
+async def start_stream() -> None:
+    """Started on app startup: the broadcast hub and the watcher for other workers' writes."""
+    global _watcher
+    await dashboard_feed.hub.start()
+    _watcher = asyncio.create_task(_watch_for_changes())
+
+
+async def stop_stream() -> None:
+    global _watcher
+    if _watcher is not None:
+        _watcher.cancel()
+        _watcher = None
+    await dashboard_feed.hub.stop()
+
+
+async def _events(subscription: Subscription, snapshot: DashboardStats) -> AsyncIterator[bytes]:
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n".encode()
+        yield encode_event("snapshot", snapshot.model_dump())
+        while True:
+            message = await subscription.next()
+            if message is None:
+                return
+            yield message
+    finally:
+        dashboard_feed.hub.unsubscribe(subscription)
 
 
 @router.get("")
-def get_dashboard_stats(db: Session = Depends(get_db)) -> DashboardStats:
-    today = date.today()
-    
-    total_employees = db.query(func.count(Employee.id)).scalar() or 0
-    
-    today_attendance = db.query(Attendance).filter(Attendance.date == today).all()
-    today_present = sum(1 for a in today_attendance if a.status == AttendanceStatus.PRESENT)
-    today_absent = sum(1 for a in today_attendance if a.status == AttendanceStatus.ABSENT)
-    today_total = len(today_attendance)
-    
-    recent_activity = (
-        db.query(Attendance)
-        .order_by(Attendance.created_at.desc())
-        .limit(10)
-        .all()
-    )
-    
-    activity_list = []
-    for att in recent_activity:
-        employee = db.query(Employee).filter(Employee.id == att.employee_id).first()
-        activity_list.append({
-            "id": att.id,
-            "employee_id": att.employee_id,
-            "employee_name": employee.full_name if employee else "Unknown",
-            "employee_employee_id": employee.employee_id if employee else "",
-            "date": att.date.isoformat(),
-            "status": att.status.value,
-            "created_at": att.created_at.isoformat() if att.created_at else None,
-        })
-    
-    return DashboardStats(
-        total_employees=total_employees,
-        today_present=today_present,
-        today_absent=today_absent,
-        today_total=today_total,
-        recent_activity=activity_list
+async def get_dashboard_stats(request: Request, response: Response, db: Session = Depends(get_read_db)) -> DashboardStats:
+    # Today's figures also change at midnight, without a write
+    params = [*request.query_params.multi_items(), ("today", date.today().isoformat())]
+    validators = await run_db(db, version_service.get_validators, DASHBOARD_TABLES, params)
+    unchanged = not_modified(request, validators)
+    if unchanged:
+        return unchanged
+    response.headers.update(validators.headers())
+    return await run_db(db, dashboard_service.get_dashboard_stats)
+
+
+@router.get("/stream")
+async def stream_dashboard() -> StreamingResponse:
+    """Server-sent events: a snapshot, then attendance and employee deltas (see dashboard_feed)."""
+    subscription = dashboard_feed.subscribe()
+    if subscription is None:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Too many dashboard streams open; retry later"},
+            headers={"Retry-After": str(STREAM_RETRY_MS // 1000)}
+        )
+    try:
+        # Subscribed first, so nothing published while the snapshot loads is missed
+        snapshot = await run_in_session(dashboard_service.get_dashboard_stats)
+    except BaseException:
+        dashboard_feed.hub.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        _events(subscription, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
+
+
+@router.get("/trends", response_model=List[AttendanceTrendPoint])
+async def get_attendance_trends(
+    days: int = Query(90, ge=1, le=366, description="Number of days back from today"),
+    departments: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_read_db)
+) -> List[AttendanceTrendPoint]:
+    return await run_db(db, dashboard_service.get_attendance_trends, days, departments)
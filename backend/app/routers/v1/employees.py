@@ -1,18 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import get_db
-from app.schemas import EmployeeCreate, EmployeeResponse
-from app.services import employee_service
+from app.config import settings
+from app.database import get_db, get_read_db, run_db, stream_scalars
+from app.schemas import (
+    EmployeeBulkDelete,
+    EmployeeBulkDeleteResponse,
+    EmployeeCalendar,
+    EmployeeCreate,
+    EmployeeResponse,
+    ImportReport
+)
+from app.repositories import version_repo
+from app.services import employee_service, import_service, version_service
+from app.utils.conditional import not_modified
+from app.utils.serialization import RawJSONResponse
+from app.utils.streaming import spool_upload, stream_json_array, utf8_lines
 from app.exceptions import EmployeeNotFoundError, DuplicateEmployeeError
 
 router = APIRouter()
 
 
 @router.post("", response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
-def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)) -> EmployeeResponse:
+async def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)) -> EmployeeResponse:
     try:
-        return employee_service.create_employee(db, employee)
+        return await run_db(db, employee_service.create_employee, employee)
     except DuplicateEmployeeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -20,20 +33,85 @@ def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)) ->
         )
 
 
+@router.post("/import", response_model=ImportReport)
+async def import_employees(request: Request, db: Session = Depends(get_db)) -> ImportReport:
+    """Import employees from a raw CSV request body (Content-Type: text/csv)."""
+    upload = await spool_upload(request)
+    try:
+        return await run_db(db, import_service.import_employees, utf8_lines(upload))
+    finally:
+        upload.close()
+
+
+@router.post("/bulk-delete", response_model=EmployeeBulkDeleteResponse)
+async def bulk_delete_employees(payload: EmployeeBulkDelete, db: Session = Depends(get_db)) -> EmployeeBulkDeleteResponse:
+    """Delete many employees, with their attendance, in one transaction; unknown ids are listed, not an error."""
+    return await run_db(db, employee_service.bulk_delete_employees, payload.ids)
+
+
 @router.get("", response_model=List[EmployeeResponse])
-def get_employees(
+async def get_employees(
+    request: Request,
+    response: Response,
     search: Optional[str] = Query(None, description="Search employees by name, ID, or email"),
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=settings.max_page_size, description="Page size; enables keyset pagination (caps results when searching)"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    stream: bool = Query(False, description="Stream the full result as a JSON array"),
+    db: Session = Depends(get_read_db)
 ) -> List[EmployeeResponse]:
+    validators = await run_db(
+        db, version_service.get_validators, (version_repo.EMPLOYEES,), request.query_params.multi_items()
+    )
+    unchanged = not_modified(request, validators)
+    if unchanged:
+        return unchanged
+    headers = validators.headers()
+    
     if search:
-        return employee_service.search_employees(db, search)
-    return employee_service.get_all_employees(db)
+        search_limit = min(limit or settings.search_default_limit, settings.search_max_limit)
+        response.headers.update(headers)
+        return await run_db(db, employee_service.search_employees, search, search_limit)
+    
+    if stream:
+        employees = await stream_scalars(
+            db, employee_service.employees_stream_statement(), settings.stream_batch_size
+        )
+        return StreamingResponse(
+            stream_json_array(employees, EmployeeResponse),
+            media_type="application/json",
+            headers=headers
+        )
+    
+    if limit or cursor:
+        body, next_cursor = await run_db(
+            db, employee_service.get_employees_page, limit or settings.default_page_size, cursor
+        )
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return RawJSONResponse(body, headers=headers)
+    
+    return RawJSONResponse(await run_db(db, employee_service.get_all_employees_json), headers=headers)
+
+
+@router.get("/{id}/calendar", response_model=EmployeeCalendar)
+async def get_employee_calendar(
+    id: int,
+    year: Optional[int] = Query(None, description="Only this year; default is the whole history"),
+    db: Session = Depends(get_read_db)
+) -> EmployeeCalendar:
+    try:
+        return await run_db(db, employee_service.get_employee_calendar, id, year)
+    except EmployeeNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_employee(id: int, db: Session = Depends(get_db)) -> None:
+async def delete_employee(id: int, db: Session = Depends(get_db)) -> None:
     try:
-        employee_service.delete_employee(db, id)
+        await run_db(db, employee_service.delete_employee, id)
     except EmployeeNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
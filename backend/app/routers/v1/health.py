@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 from typing import Dict, Any
+from app.services.employee_directory import employee_directory
+from app.utils import admission
+from app.utils.cache import result_cache
 
 router = APIRouter()
 
@@ -7,3 +10,18 @@ router = APIRouter()
 @router.get("")
 def health_check() -> Dict[str, Any]:
     return {"status": "ok", "version": "1.0.0"}
+
+
+@router.get("/cache")
+def cache_stats() -> Dict[str, Any]:
+    return result_cache.stats()
+
+
+@router.get("/directory")
+def directory_stats() -> Dict[str, Any]:
+    return employee_directory.stats()
+
+
+@router.get("/admission")
+def admission_stats() -> Dict[str, Any]:
+    return admission.stats()
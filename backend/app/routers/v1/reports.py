@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from datetime import date
+from app.config import settings
+from app.database import get_read_db, run_db
+from app.schemas import AttendanceReport
+
+router = APIRouter()
+
+
+@router.get("/attendance", response_model=AttendanceReport)
+async def get_attendance_report(
+    response: Response,
+    from_date: Optional[date] = Query(None, description=f"Default: {settings.report_default_days} days before to_date"),
+    to_date: Optional[date] = Query(None, description="Default: today"),
+    departments: Optional[List[str]] = Query(None),
+    group_by: Literal["department", "employee"] = Query("department"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.max_page_size, description="Employees per page (group_by=employee)"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_read_db)
+) -> AttendanceReport:
+    """Attendance rate, absences, longest absence and absences by weekday per department or per employee."""
+    # Imported on first use so NumPy stays out of startup time
+    from app.services import report_service
+    
+    if group_by == "department":
+        return await run_db(db, report_service.get_department_report, from_date, to_date, departments)
+    
+    report, next_cursor = await run_db(
+        db,
+        report_service.get_employee_report_page,
+        limit or settings.default_page_size,
+        cursor,
+        from_date,
+        to_date,
+        departments
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return report
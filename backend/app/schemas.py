@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator, field_serializer
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from app.models import AttendanceStatus
 
 
@@ -34,11 +34,24 @@ class EmployeeResponse(BaseModel):
         from_attributes = True
 
 
-class AttendanceCreate(BaseModel):
+class EmployeeBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=10000)
+
+
+class EmployeeBulkDeleteResponse(BaseModel):
+    deleted: int
+    not_found: int
+    deleted_ids: List[int]
+    not_found_ids: List[int]
+
+
+class AttendanceBase(BaseModel):
     employee_id: int
     date: date
     status: AttendanceStatus
-    
+
+
+class AttendanceCreate(AttendanceBase):
     @field_validator('date')
     @classmethod
     def validate_date(cls, v: date) -> date:
@@ -66,12 +79,129 @@ class AttendanceResponse(BaseModel):
         from_attributes = True
 
 
+class AttendanceBulkCreate(BaseModel):
+    # Future dates are reported per record instead of failing the whole batch
+    records: List[AttendanceBase] = Field(..., min_length=1, max_length=10000)
+
+
+class AttendanceBulkItemResult(BaseModel):
+    index: int
+    employee_id: int
+    date: date
+    result: Literal["created", "duplicate", "employee_not_found", "future_date"]
+    id: Optional[int] = None
+    
+    @field_serializer('date')
+    def serialize_date(self, value: date) -> str:
+        return value.isoformat() if value else ""
+
+
+class AttendanceBulkResponse(BaseModel):
+    created: int
+    duplicate: int
+    employee_not_found: int
+    future_date: int
+    results: List[AttendanceBulkItemResult]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    total_rows: int
+    imported: int
+    rejected: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class CalendarYear(BaseModel):
+    year: int
+    # Base64 of a little-endian bitset; bit n is day n of the year (1 January = 0)
+    marked: str
+    present: str
+
+
+class EmployeeCalendar(BaseModel):
+    employee_id: int
+    years: List[CalendarYear]
+    marked_days: int
+    present_days: int
+    absent_days: int
+    attendance_rate: Optional[float] = None
+    current_streak: int
+    longest_streak: int
+    longest_absence: int
+    last_marked: Optional[date] = None
+    
+    @field_serializer('last_marked')
+    def serialize_last_marked(self, value: Optional[date]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+
 class AttendanceQuery(BaseModel):
     employee_id: Optional[int] = None
     from_date: Optional[date] = None
     to_date: Optional[date] = None
 
 
+class DashboardStats(BaseModel):
+    total_employees: int
+    today_present: int
+    today_absent: int
+    today_total: int
+    recent_activity: List[dict]
+
+
+class AttendanceTrendPoint(BaseModel):
+    date: date
+    department: str
+    present: int
+    absent: int
+    total: int
+    present_rate: float
+    
+    @field_serializer('date')
+    def serialize_date(self, value: date) -> str:
+        return value.isoformat() if value else ""
+
+
 class ErrorResponse(BaseModel):
     error: str
     detail: Optional[str] = None
+
+
+class AttendanceReportFigures(BaseModel):
+    marked_days: int
+    present_days: int
+    absent_days: int
+    attendance_rate: Optional[float] = None
+    longest_absence: int
+    absences_by_weekday: List[int]  # Monday first
+
+
+class EmployeeAttendanceReport(AttendanceReportFigures):
+    employee_id: int
+    employee_code: str
+    full_name: str
+    department: str
+
+
+class DepartmentAttendanceReport(AttendanceReportFigures):
+    department: str
+    employees: int  # with at least one marked day in the range
+
+
+class AttendanceReport(BaseModel):
+    from_date: date
+    to_date: date
+    departments: List[DepartmentAttendanceReport] = []
+    employees: List[EmployeeAttendanceReport] = []
+    
+    @field_serializer('from_date', 'to_date')
+    def serialize_date(self, value: date) -> str:
+        return value.isoformat()
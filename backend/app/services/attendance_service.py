@@ -1,19 +1,57 @@
+from sqlalchemy import Row, Select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from app.repositories import attendance_repo, employee_repo
+from typing import Any, Dict, NamedTuple, Optional, List, Set, Tuple
+from app.repositories import archive_repo, attendance_repo, version_repo
+from app.services import dashboard_feed, dashboard_service
+from app.services.employee_directory import employee_directory
 from app.models import Attendance
-from app.schemas import AttendanceCreate
+from app.schemas import (
+    AttendanceBase,
+    AttendanceCreate,
+    AttendanceBulkItemResult,
+    AttendanceBulkResponse
+)
 from app.exceptions import (
     DuplicateAttendanceError, 
     InvalidDateError, 
     EmployeeNotFoundError
 )
+from app.utils.cache import result_cache
 from app.utils.logger import logger
-from datetime import date
+from app.utils.pagination import encode_attendance_cursor, decode_attendance_cursor
+from app.utils.serialization import attendance_rows_to_json
+from datetime import date, datetime, timedelta
+
+ATTENDANCE_CACHE = "attendance"
+
+
+def invalidate_attendance_cache(
+    employee_ids: Set[int],
+    departments: Set[str],
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None
+) -> None:
+    """Evict cached lists that could contain rows of these employees within [from_date, to_date]."""
+    def affected(key) -> bool:
+        _, key_employee_id, key_from, key_to, key_departments = key
+        if key_employee_id is not None:
+            if key_employee_id not in employee_ids:
+                return False
+        elif key_departments and departments.isdisjoint(key_departments):
+            return False
+        if from_date and key_to and key_to < from_date:
+            return False
+        if to_date and key_from and key_from > to_date:
+            return False
+        return True
+    
+    result_cache.invalidate(ATTENDANCE_CACHE, affected)
+    dashboard_service.invalidate_dashboard_cache()
 
 
 def mark_attendance(db: Session, attendance_data: AttendanceCreate) -> Attendance:
-    employee = employee_repo.get_employee_by_id(db, attendance_data.employee_id)
+    employee = employee_directory.get(db, attendance_data.employee_id)
     if not employee:
         raise EmployeeNotFoundError(f"Employee with ID {attendance_data.employee_id} not found")
     
@@ -28,18 +66,345 @@ def mark_attendance(db: Session, attendance_data: AttendanceCreate) -> Attendanc
             f"Attendance already marked for employee {attendance_data.employee_id} on {attendance_data.date}"
         )
     
-    attendance = attendance_repo.create_attendance(db, attendance_data)
+    try:
+        attendance = attendance_repo.create_attendance(db, attendance_data, employee.department)
+    except IntegrityError:
+        db.rollback()
+        # Deleted by another worker since the directory last checked, or marked concurrently
+        if employee_directory.drop_deleted(db, (employee.id,)):
+            raise EmployeeNotFoundError(f"Employee with ID {attendance_data.employee_id} not found")
+        if attendance_repo.check_duplicate_attendance(db, attendance_data.employee_id, attendance_data.date):
+            raise DuplicateAttendanceError(
+                f"Attendance already marked for employee {attendance_data.employee_id} on {attendance_data.date}"
+            )
+        raise
+    invalidate_attendance_cache(
+        {employee.id}, {employee.department}, attendance_data.date, attendance_data.date
+    )
+    version_repo.mark_evicted(db)
+    dashboard_feed.publish_attendance(
+        db, [(attendance.id, attendance.employee_id, attendance.date, attendance.status)]
+    )
     logger.info(f"Attendance marked: Employee {attendance_data.employee_id}, Date {attendance_data.date}, Status {attendance_data.status}")
     return attendance
 
 
+def _plan_marks(
+    records: List[AttendanceBase],
+    departments: Dict[int, str],
+    existing: Set[Tuple[int, date]],
+    today: date
+) -> Tuple[List[str], List[dict]]:
+    """The outcome of each record, and the rows to insert for those that will be created."""
+    outcomes: List[str] = []
+    to_insert: List[dict] = []
+    seen = set(existing)
+    for record in records:
+        key = (record.employee_id, record.date)
+        # Same order of checks as a single mark
+        if record.employee_id not in departments:
+            outcomes.append("employee_not_found")
+        elif record.date > today:
+            outcomes.append("future_date")
+        elif key in seen:
+            outcomes.append("duplicate")
+        else:
+            seen.add(key)
+            outcomes.append("created")
+            to_insert.append({"employee_id": record.employee_id, "date": record.date, "status": record.status})
+    return outcomes, to_insert
+
+
+def mark_attendance_bulk(db: Session, records: List[AttendanceBase]) -> AttendanceBulkResponse:
+    today = date.today()
+    candidates = [r for r in records if r.date <= today]
+    
+    departments = {
+        id: employee.department
+        for id, employee in employee_directory.get_many(db, (r.employee_id for r in records)).items()
+    }
+    existing = set()
+    if candidates:
+        existing = attendance_repo.get_existing_attendance_keys(
+            db,
+            departments.keys(),
+            min(r.date for r in candidates),
+            max(r.date for r in candidates)
+        )
+    
+    outcomes, to_insert = _plan_marks(records, departments, existing, today)
+    try:
+        created_ids = attendance_repo.bulk_create_attendance(db, to_insert, departments)
+    except IntegrityError:
+        db.rollback()
+        # Employees deleted by another worker since the directory last checked fail the foreign key
+        deleted = employee_directory.drop_deleted(db, departments.keys())
+        if not deleted:
+            raise
+        for employee_id in deleted:
+            del departments[employee_id]
+        outcomes, to_insert = _plan_marks(records, departments, existing, today)
+        created_ids = attendance_repo.bulk_create_attendance(db, to_insert, departments)
+    
+    if created_ids:
+        created_employee_ids = {employee_id for employee_id, _ in created_ids}
+        created_dates = [record_date for _, record_date in created_ids]
+        invalidate_attendance_cache(
+            created_employee_ids,
+            {departments[employee_id] for employee_id in created_employee_ids},
+            min(created_dates),
+            max(created_dates)
+        )
+        version_repo.mark_evicted(db)
+        dashboard_feed.publish_attendance(db, [
+            (created_ids[(row["employee_id"], row["date"])], row["employee_id"], row["date"], row["status"])
+            for row in to_insert
+            if (row["employee_id"], row["date"]) in created_ids
+        ])
+    
+    results = []
+    for index, (record, outcome) in enumerate(zip(records, outcomes)):
+        record_id = None
+        if outcome == "created":
+            record_id = created_ids.get((record.employee_id, record.date))
+            if record_id is None:
+                # Inserted concurrently by another request after our duplicate check
+                outcome = "duplicate"
+        results.append(AttendanceBulkItemResult(
+            index=index,
+            employee_id=record.employee_id,
+            date=record.date,
+            result=outcome,
+            id=record_id
+        ))
+    
+    counts = {name: 0 for name in ("created", "duplicate", "employee_not_found", "future_date")}
+    for item in results:
+        counts[item.result] += 1
+    logger.info(
+        f"Bulk attendance marked: {counts['created']} created, {counts['duplicate']} duplicate, "
+        f"{counts['employee_not_found']} unknown employee, {counts['future_date']} future date"
+    )
+    return AttendanceBulkResponse(**counts, results=results)
+
+
+def mark_attendance_batch(db: Session, records: List[AttendanceCreate]) -> list:
+    """Mark single-record requests queued by the group-commit writer in one transaction.
+
+    Returns, per record in order, the created row (id, employee_id, date,
+    status, created_at) or the exception mark_attendance would have raised,
+    so each request answers exactly as if it had been written on its own.
+    """
+    response = mark_attendance_bulk(db, records)
+    created = {
+        row.id: row
+        for row in attendance_repo.get_attendance_rows_by_ids(
+            db, (item.id for item in response.results if item.id is not None)
+        )
+    }
+    outcomes = []
+    for record, item in zip(records, response.results):
+        if item.result == "created":
+            outcomes.append(created[item.id])
+        elif item.result == "employee_not_found":
+            outcomes.append(EmployeeNotFoundError(f"Employee with ID {record.employee_id} not found"))
+        elif item.result == "future_date":
+            outcomes.append(InvalidDateError("Date cannot be in the future"))
+        else:
+            outcomes.append(DuplicateAttendanceError(
+                f"Attendance already marked for employee {record.employee_id} on {record.date}"
+            ))
+    return outcomes
+
+
 def get_attendance(
     db: Session, 
     employee_id: Optional[int] = None, 
     from_date: Optional[date] = None, 
     to_date: Optional[date] = None,
     departments: Optional[List[str]] = None
-) -> list[Attendance]:
+) -> list[Row]:
+    if employee_id:
+        departments = None
+    records = attendance_repo.get_attendance_rows(db, employee_id, from_date, to_date, departments)
+    archived = archive_repo.get_rows(db, employee_id, from_date, to_date, departments)
+    return _merge_archived(records, archived)
+
+
+def _merge_archived(records: list, archived: list, limit: Optional[int] = None) -> list:
+    """Combine hot and archived rows, both newest first, into one (date desc, id desc) list."""
+    if not archived:
+        return records
+    # Archived months are older than almost every hot row, but late marks into them may interleave
+    merged = sorted([*records, *archived], key=lambda row: (row[2], row[0]), reverse=True)
+    return merged[:limit] if limit else merged
+
+
+def get_attendance_json(
+    db: Session, 
+    employee_id: Optional[int] = None, 
+    from_date: Optional[date] = None, 
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> bytes:
+    if employee_id:
+        departments = None
+    key = (
+        ATTENDANCE_CACHE,
+        employee_id or None,
+        from_date,
+        to_date,
+        tuple(sorted(set(departments))) if departments else None
+    )
+    return result_cache.get_or_load(
+        key,
+        lambda: attendance_rows_to_json(get_attendance(db, employee_id, from_date, to_date, departments))
+    )
+
+
+def get_attendance_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> Tuple[bytes, Optional[str]]:
+    after = decode_attendance_cursor(cursor) if cursor else None
     if employee_id:
-        return attendance_repo.get_attendance_by_employee(db, employee_id, from_date, to_date)
-    return attendance_repo.get_all_attendance(db, from_date, to_date, departments)
+        departments = None
+    # Fetch one extra row to know whether another page exists
+    records = attendance_repo.get_attendance_rows(
+        db, employee_id, from_date, to_date, departments, after=after, limit=limit + 1
+    )
+    archived = archive_repo.get_rows(
+        db, employee_id, from_date, to_date, departments, after=after, limit=limit + 1
+    )
+    records = _merge_archived(records, archived, limit + 1)
+    
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_attendance_cursor(records[-1].date, records[-1].id)
+    return attendance_rows_to_json(records), next_cursor
+
+
+def attendance_stream_statement(
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> Select:
+    return attendance_repo.attendance_statement(
+        employee_id, from_date, to_date, None if employee_id else departments
+    )
+
+
+def stream_key(row) -> Tuple[date, int]:
+    """Sort key of streamed and exported rows, which come newest first."""
+    return row.date, row.id
+
+
+def get_archived_months(db: Session, from_date: Optional[date] = None, to_date: Optional[date] = None) -> List[date]:
+    """Archived months a stream or export over [from_date, to_date] must merge in, newest first."""
+    return archive_repo.get_archived_months(db, from_date, to_date)
+
+
+def archived_month_bound(month: date) -> Tuple[date, int]:
+    """A stream_key above every row of the month."""
+    return archive_repo.next_month(month), 0
+
+
+def get_archived_month_rows(
+    db: Session,
+    month: date,
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> List[archive_repo.ArchivedRow]:
+    """One archived month's rows within the filters, newest first."""
+    month_end = archive_repo.next_month(month) - timedelta(days=1)
+    return archive_repo.get_rows(
+        db,
+        employee_id,
+        max(from_date, month) if from_date else month,
+        min(to_date, month_end) if to_date else month_end,
+        None if employee_id else departments
+    )
+
+
+EXPORT_FIELDS = (
+    "attendance_id",
+    "date",
+    "status",
+    "employee_id",
+    "employee_code",
+    "employee_name",
+    "department",
+    "created_at",
+)
+
+
+def export_statement(
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> Select:
+    return attendance_repo.export_statement(
+        employee_id, from_date, to_date, None if employee_id else departments
+    )
+
+
+class ArchivedExportRow(NamedTuple):
+    """An archived record in the shape of an export_statement row."""
+    id: int
+    date: date
+    status: Any
+    created_at: Optional[datetime]
+    employee_id: int
+    employee_code: str
+    full_name: str
+    department: str
+
+
+def get_archived_month_export_rows(
+    db: Session,
+    month: date,
+    employee_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> List[ArchivedExportRow]:
+    rows = get_archived_month_rows(db, month, employee_id, from_date, to_date, departments)
+    employees = employee_directory.get_many(db, {row.employee_id for row in rows})
+    return [
+        ArchivedExportRow(
+            row.id, row.date, row.status, row.created_at, row.employee_id,
+            employees[row.employee_id].employee_id,
+            employees[row.employee_id].full_name,
+            employees[row.employee_id].department
+        )
+        for row in rows
+        if row.employee_id in employees
+    ]
+
+
+def export_row_values(row) -> tuple:
+    """Values of one export_statement row in EXPORT_FIELDS order."""
+    return (
+        row.id,
+        row.date.isoformat(),
+        row.status.value,
+        row.employee_id,
+        row.employee_code,
+        row.full_name,
+        row.department,
+        row.created_at.isoformat() if row.created_at else "",
+    )
+
+
+def export_row_dict(row) -> dict:
+    return dict(zip(EXPORT_FIELDS, export_row_values(row)))
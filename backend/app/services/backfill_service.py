@@ -0,0 +1,42 @@
+"""One-off backfill of the tables derived from attendance.
+
+Marks keep the department x day rollup and the yearly attendance bitmaps
+current, but a database that already held attendance when they were added
+has no rows for its history: trends, the calendar and reports would show
+nothing for it. At startup needs_backfill() tells, with one lookup once the
+marker is set, whether that history still has to be rebuilt.
+"""
+
+from typing import Tuple
+from sqlalchemy.orm import Session
+from app.repositories import archive_repo, attendance_repo, bitmap_repo, rollup_repo, version_repo
+from app.services.dashboard_service import invalidate_dashboard_cache
+
+
+def needs_backfill(db: Session) -> bool:
+    """True when the derived tables were never rebuilt and there is attendance they would be missing."""
+    if version_repo.get_version(db, version_repo.DERIVED):
+        return False
+    if not attendance_repo.has_records(db) and not archive_repo.has_months(db):
+        # A new database: every mark from here on is counted as it is written
+        _record_backfill(db)
+        return False
+    return True
+
+
+def backfill(db: Session) -> Tuple[int, int]:
+    """Rebuild the rollup and the bitmaps unless another worker already has; returns their row counts."""
+    if version_repo.get_version(db, version_repo.DERIVED):
+        return 0, 0
+    rollup_rows = rollup_repo.rebuild(db)
+    bitmaps = bitmap_repo.rebuild(db)
+    _record_backfill(db)
+    return rollup_rows, bitmaps
+
+
+def _record_backfill(db: Session) -> None:
+    version_repo.bump(db, version_repo.DERIVED)
+    # Moves the dashboard's ETag and the feed, so trends computed from the incomplete rollup are fetched again
+    version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    invalidate_dashboard_cache()
@@ -0,0 +1,133 @@
+"""Live dashboard updates for GET /api/v1/dashboard/stream (server-sent events).
+
+A client first gets a `snapshot` event, the same payload as GET
+/api/v1/dashboard. After that the services publish small events through
+the broadcast hub as this process writes:
+
+- `attendance`: the newly marked records in recent-activity form (newest
+  first, at most RECENT_ACTIVITY_LIMIT) and `counters`, the change to
+  today_present / today_absent / today_total
+- `employees`: `added` employees, `removed` ids and `counters`, the change
+  to total_employees
+
+Other workers' writes, imports, and what a delete takes away from today's
+counters and the activity list are not published as deltas. A watcher
+covers them instead. While anyone is subscribed it compares the employees
+and attendance table versions every dashboard_stream_check_seconds. When
+either has moved, it broadcasts one fresh `snapshot`, costing one dashboard
+query per worker however many clients are connected. Version moves that
+this process's own published deltas account for are skipped: the watcher
+only recomputes when some change was not published, or when a client has
+subscribed since the last check, whose initial snapshot may overlap a
+delta. Clients replace their state on every snapshot.
+"""
+
+import threading
+from datetime import date
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import AttendanceStatus
+from app.repositories import attendance_repo, version_repo
+from app.services import dashboard_service
+from app.utils.broadcast import BroadcastHub, Subscription
+
+TABLES = (version_repo.EMPLOYEES, version_repo.ATTENDANCE)
+
+hub = BroadcastHub(
+    "dashboard stream",
+    settings.dashboard_stream_max_clients,
+    settings.dashboard_stream_queue_size,
+    settings.dashboard_stream_heartbeat_seconds
+)
+
+# Table versions the last broadcast snapshot reflects
+_versions: Optional[Dict[str, int]] = None
+# Versions set by this process's writes whose deltas were published, and whether anyone subscribed since the check
+_published: Dict[str, Set[int]] = {name: set() for name in TABLES}
+_subscribed = False
+_lock = threading.Lock()
+
+
+def subscribe() -> Optional[Subscription]:
+    """hub.subscribe(), also making the next check send a snapshot whatever moved the versions."""
+    global _subscribed
+    subscription = hub.subscribe()
+    if subscription is not None:
+        with _lock:
+            _subscribed = True
+    return subscription
+
+
+def _mark_published(db: Session, table: str) -> None:
+    versions = version_repo.committed_versions(db, table)
+    with _lock:
+        _published[table].update(versions)
+
+
+def publish_attendance(db: Session, created: Sequence[Tuple[int, int, date, AttendanceStatus]]) -> None:
+    """Publish records this process just committed, given as (id, employee_id, date, status)."""
+    if not created or not hub.active:
+        return
+    today = date.today()
+    counters = {"today_present": 0, "today_absent": 0, "today_total": 0}
+    for _, _, on_date, status in created:
+        if on_date == today:
+            counters["today_present" if status == AttendanceStatus.PRESENT else "today_absent"] += 1
+            counters["today_total"] += 1
+    newest = sorted((id for id, _, _, _ in created), reverse=True)[:dashboard_service.RECENT_ACTIVITY_LIMIT]
+    rows = sorted(
+        attendance_repo.get_attendance_rows_by_ids(db, newest),
+        key=lambda row: (row.created_at, row.id),
+        reverse=True
+    )
+    hub.publish("attendance", {"records": dashboard_service.activity_items(db, rows), "counters": counters})
+    _mark_published(db, version_repo.ATTENDANCE)
+
+
+def publish_employees(added: Iterable = (), removed: Iterable[int] = (), db: Optional[Session] = None) -> None:
+    """Publish employees this process just created or deleted; db is the session that created them."""
+    if not hub.active:
+        return
+    added = [
+        {"id": e.id, "employee_id": e.employee_id, "full_name": e.full_name, "department": e.department}
+        for e in added
+    ]
+    removed = sorted(removed)
+    hub.publish("employees", {
+        "added": added,
+        "removed": removed,
+        "counters": {"total_employees": len(added) - len(removed)},
+    })
+    if db is not None and not removed:
+        # A delete also takes the employees' attendance out of today's counters and the activity list
+        _mark_published(db, version_repo.EMPLOYEES)
+
+
+def _published_only(versions: Dict[str, int]) -> bool:
+    """True when every version since the last snapshot came with a published delta."""
+    return _versions is not None and all(
+        _published[name].issuperset(range(_versions.get(name, 0) + 1, versions.get(name, 0) + 1))
+        for name in TABLES
+    )
+
+
+def publish_snapshot_if_changed(db: Session) -> bool:
+    """Broadcast a fresh snapshot when either table changed since the last one; True if one was sent."""
+    global _versions, _subscribed
+    versions = {name: version for name, (version, _) in version_repo.get_versions(db, TABLES).items()}
+    if versions == _versions:
+        return False
+    with _lock:
+        skip = not _subscribed and _published_only(versions)
+        _subscribed = False
+        for name in TABLES:
+            _published[name] = {version for version in _published[name] if version > versions.get(name, 0)}
+    if skip:
+        _versions = versions
+        return False
+    # Another worker's write never invalidated this process's cached dashboard
+    dashboard_service.invalidate_dashboard_cache()
+    hub.publish("snapshot", dashboard_service.get_dashboard_stats(db).model_dump())
+    _versions = versions
+    return True
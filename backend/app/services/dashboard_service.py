@@ -0,0 +1,80 @@
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from typing import Any, List, Optional
+from app.repositories import attendance_repo, rollup_repo
+from app.models import AttendanceStatus
+from app.schemas import AttendanceTrendPoint, DashboardStats
+from app.services.employee_directory import employee_directory
+from app.utils.cache import result_cache
+
+RECENT_ACTIVITY_LIMIT = 10
+DASHBOARD_CACHE = "dashboard"
+
+
+def invalidate_dashboard_cache() -> None:
+    result_cache.invalidate(DASHBOARD_CACHE)
+
+
+def get_dashboard_stats(db: Session) -> DashboardStats:
+    today = date.today()
+    return result_cache.get_or_load((DASHBOARD_CACHE, today), lambda: _load_dashboard_stats(db, today))
+
+
+def _load_dashboard_stats(db: Session, today: date) -> DashboardStats:
+    total_employees = employee_directory.count(db)
+    
+    today_counts = attendance_repo.count_by_status(db, today)
+    today_present = today_counts.get(AttendanceStatus.PRESENT, 0)
+    today_absent = today_counts.get(AttendanceStatus.ABSENT, 0)
+    
+    recent = attendance_repo.get_recent_activity(db, RECENT_ACTIVITY_LIMIT)
+    
+    return DashboardStats(
+        total_employees=total_employees,
+        today_present=today_present,
+        today_absent=today_absent,
+        today_total=sum(today_counts.values()),
+        recent_activity=activity_items(db, recent)
+    )
+
+
+def activity_items(db: Session, rows: List[Any]) -> List[dict]:
+    """Recent-activity entries for (id, employee_id, date, status, created_at) rows, in the given order."""
+    employees = employee_directory.get_many(db, {row.employee_id for row in rows})
+    items = []
+    for row in rows:
+        employee = employees.get(row.employee_id)
+        items.append({
+            "id": row.id,
+            "employee_id": row.employee_id,
+            "employee_name": employee.full_name if employee else "Unknown",
+            "employee_employee_id": employee.employee_id if employee else "",
+            "date": row.date.isoformat(),
+            "status": row.status.value,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        })
+    return items
+
+
+def get_attendance_trends(
+    db: Session,
+    days: int = 90,
+    departments: Optional[List[str]] = None
+) -> List[AttendanceTrendPoint]:
+    to_date = date.today()
+    from_date = to_date - timedelta(days=days - 1)
+    return [
+        AttendanceTrendPoint(
+            date=row.date,
+            department=row.department,
+            present=row.present,
+            absent=row.absent,
+            total=row.total,
+            present_rate=round(row.present / row.total, 4)
+        )
+        for row in rollup_repo.get_trends(db, from_date, to_date, departments)
+    ]
+
+
+def rebuild_trends(db: Session) -> int:
+    return rollup_repo.rebuild(db)
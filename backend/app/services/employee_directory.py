@@ -0,0 +1,222 @@
+"""In-process employee directory for existence checks and name lookups.
+
+Employees are indexed by primary key, employee code and lowercased email.
+The directory is loaded at startup and follows this process's own writes.
+At most every employee_directory_check_seconds a lookup compares its
+version with the employees entry in table_versions, and reloads when
+another process has changed the table.
+
+Lookups by id that miss fall back to the database, so an employee created
+by another worker is never reported missing. An employee deleted by another
+worker can still be found for up to one check interval; a write that then
+fails on the foreign key calls drop_deleted() to forget it.
+
+The directory holds at most employee_directory_max_entries employees. If
+the table is larger it is incomplete: every miss queries the database and
+the least recently used entries make room for what it finds.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.repositories import employee_repo, version_repo
+from app.utils.logger import logger
+
+
+class DirectoryEntry(NamedTuple):
+    id: int
+    employee_id: str
+    full_name: str
+    email: str
+    department: str
+
+
+def _entry(row: Any) -> DirectoryEntry:
+    return DirectoryEntry(row.id, row.employee_id, row.full_name, row.email, row.department)
+
+
+class EmployeeDirectory:
+    def __init__(self, max_entries: int, check_seconds: float):
+        self.max_entries = max_entries
+        self.check_seconds = check_seconds
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self._by_id: "OrderedDict[int, DirectoryEntry]" = OrderedDict()
+        self._by_code: Dict[str, int] = {}
+        self._by_email: Dict[str, int] = {}
+        self._complete = False
+        # None until loaded; the employees table version the contents reflect
+        self._version: Optional[int] = None
+        self._checked_at = float("-inf")
+        # Guards the indexes only; never held across a query, which in async mode would block the loop
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> int:
+        """Replace the contents with the table (up to max_entries). Returns the number of entries loaded."""
+        version = version_repo.get_version(db, version_repo.EMPLOYEES)
+        rows = employee_repo.get_employee_rows(db, limit=self.max_entries + 1)
+        complete = len(rows) <= self.max_entries
+        entries = [_entry(row) for row in rows[:self.max_entries]]
+        with self._lock:
+            # Older than what we hold: a lagging replica, or our own write committed after the version read
+            if self._version is not None and version < self._version:
+                self._checked_at = time.monotonic()
+                return len(self._by_id)
+            self._by_id = OrderedDict((entry.id, entry) for entry in entries)
+            self._by_code = {entry.employee_id: entry.id for entry in entries}
+            self._by_email = {entry.email.lower(): entry.id for entry in entries}
+            self._complete = complete
+            self._version = version
+            self._checked_at = time.monotonic()
+            self.reloads += 1
+        if not complete:
+            logger.info(f"Employee directory holds {len(entries)} employees, fewer than the table")
+        return len(entries)
+
+    def _check(self, db: Session) -> None:
+        if time.monotonic() - self._checked_at < self.check_seconds:
+            return
+        version = version_repo.get_version(db, version_repo.EMPLOYEES)
+        if self._version is not None and version <= self._version:
+            self._checked_at = time.monotonic()
+        else:
+            self.load(db)
+
+    def _put(self, entry: DirectoryEntry) -> None:
+        # Caller holds the lock
+        self._drop(entry.id)
+        self._by_id[entry.id] = entry
+        self._by_code[entry.employee_id] = entry.id
+        self._by_email[entry.email.lower()] = entry.id
+        while len(self._by_id) > self.max_entries:
+            self._drop(next(iter(self._by_id)))
+            self._complete = False
+
+    def _drop(self, id: int) -> None:
+        # Caller holds the lock
+        entry = self._by_id.pop(id, None)
+        if entry is not None:
+            self._by_code.pop(entry.employee_id, None)
+            self._by_email.pop(entry.email.lower(), None)
+
+    def _written(self, version: int) -> None:
+        # Caller holds the lock. Versions are consecutive, so a gap means another process wrote too
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+
+    def add(self, employee: Any, version: int) -> None:
+        """Record an employee this process created, committed at the given table version."""
+        with self._lock:
+            self._put(_entry(employee))
+            self._written(version)
+
+    def remove(self, ids: Iterable[int], version: int) -> None:
+        """Forget employees this process deleted, committed at the given table version."""
+        with self._lock:
+            for id in ids:
+                self._drop(id)
+            self._written(version)
+
+    def drop_deleted(self, db: Session, ids: Iterable[int]) -> Set[int]:
+        """Forget the ids the database no longer has (deleted by another worker); returns them."""
+        ids = set(ids)
+        deleted = ids - {row.id for row in employee_repo.get_employee_rows_by_ids(db, ids)}
+        with self._lock:
+            for id in deleted:
+                self._drop(id)
+            if deleted:
+                self._complete = False
+        return deleted
+
+    def mark_stale(self) -> None:
+        """Reload at the next lookup, for writes that bypass add() and remove() such as bulk imports."""
+        with self._lock:
+            self._checked_at = float("-inf")
+            self._complete = False
+
+    def get(self, db: Session, id: int) -> Optional[DirectoryEntry]:
+        return self.get_many(db, (id,)).get(id)
+
+    def get_many(self, db: Session, ids: Iterable[int]) -> Dict[int, DirectoryEntry]:
+        """Entries for the ids that exist; unknown ids are omitted."""
+        self._check(db)
+        found: Dict[int, DirectoryEntry] = {}
+        missing = []
+        with self._lock:
+            for id in ids:
+                entry = self._by_id.get(id)
+                if entry is None:
+                    missing.append(id)
+                else:
+                    self._by_id.move_to_end(id)
+                    found[id] = entry
+            self.hits += len(found)
+            self.misses += len(missing)
+        if missing:
+            rows = employee_repo.get_employee_rows_by_ids(db, missing)
+            with self._lock:
+                for row in rows:
+                    found[row.id] = _entry(row)
+                    self._put(found[row.id])
+        return found
+
+    def get_by_code(self, db: Session, employee_id: str) -> Optional[DirectoryEntry]:
+        self._check(db)
+        with self._lock:
+            id = self._by_code.get(employee_id)
+            complete = self._complete
+        if id is not None or complete:
+            return self._hit(id)
+        return self._miss(employee_repo.get_employee_row_by_code(db, employee_id))
+
+    def get_by_email(self, db: Session, email: str) -> Optional[DirectoryEntry]:
+        """Case-insensitive."""
+        self._check(db)
+        with self._lock:
+            id = self._by_email.get(email.lower())
+            complete = self._complete
+        if id is not None or complete:
+            return self._hit(id)
+        return self._miss(employee_repo.get_employee_row_by_email(db, email))
+
+    def _hit(self, id: Optional[int]) -> Optional[DirectoryEntry]:
+        with self._lock:
+            self.hits += 1
+            return self._by_id.get(id) if id is not None else None
+
+    def _miss(self, row: Any) -> Optional[DirectoryEntry]:
+        with self._lock:
+            self.misses += 1
+            if row is None:
+                return None
+            entry = _entry(row)
+            self._put(entry)
+        return entry
+
+    def count(self, db: Session) -> int:
+        self._check(db)
+        if self._complete:
+            return len(self._by_id)
+        return employee_repo.count_employees(db)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._by_id),
+                "max_entries": self.max_entries,
+                "complete": self._complete,
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+            }
+
+
+employee_directory = EmployeeDirectory(
+    settings.employee_directory_max_entries,
+    settings.employee_directory_check_seconds
+)
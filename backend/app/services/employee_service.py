@@ -1,27 +1,90 @@
+from sqlalchemy import Row, Select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.repositories import employee_repo
+from app.repositories import bitmap_repo, employee_repo, version_repo
 from app.models import Employee
-from app.schemas import EmployeeCreate
+from app.schemas import CalendarYear, EmployeeBulkDeleteResponse, EmployeeCalendar, EmployeeCreate
+from app.services import attendance_service, dashboard_feed, dashboard_service
+from app.services.employee_directory import employee_directory
+from app.utils.bitset import longest_run, run_ending_at
+from app.utils.cache import result_cache
 from app.exceptions import DuplicateEmployeeError, EmployeeNotFoundError
 from app.utils.logger import logger
+from app.utils.pagination import encode_employee_cursor, decode_employee_cursor
+from app.utils.serialization import employee_rows_to_json
+from typing import List, Optional, Tuple
+from base64 import b64encode
+from datetime import date, timedelta
 
+EMPLOYEE_CACHE = "employees"
 
-def create_employee(db: Session, employee_data: EmployeeCreate) -> Employee:
-    existing_by_id = employee_repo.get_employee_by_employee_id(db, employee_data.employee_id)
-    if existing_by_id:
+
+def invalidate_employee_cache() -> None:
+    result_cache.invalidate(EMPLOYEE_CACHE)
+
+
+def _check_duplicates(employee_data: EmployeeCreate, by_code, by_email) -> None:
+    if by_code:
         raise DuplicateEmployeeError(f"Employee ID '{employee_data.employee_id}' already exists")
-    
-    existing_by_email = employee_repo.get_employee_by_email(db, employee_data.email)
-    if existing_by_email:
+    if by_email:
         raise DuplicateEmployeeError(f"Email '{employee_data.email}' already exists")
-    
-    employee = employee_repo.create_employee(db, employee_data)
+
+
+def create_employee(db: Session, employee_data: EmployeeCreate) -> Employee:
+    _check_duplicates(
+        employee_data,
+        employee_directory.get_by_code(db, employee_data.employee_id),
+        employee_directory.get_by_email(db, employee_data.email)
+    )
+    try:
+        employee, version = employee_repo.create_employee(db, employee_data)
+    except IntegrityError:
+        # Created by another worker since the directory last checked
+        db.rollback()
+        _check_duplicates(
+            employee_data,
+            employee_repo.get_employee_row_by_code(db, employee_data.employee_id),
+            employee_repo.get_employee_row_by_email(db, employee_data.email)
+        )
+        raise
+    employee_directory.add(employee, version)
+    invalidate_employee_cache()
+    dashboard_service.invalidate_dashboard_cache()
+    version_repo.mark_evicted(db)
+    dashboard_feed.publish_employees(added=[employee], db=db)
     logger.info(f"Employee created: {employee.employee_id}")
     return employee
 
 
-def get_all_employees(db: Session) -> list[Employee]:
-    return employee_repo.get_all_employees(db)
+def get_all_employees(db: Session) -> list[Row]:
+    return employee_repo.get_employee_rows(db)
+
+
+def get_all_employees_json(db: Session) -> bytes:
+    return result_cache.get_or_load(
+        (EMPLOYEE_CACHE,),
+        lambda: employee_rows_to_json(get_all_employees(db))
+    )
+
+
+def get_employees_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[bytes, Optional[str]]:
+    after_id = decode_employee_cursor(cursor) if cursor else None
+    # Fetch one extra row to know whether another page exists
+    employees = employee_repo.get_employee_rows(db, after_id=after_id, limit=limit + 1)
+    
+    next_cursor = None
+    if len(employees) > limit:
+        employees = employees[:limit]
+        next_cursor = encode_employee_cursor(employees[-1].id)
+    return employee_rows_to_json(employees), next_cursor
+
+
+def employees_stream_statement() -> Select:
+    return employee_repo.all_employees_statement()
 
 
 def get_employee_by_id(db: Session, id: int) -> Employee:
@@ -31,16 +94,83 @@ def get_employee_by_id(db: Session, id: int) -> Employee:
     return employee
 
 
-def delete_employee(db: Session, id: int) -> None:
-    employee = employee_repo.get_employee_by_id(db, id)
-    if not employee:
+def get_employee_calendar(db: Session, id: int, year: Optional[int] = None) -> EmployeeCalendar:
+    """Attendance bitmaps plus rate and streak figures computed with bit operations.
+
+    Streaks and absences are runs of consecutive calendar days, so an
+    unmarked day (e.g. a weekend) ends them.
+    """
+    bitmaps = bitmap_repo.get_bitmaps(db, id, year)
+    if not bitmaps and not employee_directory.get(db, id):
         raise EmployeeNotFoundError(f"Employee with ID {id} not found")
     
-    employee_repo.delete_employee(db, id)
-    logger.info(f"Employee deleted: {employee.employee_id}")
+    # Concatenate the years into one bitset whose bit n is day n after origin
+    origin = date(bitmaps[0].year, 1, 1) if bitmaps else date.today()
+    marked = present = 0
+    for bitmap in bitmaps:
+        offset = (date(bitmap.year, 1, 1) - origin).days
+        marked |= bitmap_repo.from_bytes(bitmap.marked) << offset
+        present |= bitmap_repo.from_bytes(bitmap.present) << offset
+    absent = marked & ~present
+    
+    marked_days = marked.bit_count()
+    present_days = present.bit_count()
+    last = marked.bit_length() - 1
+    return EmployeeCalendar(
+        employee_id=id,
+        years=[
+            CalendarYear(
+                year=bitmap.year,
+                marked=b64encode(bitmap.marked).decode(),
+                present=b64encode(bitmap.present).decode()
+            )
+            for bitmap in bitmaps
+        ],
+        marked_days=marked_days,
+        present_days=present_days,
+        absent_days=marked_days - present_days,
+        attendance_rate=round(present_days / marked_days, 4) if marked_days else None,
+        current_streak=run_ending_at(present, last),
+        longest_streak=longest_run(present),
+        longest_absence=longest_run(absent),
+        last_marked=origin + timedelta(days=last) if marked else None
+    )
+
+
+def delete_employee(db: Session, id: int) -> None:
+    deleted, version = employee_repo.delete_employees(db, [id])
+    if not deleted:
+        raise EmployeeNotFoundError(f"Employee with ID {id} not found")
+    _forget_deleted(db, deleted, version)
+    logger.info(f"Employee deleted: {deleted[0].employee_id}")
+
+
+def bulk_delete_employees(db: Session, ids: List[int]) -> EmployeeBulkDeleteResponse:
+    deleted, version = employee_repo.delete_employees(db, ids)
+    if deleted:
+        _forget_deleted(db, deleted, version)
+    deleted_ids = sorted(row.id for row in deleted)
+    not_found_ids = sorted(set(ids) - set(deleted_ids))
+    logger.info(f"Employees bulk deleted: {len(deleted_ids)} deleted, {len(not_found_ids)} not found")
+    return EmployeeBulkDeleteResponse(
+        deleted=len(deleted_ids),
+        not_found=len(not_found_ids),
+        deleted_ids=deleted_ids,
+        not_found_ids=not_found_ids
+    )
+
+
+def _forget_deleted(db: Session, deleted: List[Row], version: int) -> None:
+    ids = {row.id for row in deleted}
+    employee_directory.remove(ids, version)
+    invalidate_employee_cache()
+    # Drops the employees' rows from any list filtered to them, their departments or everyone
+    attendance_service.invalidate_attendance_cache(ids, {row.department for row in deleted})
+    version_repo.mark_evicted(db)
+    dashboard_feed.publish_employees(removed=ids)
 
 
-def search_employees(db: Session, search_query: str) -> list[Employee]:
+def search_employees(db: Session, search_query: str, limit: int) -> list[Employee]:
     if not search_query or not search_query.strip():
-        return employee_repo.get_all_employees(db)
-    return employee_repo.search_employees(db, search_query.strip())
+        return []
+    return employee_repo.search_employees(db, search_query.strip(), limit)
@@ -0,0 +1,193 @@
+"""CSV bulk import of employees and attendance.
+
+Files are parsed row by row and processed in chunks of
+settings.import_chunk_size: each chunk is validated with the same schemas as
+the single-record endpoints, checked for duplicates with one set-based lookup
+per chunk, loaded in one statement (COPY on PostgreSQL) and committed. Rows
+that fail validation or duplicate checks are reported by line and skipped.
+A file that is not UTF-8 stops the import with InvalidCsvError at the first
+undecodable line; the chunks before it stay imported and the error says how
+many rows that was.
+
+Employee CSV columns: employee_id, full_name, email, department.
+Attendance CSV columns: employee_id (primary key) or employee_code, date, status.
+"""
+
+import csv
+import time
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.exceptions import InvalidCsvError
+from app.repositories import attendance_repo, employee_repo
+from app.schemas import AttendanceCreate, EmployeeCreate, ImportReport, ImportRowError
+from app.services import attendance_service, dashboard_service, employee_service
+from app.services.employee_directory import employee_directory
+from app.utils.logger import logger
+
+
+class _Progress:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_rows = 0
+        self.imported = 0
+        self.rejected = 0
+        self.errors: List[ImportRowError] = []
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < settings.import_max_errors:
+            self.errors.append(ImportRowError(line=line, error=error))
+
+    def report(self) -> ImportReport:
+        elapsed = time.perf_counter() - self.started
+        return ImportReport(
+            total_rows=self.total_rows,
+            imported=self.imported,
+            rejected=self.rejected,
+            errors=sorted(self.errors, key=lambda error: error.line),
+            errors_truncated=self.rejected > len(self.errors),
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(self.total_rows / elapsed, 1) if elapsed > 0 else 0.0
+        )
+
+
+def _read_chunks(lines: Iterable[str], progress: _Progress) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    """Yield (line number, row) chunks, stripping whitespace and dropping empty cells."""
+    reader = csv.DictReader(lines)
+    chunk = []
+    try:
+        for raw in reader:
+            progress.total_rows += 1
+            row = {
+                key.strip(): value.strip()
+                for key, value in raw.items()
+                if key is not None and isinstance(value, str) and value.strip()
+            }
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= settings.import_chunk_size:
+                yield chunk
+                chunk = []
+    except InvalidCsvError as e:
+        # Earlier chunks are committed; the caller has counted them by the time this one is read
+        raise InvalidCsvError(f"{e} ({progress.imported} rows before it were imported)") from None
+    if chunk:
+        yield chunk
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+    )
+
+
+def import_employees(db: Session, lines: Iterable[str]) -> ImportReport:
+    progress = _Progress()
+    seen_codes: Set[str] = set()
+    # Lowercased: emails are unique regardless of case, as in single creates
+    seen_emails: Set[str] = set()
+
+    try:
+        for chunk in _read_chunks(lines, progress):
+            valid: List[Tuple[int, EmployeeCreate]] = []
+            for line, row in chunk:
+                try:
+                    valid.append((line, EmployeeCreate(**row)))
+                except ValidationError as e:
+                    progress.reject(line, _validation_message(e))
+
+            existing_codes, existing_emails = employee_repo.get_existing_codes_and_emails(
+                db, (e.employee_id for _, e in valid), (e.email for _, e in valid)
+            )
+            rows = []
+            for line, employee in valid:
+                email = employee.email.lower()
+                if employee.employee_id in existing_codes or employee.employee_id in seen_codes:
+                    progress.reject(line, f"Employee ID '{employee.employee_id}' already exists")
+                elif email in existing_emails or email in seen_emails:
+                    progress.reject(line, f"Email '{employee.email}' already exists")
+                else:
+                    seen_codes.add(employee.employee_id)
+                    seen_emails.add(email)
+                    rows.append(employee.model_dump())
+
+            employee_repo.bulk_insert_employees(db, rows)
+            progress.imported += len(rows)
+    finally:
+        if progress.imported:
+            # Before the caches, so nothing rebuilt from here on sees the old directory
+            employee_directory.mark_stale()
+            employee_service.invalidate_employee_cache()
+            dashboard_service.invalidate_dashboard_cache()
+    report = progress.report()
+    logger.info(
+        f"Employee import: {report.imported} imported, {report.rejected} rejected, "
+        f"{report.rows_per_second} rows/s"
+    )
+    return report
+
+
+def import_attendance(db: Session, lines: Iterable[str]) -> ImportReport:
+    progress = _Progress()
+    seen: Set[Tuple[int, date]] = set()
+    touched_employees: Set[int] = set()
+    touched_departments: Set[str] = set()
+    from_date = to_date = None
+
+    try:
+        for chunk in _read_chunks(lines, progress):
+            codes = employee_repo.get_ids_by_codes(
+                db, (row["employee_code"] for _, row in chunk if "employee_id" not in row and "employee_code" in row)
+            )
+            candidates: List[Tuple[int, AttendanceCreate]] = []
+            for line, row in chunk:
+                if "employee_id" not in row and "employee_code" in row:
+                    if row["employee_code"] not in codes:
+                        progress.reject(line, f"Employee '{row['employee_code']}' not found")
+                        continue
+                    row["employee_id"] = codes[row["employee_code"]]
+                try:
+                    candidates.append((line, AttendanceCreate(**row)))
+                except ValidationError as e:
+                    progress.reject(line, _validation_message(e))
+            if not candidates:
+                continue
+
+            departments = {
+                id: employee.department
+                for id, employee in employee_directory.get_many(db, (r.employee_id for _, r in candidates)).items()
+            }
+            dates = [r.date for _, r in candidates]
+            existing = attendance_repo.get_existing_attendance_keys(db, departments.keys(), min(dates), max(dates))
+            rows = []
+            for line, record in candidates:
+                key = (record.employee_id, record.date)
+                if record.employee_id not in departments:
+                    progress.reject(line, f"Employee with ID {record.employee_id} not found")
+                elif key in existing or key in seen:
+                    progress.reject(
+                        line, f"Attendance already marked for employee {record.employee_id} on {record.date}"
+                    )
+                else:
+                    seen.add(key)
+                    rows.append(record.model_dump())
+
+            progress.imported += attendance_repo.import_attendance_rows(db, rows, departments)
+            for row in rows:
+                touched_employees.add(row["employee_id"])
+                touched_departments.add(departments[row["employee_id"]])
+                from_date = min(from_date or row["date"], row["date"])
+                to_date = max(to_date or row["date"], row["date"])
+    finally:
+        if progress.imported:
+            attendance_service.invalidate_attendance_cache(
+                touched_employees, touched_departments, from_date, to_date
+            )
+    report = progress.report()
+    logger.info(
+        f"Attendance import: {report.imported} imported, {report.rejected} rejected, "
+        f"{report.rows_per_second} rows/s"
+    )
+    return report
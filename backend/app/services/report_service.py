@@ -0,0 +1,181 @@
+"""Attendance reports per department and per employee over a date range.
+
+Figures come from the attendance bitmaps, which already hold every
+employee's history (archived months included) as one pair of day bitsets
+per year. They are unpacked into employees x days matrices and every
+figure is computed with whole-matrix NumPy operations (app.utils.bitmatrix),
+so a report reads one compact row per employee-year instead of one row per
+attendance record.
+
+Runs of absence are consecutive calendar days marked Absent within the
+range; an unmarked day (e.g. a weekend) ends them, as on the calendar.
+"""
+
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.exceptions import InvalidDateError
+from app.repositories import bitmap_repo, employee_repo
+from app.schemas import AttendanceReport, DepartmentAttendanceReport, EmployeeAttendanceReport
+from app.utils import bitmatrix
+from app.utils.pagination import decode_employee_cursor, encode_employee_cursor
+
+
+class _Figures(NamedTuple):
+    """Per-employee arrays, aligned with employee_ids."""
+    employee_ids: np.ndarray
+    department_codes: np.ndarray  # indexes into department_names
+    department_names: List[str]
+    marked: np.ndarray
+    present: np.ndarray
+    longest_absence: np.ndarray
+    weekday_absences: np.ndarray  # (employees, 7), Monday first
+
+
+def _range(from_date: Optional[date], to_date: Optional[date]) -> Tuple[date, date]:
+    to_date = to_date or date.today()
+    from_date = from_date or to_date - timedelta(days=settings.report_default_days - 1)
+    if from_date > to_date:
+        raise InvalidDateError("from_date must not be after to_date")
+    if (to_date - from_date).days + 1 > settings.report_max_days:
+        raise InvalidDateError(f"Report range cannot exceed {settings.report_max_days} days")
+    return from_date, to_date
+
+
+def _figures(rows: list, from_date: date, to_date: date) -> _Figures:
+    days = (to_date - from_date).days + 1
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return _Figures(empty, empty, [], empty, empty, empty, np.zeros((0, 7), dtype=np.int64))
+
+    employee_col, department_col, year_col, marked_col, present_col = zip(*rows)
+    row_employees = np.fromiter(employee_col, dtype=np.int64, count=len(rows))
+    row_years = np.fromiter(year_col, dtype=np.int64, count=len(rows))
+    # Rows come ordered by employee, so unique ids keep that order and index the matrix rows
+    employee_ids, first_rows, positions = np.unique(row_employees, return_index=True, return_inverse=True)
+    department_names = list(dict.fromkeys(department_col))
+    codes = {name: i for i, name in enumerate(department_names)}
+    row_departments = np.fromiter(map(codes.__getitem__, department_col), dtype=np.int64, count=len(rows))
+
+    marked = np.zeros((len(employee_ids), days), dtype=bool)
+    present = np.zeros((len(employee_ids), days), dtype=bool)
+    for year in range(from_date.year, to_date.year + 1):
+        selected = np.flatnonzero(row_years == year)
+        if not len(selected):
+            continue
+        year_start = date(year, 1, 1)
+        first = (max(from_date, year_start) - year_start).days
+        last = (min(to_date, date(year, 12, 31)) - year_start).days
+        offset = (year_start - from_date).days + first
+        width = last - first + 1
+        # Unpack only the bytes holding the range; `shift` is where it starts within the first one
+        first_byte, shift = divmod(first, 8)
+        for target, column in ((marked, marked_col), (present, present_col)):
+            blobs = column if len(selected) == len(rows) else [column[i] for i in selected]
+            bits = bitmatrix.unpack(blobs, bitmap_repo.YEAR_BYTES, first_byte, last // 8 + 1)
+            target[positions[selected], offset:offset + width] = bits[:, shift:shift + width]
+
+    absent = marked & ~present
+    return _Figures(
+        employee_ids,
+        row_departments[first_rows],
+        department_names,
+        np.count_nonzero(marked, axis=1),
+        np.count_nonzero(present, axis=1),
+        bitmatrix.longest_runs(absent),
+        bitmatrix.weekday_counts(absent, from_date)
+    )
+
+
+def _rate(present: int, marked: int) -> Optional[float]:
+    return round(present / marked, 4) if marked else None
+
+
+def _department_reports(figures: _Figures) -> List[DepartmentAttendanceReport]:
+    codes = figures.department_codes
+    count = len(figures.department_names)
+    marked = np.bincount(codes, weights=figures.marked, minlength=count).astype(np.int64)
+    present = np.bincount(codes, weights=figures.present, minlength=count).astype(np.int64)
+    employees = np.bincount(codes, weights=figures.marked > 0, minlength=count).astype(np.int64)
+    longest = np.zeros(count, dtype=np.int64)
+    np.maximum.at(longest, codes, figures.longest_absence)
+    weekdays = np.zeros((count, 7), dtype=np.int64)
+    np.add.at(weekdays, codes, figures.weekday_absences)
+    return [
+        DepartmentAttendanceReport(
+            department=name,
+            employees=int(employees[i]),
+            marked_days=int(marked[i]),
+            present_days=int(present[i]),
+            absent_days=int(marked[i] - present[i]),
+            attendance_rate=_rate(int(present[i]), int(marked[i])),
+            longest_absence=int(longest[i]),
+            absences_by_weekday=weekdays[i].tolist()
+        )
+        for i, name in sorted(enumerate(figures.department_names), key=lambda item: item[1])
+        if employees[i]
+    ]
+
+
+def _employee_reports(employees: list, figures: _Figures) -> List[EmployeeAttendanceReport]:
+    index = {int(employee_id): i for i, employee_id in enumerate(figures.employee_ids)}
+    reports = []
+    for employee in employees:
+        i = index.get(employee.id)
+        marked = int(figures.marked[i]) if i is not None else 0
+        present = int(figures.present[i]) if i is not None else 0
+        reports.append(EmployeeAttendanceReport(
+            employee_id=employee.id,
+            employee_code=employee.employee_id,
+            full_name=employee.full_name,
+            department=employee.department,
+            marked_days=marked,
+            present_days=present,
+            absent_days=marked - present,
+            attendance_rate=_rate(present, marked),
+            longest_absence=int(figures.longest_absence[i]) if i is not None else 0,
+            absences_by_weekday=figures.weekday_absences[i].tolist() if i is not None else [0] * 7
+        ))
+    return reports
+
+
+def get_department_report(
+    db: Session,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> AttendanceReport:
+    from_date, to_date = _range(from_date, to_date)
+    rows = bitmap_repo.get_year_bitmaps(db, from_date.year, to_date.year, departments)
+    figures = _figures(rows, from_date, to_date)
+    return AttendanceReport(from_date=from_date, to_date=to_date, departments=_department_reports(figures))
+
+
+def get_employee_report_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    departments: Optional[List[str]] = None
+) -> Tuple[AttendanceReport, Optional[str]]:
+    """One keyset page of employees in id order, each with their figures for the range."""
+    from_date, to_date = _range(from_date, to_date)
+    after_id = decode_employee_cursor(cursor) if cursor else None
+    employees = employee_repo.get_employee_rows(db, after_id=after_id, limit=limit + 1, departments=departments)
+    next_cursor = None
+    if len(employees) > limit:
+        employees = employees[:limit]
+        next_cursor = encode_employee_cursor(employees[-1].id)
+
+    rows = []
+    if employees:
+        rows = bitmap_repo.get_year_bitmaps(
+            db, from_date.year, to_date.year, departments, employees[0].id, employees[-1].id
+        )
+    figures = _figures(rows, from_date, to_date)
+    return AttendanceReport(
+        from_date=from_date, to_date=to_date, employees=_employee_reports(employees, figures)
+    ), next_cursor
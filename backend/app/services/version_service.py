@@ -0,0 +1,55 @@
+"""Conditional GET validators from the per-table change versions.
+
+Handlers call get_validators before doing any work: one query reads the
+versions of the tables the response is built from, and a request whose
+If-None-Match already names the result gets a 304 without running the
+list or dashboard query.
+
+The same read tells this worker about other workers' writes. When a
+table's version has moved since this process last saw it, the result cache
+entries built from that table are dropped, so a body cached before the
+write is not sent under the ETag that follows it. Versions this process's
+own writes set are skipped once those writes have evicted what they changed
+(version_repo.mark_evicted), which keeps their targeted invalidation.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+from app.repositories import version_repo
+from app.services.attendance_service import ATTENDANCE_CACHE
+from app.services.dashboard_service import DASHBOARD_CACHE
+from app.services.employee_service import EMPLOYEE_CACHE
+from app.utils.cache import result_cache
+from app.utils.conditional import Validators, make_validators
+
+# Result cache namespaces holding data read from each table
+_CACHES = {
+    version_repo.EMPLOYEES: (EMPLOYEE_CACHE, DASHBOARD_CACHE),
+    version_repo.ATTENDANCE: (ATTENDANCE_CACHE, DASHBOARD_CACHE),
+}
+
+_seen: Dict[str, int] = {}
+_seen_lock = threading.Lock()
+
+
+def _forget_stale_results(versions: Dict[str, Tuple[int, Optional[datetime]]]) -> None:
+    moved = []
+    with _seen_lock:
+        for table, (version, _) in versions.items():
+            seen = _seen.get(table, 0)
+            if version > seen:
+                if not version_repo.take_evicted(table, version).issuperset(range(seen + 1, version + 1)):
+                    # Another worker's write, or one of ours still evicting
+                    moved.append(table)
+                _seen[table] = version
+    for namespace in {namespace for table in moved for namespace in _CACHES.get(table, ())}:
+        result_cache.invalidate(namespace)
+
+
+def get_validators(db: Session, tables: Sequence[str], params: Iterable[Tuple[str, str]]) -> Validators:
+    """ETag and Last-Modified for a response built from `tables` for these request parameters."""
+    versions = version_repo.get_versions(db, tables)
+    _forget_stale_results(versions)
+    return make_validators(versions, tables, params)
@@ -0,0 +1,205 @@
+"""Admission control: per-class concurrency limits with bounded wait queues.
+
+Every API request falls into one of three classes: writes, cheap reads and
+heavy reads, which include the requests that can run for seconds. Each
+class has a number of requests allowed to run at once and a number allowed
+to wait for a slot. A request that finds the queue full, or that waits
+longer than admission_queue_timeout_seconds, gets an immediate 503 with
+Retry-After. It is not left holding a threadpool worker while it waits for
+a pooled connection. Slots are handed to waiters in arrival order.
+
+The class comes from the method, path and query string, before routing.
+The health checks, /metrics, CORS preflights and the dashboard event stream
+are not limited. A request keeps its slot until its response has been sent
+in full, so a streamed export counts as running for as long as it streams.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import parse_qs
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import settings
+from app.utils.metrics import ADMISSION_WAIT, register_gauges, render_counters, render_gauges
+
+WRITE = "write"
+READ = "read"
+HEAVY = "heavy"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+# Relative to the API prefix
+EXEMPT_PATHS = {"/dashboard/stream"}
+HEAVY_PATHS = {"/attendance/export", "/attendance/import", "/employees/import", "/reports/attendance"}
+LIST_PATHS = {"/attendance", "/employees"}
+
+
+def _is_heavy_list(path: str, query_string: bytes) -> bool:
+    """Streamed, searched or unpaginated lists read whole tables; a page or one employee's records do not."""
+    params = parse_qs(query_string.decode("latin-1"))
+    if params.get("stream", ["false"])[-1].lower() in ("1", "true", "yes", "on"):
+        return True
+    if path == "/employees" and params.get("search", [""])[-1]:
+        return True
+    if "limit" in params or "cursor" in params:
+        return False
+    return not (path == "/attendance" and "employee_id" in params)
+
+
+def classify(method: str, path: str, query_string: bytes) -> Optional[str]:
+    """The request's admission class, or None when it is not limited."""
+    prefix = settings.api_v1_prefix
+    if method == "OPTIONS" or not path.startswith(prefix + "/"):
+        return None
+    path = path[len(prefix):].rstrip("/")
+    if path in EXEMPT_PATHS:
+        return None
+    if path in HEAVY_PATHS:
+        return HEAVY
+    if method in WRITE_METHODS:
+        # Group commit already funnels single marks through one connection; its batches need many waiting,
+        # so its own queue (group_commit_max_queue) bounds them and answers 503 when full
+        if settings.attendance_group_commit and method == "POST" and path == "/attendance":
+            return None
+        return WRITE
+    if path in LIST_PATHS and _is_heavy_list(path, query_string):
+        return HEAVY
+    return READ
+
+
+class Limiter:
+    """At most `limit` holders at once and `max_queue` waiting; waiters are served first come, first served."""
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in line if needed; False when the queue is full or the wait timed out."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # release() handed over the slot just as the wait ended
+                if isinstance(e, asyncio.CancelledError):
+                    self.release()
+                    raise
+            else:
+                self._waiters.remove(waiter)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                self.timed_out += 1
+                return False
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        # Hand the slot straight to the next waiter, so a newcomer cannot overtake the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+limiters: Dict[str, Limiter] = {
+    name: Limiter(name, limit, max_queue, settings.admission_queue_timeout_seconds)
+    for name, limit, max_queue in (
+        (WRITE, settings.admission_write_limit, settings.admission_write_queue),
+        (READ, settings.admission_read_limit, settings.admission_read_queue),
+        (HEAVY, settings.admission_heavy_limit, settings.admission_heavy_queue),
+    )
+}
+
+
+def stats() -> Dict[str, Any]:
+    return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+def _render_metrics() -> List[str]:
+    gauges = {
+        "hrms_admission_limit": ("Requests allowed to run at once, by class.", "limit"),
+        "hrms_admission_queue_limit": ("Requests allowed to wait for a slot, by class.", "max_queue"),
+        "hrms_admission_active": ("Requests running, by class.", "active"),
+        "hrms_admission_waiting": ("Requests waiting for a slot, by class.", "waiting"),
+    }
+    counters = {
+        "hrms_admission_admitted": ("Requests admitted, by class.", "admitted"),
+        "hrms_admission_rejected": ("Requests refused with 503 because the queue was full, by class.", "rejected"),
+        "hrms_admission_timed_out": ("Requests refused with 503 after waiting too long, by class.", "timed_out"),
+    }
+
+    def samples(metrics):
+        return {
+            name: (help_text, [([("class", limiter.name)], getattr(limiter, attribute)) for limiter in limiters.values()])
+            for name, (help_text, attribute) in metrics.items()
+        }
+
+    return render_gauges(samples(gauges)) + render_counters(samples(counters))
+
+
+class AdmissionMiddleware:
+    """Pure ASGI, so the slot is held until a streaming response has finished."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        register_gauges(_render_metrics)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_class = classify(scope["method"], scope["path"], scope.get("query_string", b""))
+        if request_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = limiters[request_class]
+        started = time.perf_counter()
+        admitted = await limiter.acquire()
+        ADMISSION_WAIT.observe(time.perf_counter() - started, request_class)
+        if not admitted:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy, please retry shortly"},
+                headers={"Retry-After": str(settings.admission_retry_after_seconds)}
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
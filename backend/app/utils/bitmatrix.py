@@ -0,0 +1,39 @@
+"""Vectorized attendance metrics over day bitsets (NumPy).
+
+Attendance bitmaps unpack into boolean matrices with one row per employee
+and one column per day. Every metric here is a whole-matrix operation, so
+the cost grows with employees x days without a Python loop over either.
+"""
+
+from datetime import date
+from typing import Optional, Sequence
+import numpy as np
+
+
+def unpack(blobs: Sequence[bytes], width: int, first_byte: int = 0, end_byte: Optional[int] = None) -> np.ndarray:
+    """Little-endian bitsets of `width` bytes each -> bool matrix whose column n is bit n.
+
+    With a byte range only those bytes are unpacked, and column 0 is bit
+    first_byte * 8.
+    """
+    data = np.frombuffer(b"".join(blobs), dtype=np.uint8).reshape(len(blobs), width)
+    return np.unpackbits(data[:, first_byte:end_byte], axis=1, bitorder="little").view(bool)
+
+
+def longest_runs(matrix: np.ndarray) -> np.ndarray:
+    """Length of the longest run of consecutive True cells in each row."""
+    rows, columns = matrix.shape
+    if columns == 0:
+        return np.zeros(rows, dtype=np.int64)
+    dtype = np.int16 if columns < 2 ** 15 else np.int32
+    counts = np.cumsum(matrix, axis=1, dtype=dtype)
+    # The count as of each row's latest False cell; a run's length is the count since then
+    resets = np.maximum.accumulate(np.where(matrix, 0, counts), axis=1)
+    return (counts - resets).max(axis=1).astype(np.int64)
+
+
+def weekday_counts(matrix: np.ndarray, first_day: date) -> np.ndarray:
+    """True cells per row by weekday, Monday first, when column 0 is first_day."""
+    # Column k of by_offset counts every 7th day from column k, i.e. weekday (first_day + k)
+    by_offset = np.stack([np.count_nonzero(matrix[:, k::7], axis=1) for k in range(7)], axis=1)
+    return np.roll(by_offset, first_day.weekday(), axis=1).astype(np.int64)
@@ -0,0 +1,19 @@
+"""Run-length helpers over Python ints used as bitsets (bit n = day n)."""
+
+
+def longest_run(bits: int) -> int:
+    """Length of the longest run of consecutive set bits."""
+    run = 0
+    # Each step clears the last bit of every run, so runs die in order of length
+    while bits:
+        bits &= bits << 1
+        run += 1
+    return run
+
+
+def run_ending_at(bits: int, top: int) -> int:
+    """Length of the run of set bits that ends at bit `top`, counting downwards."""
+    if top < 0 or not (bits >> top) & 1:
+        return 0
+    zeros_below = ~bits & ((1 << (top + 1)) - 1)
+    return top + 1 - zeros_below.bit_length()
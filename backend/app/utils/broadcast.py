@@ -0,0 +1,157 @@
+"""In-process fan-out of server-sent events to many idle clients.
+
+Each subscriber gets a bounded asyncio queue. A published event is encoded
+once and the same bytes go into every queue. A subscriber whose queue is
+full is dropped rather than waited for: its queue is replaced by a single
+end-of-stream marker, and an EventSource client reconnects and starts over
+from a fresh snapshot. A slow client therefore costs the others nothing.
+
+publish() may be called from any thread (services run in the threadpool in
+sync mode); delivery always happens on the event loop the hub was started
+on. Before start() and after stop(), publish() does nothing, so scripts that
+call the services are unaffected.
+
+One heartbeat task sends an SSE comment to every subscriber at a fixed
+interval, which keeps idle connections open through proxies. Idle clients
+cost one queue and their response task each, with no timer per client.
+"""
+
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional, Set
+import orjson
+from app.utils.logger import logger
+from app.utils.metrics import register_gauges, render_counters, render_gauges
+
+_END = None
+
+
+def encode_event(event: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    """One SSE message; data is sent as a single line of JSON."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode() + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+class Subscription:
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, max_queue: int):
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(max_queue)
+        self.dropped = False
+
+    async def next(self) -> Optional[bytes]:
+        """The next message, or None once the subscription has been dropped."""
+        return await self.queue.get()
+
+
+class BroadcastHub:
+    def __init__(self, name: str, max_subscribers: int, max_queue: int, heartbeat_seconds: float):
+        self.name = name
+        self.max_subscribers = max_subscribers
+        self.max_queue = max_queue
+        self.heartbeat_seconds = heartbeat_seconds
+        self.published = 0
+        self.dropped = 0
+        self.rejected = 0
+        self._subscribers: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        register_gauges(self._render_metrics)
+
+    @property
+    def active(self) -> bool:
+        """True while anyone is listening; publishers can skip building events otherwise."""
+        return self._loop is not None and bool(self._subscribers)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._heartbeat = asyncio.create_task(self._send_heartbeats())
+
+    async def stop(self) -> None:
+        """End every subscriber's stream and stop delivering."""
+        if self._loop is None:
+            return
+        self._heartbeat.cancel()
+        for subscription in list(self._subscribers):
+            self._end(subscription)
+        self._loop = None
+
+    def subscribe(self) -> Optional[Subscription]:
+        """A new subscription, or None when the hub is not running or already at max_subscribers."""
+        if self._loop is None:
+            return None
+        if len(self._subscribers) >= self.max_subscribers:
+            self.rejected += 1
+            return None
+        subscription = Subscription(self.max_queue)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Send an event to every current subscriber; safe to call from any thread."""
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        message = encode_event(event, data, next(self._ids))
+        try:
+            loop.call_soon_threadsafe(self._deliver, message)
+        except RuntimeError:
+            # The loop closed under us during shutdown
+            pass
+
+    def _deliver(self, message: bytes) -> None:
+        self.published += 1
+        self._fan_out(message)
+
+    def _fan_out(self, message: bytes) -> None:
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def _drop(self, subscription: Subscription) -> None:
+        if not subscription.dropped:
+            self.dropped += 1
+        self._end(subscription)
+
+    def _end(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        if subscription.dropped:
+            return
+        subscription.dropped = True
+        queue = subscription.queue
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(_END)
+
+    async def _send_heartbeats(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                self._fan_out(b": keepalive\n\n")
+            except Exception as e:
+                logger.error(f"{self.name} heartbeat failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "published": self.published,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+    def _render_metrics(self) -> List[str]:
+        labels = [("hub", self.name)]
+        return render_gauges({
+            "hrms_sse_subscribers": ("Open server-sent event streams.", [(labels, len(self._subscribers))]),
+        }) + render_counters({
+            "hrms_sse_events_published": ("Events published.", [(labels, self.published)]),
+            "hrms_sse_subscribers_dropped": ("Streams ended because the client fell behind.", [(labels, self.dropped)]),
+            "hrms_sse_subscribers_rejected": ("Streams refused at max_subscribers.", [(labels, self.rejected)]),
+        })
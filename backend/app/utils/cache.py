@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.config import settings
+
+# Keys are tuples whose first element is the namespace, e.g. ("attendance", employee_id, ...)
+CacheKey = Tuple[Hashable, ...]
+
+_MISSING = object()
+
+# True while a request must not be answered from cache (it reads from the primary after a write)
+cache_bypass: ContextVar[bool] = ContextVar("cache_bypass", default=False)
+
+
+class CacheBackend:
+    """Storage interface for ResultCache; implementations must be thread-safe."""
+
+    def get(self, key: CacheKey) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete_where(self, predicate: Callable[[CacheKey], bool]) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class NullBackend(CacheBackend):
+    def get(self, key: CacheKey) -> Any:
+        return _MISSING
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        pass
+
+    def delete_where(self, predicate: Callable[[CacheKey], bool]) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+
+class LRUTTLBackend(CacheBackend):
+    """In-process LRU with a per-entry TTL and a bounded number of entries."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete_where(self, predicate: Callable[[CacheKey], bool]) -> int:
+        with self._lock:
+            doomed = [key for key in self._entries if predicate(key)]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResultCache:
+    """Read-through cache for service-layer query results with targeted invalidation.
+
+    Each namespace carries a generation counter that invalidation bumps, so a
+    load that raced with a write is returned to its caller but never stored.
+    Invalidation is per process; other workers converge within the TTL.
+    """
+
+    def __init__(self, backend: CacheBackend, max_result_rows: int, max_result_bytes: int):
+        self.backend = backend
+        self.max_result_rows = max_result_rows
+        self.max_result_bytes = max_result_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.invalidations = 0
+        self._generations: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: CacheKey, loader: Callable[[], Any]) -> Any:
+        if cache_bypass.get():
+            # Read from the primary after a write: neither served from nor stored in the cache
+            with self._lock:
+                self.bypassed += 1
+            return loader()
+        value = self.backend.get(key)
+        with self._lock:
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+            generation = self._generations.get(key[0], 0)
+
+        value = loader()
+        if isinstance(value, list) and len(value) > self.max_result_rows:
+            return value
+        if isinstance(value, bytes) and len(value) > self.max_result_bytes:
+            return value
+        with self._lock:
+            if self._generations.get(key[0], 0) == generation:
+                self.backend.set(key, value)
+        return value
+
+    def invalidate(self, namespace: Hashable, predicate: Optional[Callable[[CacheKey], bool]] = None) -> int:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        removed = self.backend.delete_where(
+            lambda key: key[0] == namespace and (predicate is None or predicate(key))
+        )
+        with self._lock:
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            for namespace in self._generations:
+                self._generations[namespace] += 1
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": getattr(self.backend, "evictions", 0),
+            "invalidations": self.invalidations,
+        }
+
+
+def _build_backend() -> CacheBackend:
+    if settings.cache_backend == "memory":
+        return LRUTTLBackend(settings.cache_max_entries, settings.cache_ttl_seconds)
+    return NullBackend()
+
+
+result_cache = ResultCache(
+    _build_backend(),
+    settings.cache_max_result_rows,
+    settings.cache_max_result_bytes
+)
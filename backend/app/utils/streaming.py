@@ -0,0 +1,173 @@
+import csv
+import io
+import tempfile
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO, Callable, Iterable, Iterator, Sequence, Tuple, Type, Union
+import orjson
+from pydantic import BaseModel
+from starlette.requests import Request
+from app.exceptions import InvalidCsvError
+
+# Rows are buffered into chunks of roughly this size before being sent
+CHUNK_SIZE = 64 * 1024
+
+Rows = Union[Iterable[Any], AsyncIterable[Any]]
+Chunks = Union[Iterator[bytes], AsyncIterator[bytes]]
+# (bound, load): every row load() returns sorts below bound; load is awaitable when rows are async
+Batch = Tuple[Any, Callable[[], Any]]
+
+
+def _sync_chunks(rows: Iterable[Any], encode: Callable[[Any], bytes], head: bytes, separator: bytes, tail: bytes) -> Iterator[bytes]:
+    buffer = bytearray(head)
+    first = True
+    for row in rows:
+        if not first:
+            buffer += separator
+        buffer += encode(row)
+        first = False
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += tail
+    yield bytes(buffer)
+
+
+async def _async_chunks(rows: AsyncIterable[Any], encode: Callable[[Any], bytes], head: bytes, separator: bytes, tail: bytes) -> AsyncIterator[bytes]:
+    buffer = bytearray(head)
+    first = True
+    async for row in rows:
+        if not first:
+            buffer += separator
+        buffer += encode(row)
+        first = False
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += tail
+    yield bytes(buffer)
+
+
+def _chunks(rows: Rows, encode: Callable[[Any], bytes], head: bytes = b"", separator: bytes = b"", tail: bytes = b"") -> Chunks:
+    """Encode rows incrementally from either a sync or an async iterable."""
+    if hasattr(rows, "__aiter__"):
+        return _async_chunks(rows, encode, head, separator, tail)
+    return _sync_chunks(rows, encode, head, separator, tail)
+
+
+def _sync_merge(rows: Iterable[Any], batches: Sequence[Batch], key: Callable[[Any], Any]) -> Iterator[Any]:
+    pending: deque = deque()
+    upcoming = iter(batches)
+    batch = next(upcoming, None)
+    for row in rows:
+        row_key = key(row)
+        while batch is not None and batch[0] > row_key:
+            pending.extend(batch[1]())
+            batch = next(upcoming, None)
+        while pending and key(pending[0]) > row_key:
+            yield pending.popleft()
+        yield row
+    yield from pending
+    while batch is not None:
+        yield from batch[1]()
+        batch = next(upcoming, None)
+
+
+async def _async_merge(rows: AsyncIterable[Any], batches: Sequence[Batch], key: Callable[[Any], Any]) -> AsyncIterator[Any]:
+    pending: deque = deque()
+    upcoming = iter(batches)
+    batch = next(upcoming, None)
+    async for row in rows:
+        row_key = key(row)
+        while batch is not None and batch[0] > row_key:
+            pending.extend(await batch[1]())
+            batch = next(upcoming, None)
+        while pending and key(pending[0]) > row_key:
+            yield pending.popleft()
+        yield row
+    for row in pending:
+        yield row
+    while batch is not None:
+        for row in await batch[1]():
+            yield row
+        batch = next(upcoming, None)
+
+
+def merge_batches(rows: Rows, batches: Sequence[Batch], key: Callable[[Any], Any]) -> Rows:
+    """Merge rows sorted descending by key with batches that are loaded only when the stream reaches them.
+
+    Batches come in descending bound order, each sorted descending with keys
+    below its bound and at or above the next batch's bound. Only the batches
+    the stream has reached are held in memory.
+    """
+    if not batches:
+        return rows
+    if hasattr(rows, "__aiter__"):
+        return _async_merge(rows, batches, key)
+    return _sync_merge(rows, batches, key)
+
+
+def stream_json_array(rows: Rows, schema: Type[BaseModel]) -> Chunks:
+    """Serialize ORM rows one at a time into a JSON array body."""
+    return _chunks(
+        rows,
+        lambda row: schema.model_validate(row).model_dump_json().encode(),
+        head=b"[",
+        separator=b",",
+        tail=b"]"
+    )
+
+
+def stream_ndjson(rows: Rows, to_dict: Callable[[Any], dict]) -> Chunks:
+    return _chunks(rows, lambda row: orjson.dumps(to_dict(row)) + b"\n")
+
+
+class _CsvLineEncoder:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def __call__(self, values: Sequence[Any]) -> bytes:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(values)
+        return self._buffer.getvalue().encode()
+
+
+def stream_csv(rows: Rows, header: Sequence[str], to_values: Callable[[Any], Sequence[Any]]) -> Chunks:
+    encode_line = _CsvLineEncoder()
+    return _chunks(rows, lambda row: encode_line(to_values(row)), head=encode_line(header))
+
+
+# Uploads larger than this spill from memory to a temporary file
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+async def spool_upload(request: Request) -> BinaryIO:
+    """Copy a raw request body to a spooled temp file; read it with utf8_lines.
+
+    Reading the body as it arrives keeps memory bounded for large uploads
+    without requiring multipart form support.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def utf8_lines(binary: BinaryIO) -> Iterator[str]:
+    """Decode a CSV file line by line for the csv module, skipping a byte order mark.
+
+    Raises InvalidCsvError naming the line and byte offset of the first
+    bytes that are not UTF-8 (e.g. a file saved as Latin-1).
+    """
+    offset = 0
+    for number, raw in enumerate(binary, start=1):
+        try:
+            yield raw.decode("utf-8-sig" if number == 1 else "utf-8")
+        except UnicodeDecodeError as e:
+            raise InvalidCsvError(
+                f"File is not UTF-8: undecodable byte at line {number}, byte offset {offset + e.start}; "
+                f"save it as UTF-8 and upload it again"
+            ) from None
+        offset += len(raw)
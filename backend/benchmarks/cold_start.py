@@ -0,0 +1,97 @@
+"""
+Time from process start to the first healthy response.
+
+Starts uvicorn against a throwaway SQLite database --runs times and polls
+/health until it answers 200. The first boot creates the schema; later
+boots find it current in schema_version and skip DDL. Prints each boot's
+time to healthy alongside the app's own startup breakdown (imports,
+settings, engine connect, schema check).
+
+  cd backend
+  pip install -r benchmarks/requirements.txt
+  python benchmarks/cold_start.py --runs 5
+  python benchmarks/cold_start.py --max-seconds 3   # exit 1 if any warm boot is slower
+
+--max-seconds bounds the boots after the first, which is what a restarted
+deploy sees; the first boot is reported but not checked. tests/test_cold_start.py
+checks the same 3 second bound on one warm boot.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+STARTUP_LOG = "HRMS Lite API started:"
+
+
+def boot(db_path: Path, port: int, mode: str, timeout: float) -> tuple[float, str]:
+    """Start the server, wait for /health, stop it; returns (seconds to healthy, startup log line)."""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", DATABASE_MODE=mode)
+    env.pop("READ_DATABASE_URL", None)
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        healthy = None
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+            while time.perf_counter() - started < timeout:
+                if server.poll() is not None:
+                    break
+                try:
+                    if client.get("/health").status_code == 200:
+                        healthy = time.perf_counter() - started
+                        break
+                except httpx.HTTPError:
+                    time.sleep(0.01)
+    finally:
+        server.terminate()
+        output, _ = server.communicate()
+    if healthy is None:
+        raise RuntimeError(f"server did not become healthy within {timeout:.0f}s:\n{output}")
+    breakdown = next((line.split(STARTUP_LOG, 1)[1].strip() for line in output.splitlines() if STARTUP_LOG in line), "")
+    return healthy, breakdown
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Give up on a boot after this many seconds")
+    parser.add_argument("--max-seconds", type=float, help="Fail when a boot after the first takes longer")
+    args = parser.parse_args()
+
+    print(f"HRMS Lite – cold start ({args.mode} mode, {args.runs} boots)")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "cold_start.db"
+        times = []
+        for run in range(1, args.runs + 1):
+            seconds, breakdown = boot(db_path, args.port, args.mode, args.timeout)
+            times.append(seconds)
+            print(f"  boot {run}: healthy after {seconds * 1000:.0f} ms ({breakdown})")
+
+    warm = times[1:]
+    if warm:
+        print(f"  warm boots: median {statistics.median(warm) * 1000:.0f} ms, max {max(warm) * 1000:.0f} ms")
+    if args.max_seconds is not None and warm and max(warm) > args.max_seconds:
+        print(f"\nFAILED: a warm boot took {max(warm):.2f}s, bound is {args.max_seconds:.2f}s")
+        sys.exit(1)
+    print("\nDone.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Compare request latency of the sync (threadpool) and async (AsyncSession) database modes.
+
+Seeds a throwaway SQLite database, starts uvicorn once per mode and drives a
+read-heavy endpoint mix with N concurrent clients, then prints p50/p99
+latency and throughput for each mode.
+
+  cd backend
+  pip install -r benchmarks/requirements.txt
+  python benchmarks/db_modes.py --clients 200 --requests 10000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def seed(db_path: Path, employees: int, days: int) -> None:
+    """Create the schema and bulk-load employees and attendance through SQLAlchemy Core."""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    code = f"""
+import random
+from datetime import date, timedelta
+from sqlalchemy import insert
+from app.database import SessionLocal, engine, init_db
+from app.models import Employee, Attendance, AttendanceStatus
+from app.repositories import rollup_repo
+
+init_db()
+random.seed(1)
+departments = ["Engineering", "Product", "HR", "Sales", "Marketing", "Design", "Operations", "Finance"]
+with engine.begin() as conn:
+    conn.execute(insert(Employee), [
+        {{"employee_id": f"EMP{{i:06d}}", "full_name": f"Employee {{i}}",
+          "email": f"employee{{i}}@company.com", "department": departments[i % len(departments)]}}
+        for i in range(1, {employees} + 1)
+    ])
+    today = date.today()
+    for d in range(1, {days} + 1):
+        conn.execute(insert(Attendance), [
+            {{"employee_id": i, "date": today - timedelta(days=d),
+              "status": AttendanceStatus.PRESENT if random.random() < 0.85 else AttendanceStatus.ABSENT}}
+            for i in range(1, {employees} + 1)
+        ])
+db = SessionLocal()
+rollup_repo.rebuild(db)
+db.close()
+"""
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, check=True)
+
+
+def request_mix(employees: int):
+    today = date.today()
+    return [
+        lambda: "/api/v1/dashboard",
+        lambda: "/api/v1/employees?limit=50",
+        lambda: f"/api/v1/attendance?employee_id={random.randint(1, employees)}",
+        lambda: f"/api/v1/attendance?from_date={(today - timedelta(days=1)).isoformat()}&limit=100",
+        lambda: "/api/v1/dashboard/trends?days=30",
+    ]
+
+
+async def drive(base_url: str, clients: int, total_requests: int, employees: int):
+    mix = request_mix(employees)
+    latencies = []
+    errors = 0
+    remaining = total_requests
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            path = random.choice(mix)()
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_mode(mode: str, db_path: Path, port: int, args) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        DATABASE_MODE=mode,
+        CACHE_BACKEND="none",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        latencies, errors, elapsed = asyncio.run(drive(base_url, args.clients, args.requests, args.employees))
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "mode": mode,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "rps": len(latencies) / elapsed,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    random.seed(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        print(f"Seeding {args.employees} employees x {args.days} days...")
+        seed(db_path, args.employees, args.days)
+        print(f"{'mode':<8}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'req/s':>10}{'errors':>8}")
+        for mode in args.modes:
+            result = run_mode(mode, db_path, args.port, args)
+            print(
+                f"{result['mode']:<8}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+                f"{result['mean_ms']:>10.1f}{result['rps']:>10.0f}{result['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
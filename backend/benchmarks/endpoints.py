@@ -0,0 +1,298 @@
+"""
+Endpoint benchmark suite with tracked baselines.
+
+For each scale (employees) a throwaway SQLite database is seeded with
+scripts/seed_data.py, then a worker process imports the FastAPI app against
+it and drives every endpoint through an in-process ASGI client: first one
+request per scenario to count SQL queries, then --requests requests with
+--concurrency concurrent clients for latency and throughput. Results
+(p50/p95/p99 ms, req/s, queries per request, errors, peak RSS per scale)
+are written to a JSON file.
+
+  cd backend
+  pip install -r benchmarks/requirements.txt
+  python benchmarks/endpoints.py --scales 1000 10000 100000
+  python benchmarks/endpoints.py --scales 1000 --output benchmarks/results/baseline.json
+  python benchmarks/endpoints.py --scales 1000 --compare benchmarks/results/baseline.json
+
+Compare mode exits non-zero when a scenario's p95 or throughput regresses by
+more than --threshold percent, or when it issues more queries than before.
+The result cache is off unless --cache is given, so numbers reflect the
+database path.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# Fixed so seeded data is identical between runs; marks land on the days after it
+HISTORY_END = date(2026, 1, 1)
+SEARCH_TERMS = ["alex", "chen", "EMP000", "smith", "parker.k", "quinn martinez"]
+
+# (method, path, json body)
+Request = Tuple[str, str, Optional[dict]]
+
+
+def scenarios(employees: int, days: int) -> List[Tuple[str, Callable[[int, random.Random], Request]]]:
+    """Named request factories; each gets the request index and a seeded RNG."""
+    first_day = HISTORY_END - timedelta(days=days - 1)
+    mid_day = HISTORY_END - timedelta(days=days // 2)
+    week_ago = HISTORY_END - timedelta(days=6)
+
+    def employee_id(rng: random.Random) -> int:
+        return rng.randint(1, employees)
+
+    def get(path: str) -> Callable[[int, random.Random], Request]:
+        return lambda i, rng: ("GET", path, None)
+
+    def mark(i: int, rng: random.Random) -> Request:
+        # Every (employee, day) pair after the seeded history is unused
+        day = HISTORY_END + timedelta(days=1 + i // employees)
+        return ("POST", "/api/v1/attendance", {
+            "employee_id": i % employees + 1, "date": day.isoformat(), "status": "Present"
+        })
+
+    return [
+        ("health", get("/health")),
+        ("dashboard", get("/api/v1/dashboard")),
+        ("dashboard_trends", get("/api/v1/dashboard/trends?days=30")),
+        ("employees_page", get("/api/v1/employees?limit=100")),
+        ("employees_page_cursor", lambda i, rng: (
+            "GET", f"/api/v1/employees?limit=100&cursor={_employee_cursor(rng.randint(1, employees))}", None
+        )),
+        ("employees_all", get("/api/v1/employees")),
+        ("employees_search", lambda i, rng: (
+            "GET", f"/api/v1/employees?search={rng.choice(SEARCH_TERMS)}", None
+        )),
+        ("attendance_page", get("/api/v1/attendance?limit=100")),
+        ("attendance_employee", lambda i, rng: (
+            "GET", f"/api/v1/attendance?employee_id={employee_id(rng)}", None
+        )),
+        ("attendance_from", get(f"/api/v1/attendance?from_date={week_ago}&limit=100")),
+        ("attendance_to", get(f"/api/v1/attendance?to_date={mid_day}&limit=100")),
+        ("attendance_range", get(f"/api/v1/attendance?from_date={first_day}&to_date={mid_day}&limit=100")),
+        ("attendance_employee_range", lambda i, rng: (
+            "GET", f"/api/v1/attendance?employee_id={employee_id(rng)}&from_date={week_ago}&to_date={HISTORY_END}", None
+        )),
+        ("attendance_departments", get("/api/v1/attendance?departments=Engineering&departments=HR&limit=100")),
+        ("attendance_departments_range", get(
+            f"/api/v1/attendance?departments=Sales&from_date={week_ago}&to_date={HISTORY_END}&limit=100"
+        )),
+        ("attendance_mark", mark),
+    ]
+
+
+def _employee_cursor(after_id: int) -> str:
+    # Only called in the worker, where the backend is importable
+    from app.utils.pagination import encode_employee_cursor
+    return encode_employee_cursor(after_id)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+# ---------------------------------------------------------------- worker side
+
+async def run_worker(args) -> Dict[str, Any]:
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(BACKEND_DIR)
+    import httpx
+    import logging
+    from sqlalchemy import event
+    from app import database
+    from app.main import app
+
+    # Per-request INFO lines (httpx, app) would dominate the measurement
+    logging.disable(logging.INFO)
+    queries = 0
+
+    def count_query(*_):
+        nonlocal queries
+        queries += 1
+
+    engines = {database.engine, database.read_engine} | {
+        async_engine.sync_engine for async_engine in (database.async_engine, database.async_read_engine) if async_engine
+    }
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", count_query)
+
+    await app.router.startup()
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    results: Dict[str, Any] = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=300) as client:
+        async def send(request: Request) -> httpx.Response:
+            method, path, body = request
+            return await client.request(method, path, json=body)
+
+        plan = scenarios(args.scale, args.days)
+        # Deletes last so every read scenario sees the full data set
+        plan.append(("employee_delete_with_history", lambda i, rng: ("DELETE", f"/api/v1/employees/{args.scale - i}", None)))
+        for name, factory in plan:
+            rng = random.Random(f"{args.seed}:{name}")
+            total = args.requests
+            if name == "employee_delete_with_history":
+                total = min(total, max(1, args.scale // 10))
+
+            queries = 0
+            probe = await send(factory(0, rng))
+            queries_per_request = queries
+
+            indexes = iter(range(1, total))
+            latencies: List[float] = []
+            errors = int(probe.status_code >= 400)
+
+            async def client_loop():
+                nonlocal errors
+                for i in indexes:
+                    request = factory(i, rng)
+                    started = time.perf_counter()
+                    response = await send(request)
+                    latencies.append(time.perf_counter() - started)
+                    errors += response.status_code >= 400
+
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+
+            results[name] = {
+                "requests": len(latencies),
+                "errors": errors,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+                "rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+                "queries_per_request": queries_per_request,
+            }
+            print(f"  {name:<32}{results[name]['p50_ms']:>9}{results[name]['p95_ms']:>9}"
+                  f"{results[name]['rps']:>9}{queries_per_request:>5}{errors:>5}", file=sys.stderr)
+    await app.router.shutdown()
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {"scenarios": results, "peak_rss_mb": round(peak_mb, 1)}
+
+
+# ----------------------------------------------------------- orchestrator side
+
+def seed(db_path: Path, employees: int, days: int) -> None:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    subprocess.run(
+        [sys.executable, "scripts/seed_data.py", "--reset", "--employees", str(employees),
+         "--days", str(days), "--end-date", HISTORY_END.isoformat(), "--workers", "2"],
+        cwd=BACKEND_DIR, env=env, check=True, stdout=subprocess.DEVNULL
+    )
+
+
+def run_scale(scale: int, db_path: Path, args) -> Dict[str, Any]:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        DATABASE_MODE=args.mode,
+        CACHE_BACKEND="memory" if args.cache else "none",
+    )
+    command = [
+        sys.executable, __file__, "--worker", "--scale", str(scale), "--days", str(args.days),
+        "--requests", str(args.requests), "--concurrency", str(args.concurrency), "--seed", str(args.seed),
+    ]
+    print(f"  {'scenario':<32}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>9}{'q':>5}{'err':>5}", file=sys.stderr)
+    completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, check=True, stdout=subprocess.PIPE, text=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Human-readable regressions of current against baseline, for scales and scenarios in both."""
+    regressions = []
+    for scale, result in current["scales"].items():
+        base = baseline.get("scales", {}).get(scale)
+        if not base:
+            continue
+        for name, metrics in result["scenarios"].items():
+            before = base["scenarios"].get(name)
+            if not before or not metrics["p95_ms"] or not before["p95_ms"]:
+                continue
+            label = f"{scale}/{name}"
+            if metrics["p95_ms"] > before["p95_ms"] * (1 + threshold / 100):
+                regressions.append(f"{label}: p95 {before['p95_ms']} -> {metrics['p95_ms']} ms")
+            if metrics["rps"] < before["rps"] * (1 - threshold / 100):
+                regressions.append(f"{label}: throughput {before['rps']} -> {metrics['rps']} req/s")
+            if metrics["queries_per_request"] > before["queries_per_request"]:
+                regressions.append(
+                    f"{label}: queries {before['queries_per_request']} -> {metrics['queries_per_request']}"
+                )
+            if metrics["errors"] > before["errors"]:
+                regressions.append(f"{label}: errors {before['errors']} -> {metrics['errors']}")
+        if result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold / 100):
+            regressions.append(f"{scale}: peak RSS {base['peak_rss_mb']} -> {result['peak_rss_mb']} MB")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000], help="Employee counts")
+    parser.add_argument("--days", type=int, default=30, help="Days of seeded history per employee")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--cache", action="store_true", help="Leave the result cache on")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/endpoints-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Baseline results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed regression in percent")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--scale", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(run_worker(args))))
+        return
+
+    report: Dict[str, Any] = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "days": args.days, "requests": args.requests, "concurrency": args.concurrency,
+            "mode": args.mode, "cache": args.cache, "seed": args.seed, "python": sys.version.split()[0],
+        },
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            db_path = Path(tmp) / f"bench-{scale}.db"
+            print(f"Seeding {scale} employees x {args.days} days...", file=sys.stderr)
+            seed(db_path, scale, args.days)
+            report["scales"][str(scale)] = run_scale(scale, db_path, args)
+
+    output = args.output or RESULTS_DIR / f"endpoints-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nNo regressions against {args.compare} (threshold {args.threshold}%).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Attendance report latency at scale.
+
+Seeds a throwaway SQLite database with scripts/seed_data.py (--employees x
+--days of history), then calls GET /api/v1/reports/attendance in-process
+over the whole history: the report for every department, one filtered to a
+single department, and the first and a middle page of the per-employee
+report. Each scenario runs --repeat times after a warm-up request; the best
+and median times are printed.
+
+  cd backend
+  pip install -r benchmarks/requirements.txt
+  python benchmarks/reports.py --employees 100000 --days 90
+  python benchmarks/reports.py --max-seconds 1   # exit 1 if any scenario's median is slower
+
+Seeding 100k employees x 90 days takes a few minutes; --db keeps the
+database in the given file and reuses it when it already exists.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HISTORY_END = date(2026, 3, 31)
+
+
+def seed(db_path: Path, employees: int, days: int) -> None:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    subprocess.run(
+        [sys.executable, "scripts/seed_data.py", "--reset", "--employees", str(employees),
+         "--days", str(days), "--end-date", HISTORY_END.isoformat(), "--workers", "2"],
+        cwd=BACKEND_DIR, env=env, check=True, stdout=subprocess.DEVNULL
+    )
+
+
+async def measure(client: httpx.AsyncClient, params: dict, repeat: int) -> list[float]:
+    response = await client.get("/api/v1/reports/attendance", params=params)
+    response.raise_for_status()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = await client.get("/api/v1/reports/attendance", params=params)
+        times.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return times
+
+
+async def run(args) -> list[tuple[str, list[float]]]:
+    sys.path.insert(0, str(BACKEND_DIR))
+    from app.main import app
+    from app.utils.pagination import encode_employee_cursor
+
+    window = {
+        "from_date": (HISTORY_END - timedelta(days=args.days - 1)).isoformat(),
+        "to_date": HISTORY_END.isoformat(),
+    }
+    results = []
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            departments = (await client.get("/api/v1/reports/attendance", params=window)).json()["departments"]
+            scenarios = [
+                ("all departments", window),
+                (f"department {departments[0]['department']}", {**window, "departments": departments[0]["department"]}),
+                (f"employees, first {args.page_size}", {**window, "group_by": "employee", "limit": args.page_size}),
+            ]
+            scenarios.append((
+                f"employees, middle {args.page_size}",
+                {**window, "group_by": "employee", "limit": args.page_size,
+                 "cursor": encode_employee_cursor(args.employees // 2)}
+            ))
+            for name, params in scenarios:
+                results.append((name, await measure(client, params, args.repeat)))
+    finally:
+        await app.router.shutdown()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--db", type=Path, help="Keep the seeded database here and reuse it if present")
+    parser.add_argument("--max-seconds", type=float, help="Fail when a scenario's median is slower")
+    args = parser.parse_args()
+
+    print(f"HRMS Lite – attendance reports ({args.employees} employees x {args.days} days, {args.mode} mode)")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db.resolve() if args.db else Path(tmp) / "reports.db"
+        if not db_path.exists():
+            print("  seeding...")
+            started = time.perf_counter()
+            seed(db_path, args.employees, args.days)
+            print(f"  seeded in {time.perf_counter() - started:.0f}s")
+
+        os.environ.update(DATABASE_URL=f"sqlite:///{db_path}", DATABASE_MODE=args.mode, CACHE_BACKEND="none")
+        os.environ.pop("READ_DATABASE_URL", None)
+        os.chdir(BACKEND_DIR)
+        results = asyncio.run(run(args))
+
+    slowest = 0.0
+    print(f"  {'scenario':<32}{'best ms':>9}{'median ms':>11}")
+    for name, times in results:
+        median = statistics.median(times)
+        slowest = max(slowest, median)
+        print(f"  {name:<32}{min(times) * 1000:>9.0f}{median * 1000:>11.0f}")
+    if args.max_seconds is not None and slowest > args.max_seconds:
+        print(f"\nFAILED: slowest median {slowest:.2f}s, bound is {args.max_seconds:.2f}s")
+        sys.exit(1)
+    print("\nDone.")
+
+
+if __name__ == "__main__":
+    main()
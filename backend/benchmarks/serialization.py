@@ -0,0 +1,101 @@
+"""
+Compare the default response path with the fast list serialization path.
+
+The default path loads ORM objects, validates them into AttendanceResponse and
+encodes them the way FastAPI does (jsonable_encoder + json.dumps). The fast
+path selects column tuples and encodes them with orjson. Both run against the
+same in-memory SQLite table and must produce identical bytes.
+
+  cd backend
+  python benchmarks/serialization.py --rows 10000 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models import Attendance, AttendanceStatus, Employee
+from app.repositories import attendance_repo
+from app.schemas import AttendanceResponse
+from app.utils.serialization import attendance_rows_to_json
+
+RESPONSE_ADAPTER = TypeAdapter(List[AttendanceResponse])
+
+
+def build_database(rows: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    employees = max(1, rows // 365)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), [
+            {"employee_id": f"EMP{i:06d}", "full_name": f"Employee {i}",
+             "email": f"employee{i}@company.com", "department": "Engineering"}
+            for i in range(1, employees + 1)
+        ])
+        conn.execute(insert(Attendance), [
+            {"employee_id": n % employees + 1, "date": today - timedelta(days=n // employees),
+             "status": AttendanceStatus.PRESENT if n % 7 else AttendanceStatus.ABSENT}
+            for n in range(rows)
+        ])
+    return engine
+
+
+def default_path(engine) -> bytes:
+    with Session(engine) as db:
+        records = attendance_repo.get_all_attendance(db)
+        validated = RESPONSE_ADAPTER.validate_python(records, from_attributes=True)
+        content = jsonable_encoder(RESPONSE_ADAPTER.dump_python(validated, mode="json"))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def fast_path(engine) -> bytes:
+    with Session(engine) as db:
+        return attendance_rows_to_json(attendance_repo.get_attendance_rows(db))
+
+
+def best_of(fn, engine, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(engine)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'default ms':>12}{'fast ms':>10}{'speedup':>9}")
+    for rows in args.rows:
+        engine = build_database(rows)
+        if default_path(engine) != fast_path(engine):
+            raise SystemExit(f"Output mismatch at {rows} rows")
+        default_seconds = best_of(default_path, engine, args.repeat)
+        fast_seconds = best_of(fast_path, engine, args.repeat)
+        print(
+            f"{rows:>8}{default_seconds * 1000:>12.1f}{fast_seconds * 1000:>10.1f}"
+            f"{default_seconds / fast_seconds:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
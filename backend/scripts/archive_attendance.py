@@ -0,0 +1,153 @@
+"""
+Move closed months of attendance out of the hot attendance table into the
+archive (attendance_archive, one compressed row per employee and month, with
+a per-month manifest in attendance_archive_months), or bring them back.
+Run from backend directory:
+
+  python scripts/archive_attendance.py list
+  python scripts/archive_attendance.py archive 2025-01 2025-02
+  python scripts/archive_attendance.py archive --keep-months 3   # every closed month older than 3 months
+  python scripts/archive_attendance.py restore 2025-01
+  python scripts/archive_attendance.py verify                     # all archived months
+
+Archived rows keep their ids and still appear in GET /api/v1/attendance
+(list and cursor pages). The rollup and bitmaps are unchanged by archiving.
+Each month is moved in its own transaction.
+
+Uses DATABASE_URL from backend/.env.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Ensure backend is on path and .env is loaded (works from any cwd)
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+os.chdir(BACKEND_DIR)
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(BACKEND_DIR / ".env")
+except ImportError:
+    pass
+
+from sqlalchemy import func, select
+from app.database import SessionLocal, init_db
+from app.exceptions import ArchiveError
+from app.models import Attendance
+from app.repositories import archive_repo
+
+
+def parse_month(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {value!r}")
+
+
+def months_to_archive(db, args) -> list[date]:
+    if args.months:
+        return sorted(set(args.months))
+    # Every month with hot rows that ends before the kept window
+    cutoff = archive_repo.first_open_month()
+    for _ in range(args.keep_months):
+        cutoff = (cutoff - timedelta(days=1)).replace(day=1)
+    oldest = db.scalar(select(func.min(Attendance.date)))
+    months = []
+    month = archive_repo.month_start(oldest) if oldest else cutoff
+    while month < cutoff:
+        months.append(month)
+        month = archive_repo.next_month(month)
+    return months
+
+
+def archive(db, args) -> int:
+    for month in months_to_archive(db, args):
+        started = time.perf_counter()
+        moved = archive_repo.archive_month(db, month, args.batch_size)
+        print(f"  {month:%Y-%m}: archived {moved} rows in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def restore(db, args) -> int:
+    for month in sorted(set(args.months)):
+        started = time.perf_counter()
+        restored = archive_repo.restore_month(db, month, args.batch_size)
+        print(f"  {month:%Y-%m}: restored {restored} rows in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def verify(db, args) -> int:
+    months = sorted(set(args.months)) or [manifest.month for manifest in archive_repo.get_months(db)]
+    failed = 0
+    for month in months:
+        check = archive_repo.verify_month(db, month)
+        if check.ok:
+            line = f"  {month:%Y-%m}: OK ({check.rows} rows, checksum {check.checksum})"
+        else:
+            failed += 1
+            line = (
+                f"  {month:%Y-%m}: MISMATCH (manifest {check.expected_rows} rows / {check.expected_checksum}, "
+                f"archive {check.rows} rows / {check.checksum})"
+            )
+        if check.hot_rows:
+            line += f"; {check.hot_rows} rows marked since, archive the month again to move them"
+        print(line)
+    return 1 if failed else 0
+
+
+def list_months(db, args) -> int:
+    manifests = archive_repo.get_months(db)
+    if not manifests:
+        print("  No archived months.")
+    for manifest in manifests:
+        print(f"  {manifest.month:%Y-%m}: {manifest.rows} rows, checksum {manifest.checksum}, archived {manifest.archived_at}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    archive_parser = commands.add_parser("archive", help="Move closed months into the archive")
+    archive_parser.add_argument("months", nargs="*", type=parse_month, metavar="YYYY-MM")
+    archive_parser.add_argument("--keep-months", type=int, default=3,
+                                help="Without explicit months: closed months kept hot before the current one")
+    archive_parser.add_argument("--batch-size", type=int, default=1000, help="Employees per insert")
+    archive_parser.set_defaults(handler=archive)
+
+    restore_parser = commands.add_parser("restore", help="Move archived months back into the attendance table")
+    restore_parser.add_argument("months", nargs="+", type=parse_month, metavar="YYYY-MM")
+    restore_parser.add_argument("--batch-size", type=int, default=1000, help="Employees per insert")
+    restore_parser.set_defaults(handler=restore)
+
+    verify_parser = commands.add_parser("verify", help="Check archived months against their manifest")
+    verify_parser.add_argument("months", nargs="*", type=parse_month, metavar="YYYY-MM")
+    verify_parser.set_defaults(handler=verify)
+
+    list_parser = commands.add_parser("list", help="Show the manifest")
+    list_parser.set_defaults(handler=list_months)
+
+    args = parser.parse_args()
+    print(f"HRMS Lite – attendance archive: {args.command}")
+    init_db()
+    db = SessionLocal()
+    try:
+        status = args.handler(db, args)
+    except ArchiveError as e:
+        print(f"  Error: {e}")
+        status = 1
+    finally:
+        db.close()
+    if status == 0:
+        print("\nDone.")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Deterministic synthetic data for seeding and load testing.
+Pure Python (no app imports) so both seed_data.py and seed_standalone.py can use it.
+
+Every batch draws from its own RNG seeded with (seed, kind, batch start), so
+the generated rows depend only on the parameters, never on batch order or on
+how many worker processes produced them.
+"""
+
+import argparse
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from multiprocessing import Pool
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+# Same departments as frontend (keep in sync with DEPARTMENT_OPTIONS)
+DEPARTMENTS = [
+    "Engineering",
+    "Product",
+    "HR",
+    "Sales",
+    "Marketing",
+    "Design",
+    "Operations",
+    "Finance",
+]
+
+FIRST_NAMES = [
+    "Alex", "Jordan", "Sam", "Riley", "Morgan", "Casey", "Jamie", "Quinn", "Skyler", "Taylor",
+    "Avery", "Cameron", "Drew", "Emerson", "Finley", "Harper", "Hayden", "Jesse", "Kai", "Logan",
+    "Parker", "Peyton", "Reese", "Rowan", "Sage", "Shawn", "Toby", "Wren", "Blake", "Charlie",
+]
+LAST_NAMES = [
+    "Chen", "Smith", "Williams", "Davis", "Taylor", "Brown", "Lee", "Martinez", "Johnson", "Wilson",
+    "Garcia", "Miller", "Anderson", "Thomas", "Moore", "Jackson", "Martin", "Thompson", "White", "Lopez",
+    "Harris", "Clark", "Lewis", "Walker", "Hall", "Young", "King", "Wright", "Scott", "Green",
+]
+
+# (employee_id, full_name, email, department)
+EmployeeRow = Tuple[str, str, str, str]
+# (employee pk, date, present)
+AttendanceRow = Tuple[int, date, bool]
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    employees: int = 10
+    departments: int = len(DEPARTMENTS)
+    days: int = 14
+    present_ratio: float = 0.85
+    seed: int = 42
+    end_date: Optional[date] = None  # last day of history; defaults to today
+    batch_size: int = 10_000  # rows per generated batch
+    workers: int = 1
+    domain: str = "company.com"
+
+    @property
+    def department_names(self) -> List[str]:
+        extra = [f"Department {n}" for n in range(len(DEPARTMENTS) + 1, self.departments + 1)]
+        return (DEPARTMENTS + extra)[:self.departments]
+
+    @property
+    def last_date(self) -> date:
+        return self.end_date or date.today()
+
+
+def employee_code(config: GeneratorConfig, index: int) -> str:
+    """EMP001.. for small runs, zero-padded wider as the employee count grows."""
+    return f"EMP{index:0{max(3, len(str(config.employees)))}d}"
+
+
+def _rng(config: GeneratorConfig, kind: str, start: int) -> random.Random:
+    return random.Random(f"{config.seed}:{kind}:{start}")
+
+
+def employee_batch(config: GeneratorConfig, start: int, stop: int) -> List[EmployeeRow]:
+    """Employees with 1-based indexes in [start, stop)."""
+    rng = _rng(config, "employees", start)
+    departments = config.department_names
+    rows = []
+    for index in range(start, stop):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append((
+            employee_code(config, index),
+            f"{first} {last}",
+            f"{first.lower()}.{last.lower()}.{index}@{config.domain}",
+            rng.choice(departments),
+        ))
+    return rows
+
+
+def attendance_batch(config: GeneratorConfig, employee_pks: Sequence[int]) -> List[AttendanceRow]:
+    """Full history for these employees; the RNG is keyed by the first pk so reruns match."""
+    rng = _rng(config, "attendance", employee_pks[0] if employee_pks else 0)
+    dates = [config.last_date - timedelta(days=d) for d in range(config.days)]
+    return [
+        (pk, day, rng.random() < config.present_ratio)
+        for pk in employee_pks
+        for day in dates
+    ]
+
+
+def _employee_job(args: Tuple[GeneratorConfig, int, int]) -> List[EmployeeRow]:
+    return employee_batch(*args)
+
+
+def _attendance_job(args: Tuple[GeneratorConfig, Sequence[int]]) -> List[AttendanceRow]:
+    return attendance_batch(*args)
+
+
+def _run(job: Callable, jobs: List[tuple], workers: int) -> Iterator[list]:
+    """Yield batch results in job order, generated in worker processes when workers > 1."""
+    if workers <= 1:
+        for args in jobs:
+            yield job(args)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap(job, jobs)
+
+
+def iter_employee_batches(config: GeneratorConfig) -> Iterator[List[EmployeeRow]]:
+    jobs = [
+        (config, start, min(start + config.batch_size, config.employees + 1))
+        for start in range(1, config.employees + 1, config.batch_size)
+    ]
+    return _run(_employee_job, jobs, config.workers)
+
+
+def iter_attendance_batches(config: GeneratorConfig, employee_pks: Sequence[int]) -> Iterator[List[AttendanceRow]]:
+    per_batch = max(1, config.batch_size // max(1, config.days))
+    jobs = [
+        (config, employee_pks[start:start + per_batch])
+        for start in range(0, len(employee_pks), per_batch)
+    ]
+    return _run(_attendance_job, jobs, config.workers)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--employees", type=int, default=10)
+    parser.add_argument("--departments", type=int, default=len(DEPARTMENTS))
+    parser.add_argument("--days", type=int, default=14, help="Days of attendance history per employee")
+    parser.add_argument("--present-ratio", type=float, default=0.85)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None,
+                        help="Last day of history (YYYY-MM-DD); pin it to make runs on different days identical")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1, help="Processes generating batches")
+    parser.add_argument("--reset", action="store_true", help="Delete existing employees and attendance first")
+
+
+def config_from_args(args: argparse.Namespace) -> GeneratorConfig:
+    return GeneratorConfig(
+        employees=args.employees,
+        departments=args.departments,
+        days=args.days,
+        present_ratio=args.present_ratio,
+        seed=args.seed,
+        end_date=args.end_date,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
@@ -0,0 +1,70 @@
+"""
+Bulk import employees or attendance from a CSV file.
+Run from backend directory:
+  python scripts/import_csv.py employees path/to/employees.csv
+  python scripts/import_csv.py attendance path/to/attendance.csv
+
+Employee columns: employee_id, full_name, email, department.
+Attendance columns: employee_id (primary key) or employee_code, date, status.
+Uses DATABASE_URL from backend/.env.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Ensure backend is on path and .env is loaded (works from any cwd)
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+# Resolve the CSV path against the caller's directory before switching to backend
+INVOKED_FROM = Path.cwd()
+os.chdir(BACKEND_DIR)
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(BACKEND_DIR / ".env")
+except ImportError:
+    pass
+
+from app.database import SessionLocal, init_db
+from app.exceptions import InvalidCsvError
+from app.services import import_service
+from app.utils.streaming import utf8_lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=["employees", "attendance"])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--show-errors", type=int, default=20, help="Number of rejected rows to print")
+    args = parser.parse_args()
+    path = INVOKED_FROM / args.path
+
+    print(f"HRMS Lite – import {args.kind} from {path}")
+    init_db()
+    importer = import_service.import_employees if args.kind == "employees" else import_service.import_attendance
+    db = SessionLocal()
+    try:
+        with open(path, "rb") as f:
+            report = importer(db, utf8_lines(f))
+    except InvalidCsvError as e:
+        print(f"  {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"  Rows read:  {report.total_rows}")
+    print(f"  Imported:   {report.imported}")
+    print(f"  Rejected:   {report.rejected}")
+    print(f"  Throughput: {report.rows_per_second:.0f} rows/s ({report.elapsed_seconds:.2f}s)")
+    for error in report.errors[:args.show_errors]:
+        print(f"    line {error.line}: {error.error}")
+    if report.rejected > args.show_errors:
+        print(f"    ... {report.rejected - args.show_errors} more")
+    print("\nDone.")
+
+
+if __name__ == "__main__":
+    main()
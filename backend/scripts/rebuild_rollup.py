@@ -0,0 +1,50 @@
+"""
+Rebuild the tables derived from attendance: the department x day rollup and
+the per-employee yearly attendance bitmaps. The API backfills both once on
+its first start against a database that already holds attendance; run this
+any time the counters are suspect.
+Run from backend directory: python scripts/rebuild_rollup.py
+
+Uses DATABASE_URL from backend/.env.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Ensure backend is on path and .env is loaded (works from any cwd)
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+os.chdir(BACKEND_DIR)
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(BACKEND_DIR / ".env")
+except ImportError:
+    pass
+
+from app.database import SessionLocal, init_db
+from app.repositories import bitmap_repo, version_repo
+from app.services import dashboard_service
+
+
+def main() -> None:
+    print("HRMS Lite – rebuild attendance rollup and bitmaps")
+    init_db()
+    db = SessionLocal()
+    try:
+        rows = dashboard_service.rebuild_trends(db)
+        print(f"  Rebuilt {rows} (date, department) rollup rows.")
+        rows = bitmap_repo.rebuild(db)
+        print(f"  Rebuilt {rows} (employee, year) attendance bitmaps.")
+        # Nothing left for the API's startup backfill to do
+        version_repo.bump(db, version_repo.DERIVED)
+        db.commit()
+        print("\nDone.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
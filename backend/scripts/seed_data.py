@@ -1,16 +1,23 @@
 """
-Seed script: creates 10 fake employees and optional attendance records.
+Seed script: generates fake employees and attendance history.
 Run from backend directory: python scripts/seed_data.py
 Or from project root: python backend/scripts/seed_data.py
 
+Defaults match the original demo data (10 employees, 14 days). For
+production-sized load tests, e.g. 100k employees x 365 days:
+
+  python scripts/seed_data.py --reset --employees 100000 --days 365 --workers 4 --end-date 2026-01-31
+
+Output is deterministic for the same parameters (see scripts/datagen.py).
+Rows are bulk-loaded in batches through SQLAlchemy Core, or COPY on PostgreSQL.
 Uses DATABASE_URL from backend/.env (works locally or against deployed DB).
 """
 
+import argparse
 import os
 import sys
+import time
 from pathlib import Path
-from datetime import date, timedelta
-import random
 
 # Ensure backend is on path and .env is loaded (works from any cwd)
 BACKEND_DIR = Path(__file__).resolve().parent.parent
@@ -24,95 +31,129 @@ try:
 except ImportError:
     pass
 
+from sqlalchemy import delete, insert, select, text
 from app.database import SessionLocal, init_db
-from app.models import Employee, Attendance, AttendanceStatus
-
-
-# Same departments as frontend (keep in sync with DEPARTMENT_OPTIONS)
-DEPARTMENTS = [
-    "Engineering",
-    "Product",
-    "HR",
-    "Sales",
-    "Marketing",
-    "Design",
-    "Operations",
-    "Finance",
-]
-
-# 10 fake users: (employee_id, full_name, email_suffix for uniqueness)
-FAKE_EMPLOYEES = [
-    ("EMP001", "Alex Chen", "alex.chen"),
-    ("EMP002", "Jordan Smith", "jordan.smith"),
-    ("EMP003", "Sam Williams", "sam.williams"),
-    ("EMP004", "Riley Davis", "riley.davis"),
-    ("EMP005", "Morgan Taylor", "morgan.taylor"),
-    ("EMP006", "Casey Brown", "casey.brown"),
-    ("EMP007", "Jamie Lee", "jamie.lee"),
-    ("EMP008", "Quinn Martinez", "quinn.martinez"),
-    ("EMP009", "Skyler Johnson", "skyler.johnson"),
-    ("EMP010", "Taylor Wilson", "taylor.wilson"),
-]
-
-
-def seed_employees(db, domain: str = "company.com") -> list[Employee]:
-    """Create 10 employees if they don't exist. Returns created or existing."""
-    created = []
-    for employee_id, full_name, email_local in FAKE_EMPLOYEES:
-        existing = db.query(Employee).filter(Employee.employee_id == employee_id).first()
-        if existing:
-            print(f"  Skip (exists): {employee_id} {full_name}")
-            created.append(existing)
-            continue
-        email = f"{email_local}@{domain}"
-        department = random.choice(DEPARTMENTS)
-        emp = Employee(
-            employee_id=employee_id,
-            full_name=full_name,
-            email=email,
-            department=department,
+from app.models import (
+    Employee, Attendance, AttendanceArchive, AttendanceArchiveMonth, AttendanceBitmap,
+    AttendanceDailyRollup, AttendanceStatus
+)
+from app.repositories import bitmap_repo, bulk_load, version_repo
+from app.services import dashboard_service
+import datagen
+
+EMPLOYEE_COLUMNS = ("employee_id", "full_name", "email", "department")
+ATTENDANCE_COLUMNS = ("employee_id", "date", "status")
+# Enum columns store member names
+PRESENT, ABSENT = AttendanceStatus.PRESENT.name, AttendanceStatus.ABSENT.name
+
+
+def load(db, model, columns, records) -> None:
+    """Bulk-load tuples already in column storage form; COPY on PostgreSQL, executemany elsewhere."""
+    connection = db.connection()
+    if bulk_load.copy_records(db, model.__tablename__, columns, records):
+        pass
+    elif connection.dialect.name == "sqlite":
+        # Raw executemany skips Core's per-row bind processing, which dominates at this volume
+        connection.exec_driver_sql(
+            f"INSERT INTO {model.__tablename__} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            records
         )
-        db.add(emp)
+    else:
+        connection.execute(insert(model.__table__), [dict(zip(columns, record)) for record in records])
+    db.commit()
+
+
+def reset(db) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        # RESTART IDENTITY keeps primary keys identical across reseeded runs
+        db.execute(text("TRUNCATE attendance_daily_rollup, attendance_bitmaps, attendance_archive_months, attendance_archive, attendance, employees RESTART IDENTITY"))
+    else:
+        db.execute(delete(AttendanceDailyRollup))
+        db.execute(delete(AttendanceBitmap))
+        db.execute(delete(AttendanceArchiveMonth))
+        db.execute(delete(AttendanceArchive))
+        db.execute(delete(Attendance))
+        db.execute(delete(Employee))
+    # Running API workers reload their employee directory; cached views revalidate
+    version_repo.bump(db, version_repo.EMPLOYEES)
+    version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+
+
+def seed_employees(db, config: datagen.GeneratorConfig) -> list[int]:
+    """Create generated employees that don't exist yet. Returns the primary keys of the new ones."""
+    existing = set(db.scalars(select(Employee.employee_id)))
+    created = 0
+    for batch in datagen.iter_employee_batches(config):
+        rows = [row for row in batch if row[0] not in existing]
+        if rows:
+            load(db, Employee, EMPLOYEE_COLUMNS, rows)
+            created += len(rows)
+    if created:
+        version_repo.bump(db, version_repo.EMPLOYEES)
         db.commit()
-        db.refresh(emp)
-        created.append(emp)
-        print(f"  Created: {employee_id} {full_name} ({department}) {email}")
-    return created
-
-
-def seed_attendance(db, employees: list[Employee], days_back: int = 14) -> None:
-    """Add attendance for the last `days_back` days (mix of Present/Absent)."""
-    today = date.today()
-    for emp in employees:
-        for d in range(days_back):
-            att_date = today - timedelta(days=d)
-            existing = (
-                db.query(Attendance)
-                .filter(Attendance.employee_id == emp.id, Attendance.date == att_date)
-                .first()
-            )
-            if existing:
-                continue
-            # ~85% present, 15% absent
-            status = AttendanceStatus.PRESENT if random.random() < 0.85 else AttendanceStatus.ABSENT
-            att = Attendance(employee_id=emp.id, date=att_date, status=status)
-            db.add(att)
-        db.commit()
-    print(f"  Added attendance for last {days_back} days for {len(employees)} employees.")
+    if existing:
+        print(f"  Skipped {config.employees - created} existing employees (their history is left as is).")
+    print(f"  Created {created} employees.")
+
+    codes = {datagen.employee_code(config, i) for i in range(1, config.employees + 1)} - existing
+    return sorted(pk for code, pk in db.execute(select(Employee.employee_id, Employee.id)) if code in codes)
+
+
+def seed_attendance(db, config: datagen.GeneratorConfig, employee_pks: list[int], defer_indexes: bool) -> int:
+    """Add full history (and its bitmaps) for the given employees, one bulk load per generated batch.
+
+    With defer_indexes the non-unique attendance indexes are dropped for the
+    load and rebuilt once at the end, which is much faster than maintaining
+    them row by row on a large load.
+    """
+    deferred = [index for index in Attendance.__table__.indexes if not index.unique] if defer_indexes else []
+    for index in deferred:
+        index.drop(db.connection(), checkfirst=True)
+    db.commit()
+
+    count = 0
+    for batch in datagen.iter_attendance_batches(config, employee_pks):
+        rows = [(pk, day.isoformat(), PRESENT if present else ABSENT) for pk, day, present in batch]
+        marks: bitmap_repo.BitmapMarks = {}
+        for pk, day, present in batch:
+            bitmap_repo.add_mark(marks, pk, day, AttendanceStatus.PRESENT if present else AttendanceStatus.ABSENT)
+        # Batches hold whole employees, so these bitmaps are complete
+        bitmap_repo.apply_marks(db, marks)
+        load(db, Attendance, ATTENDANCE_COLUMNS, rows)
+        count += len(rows)
+
+    for index in deferred:
+        index.create(db.connection())
+    if count:
+        version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    return count
 
 
 def main() -> None:
-    random.seed(42)  # Reproducible fake data
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    datagen.add_arguments(parser)
+    args = parser.parse_args()
+    config = datagen.config_from_args(args)
+
     print("HRMS Lite – seed data")
     print("Using DATABASE_URL from backend/.env")
     init_db()
     db = SessionLocal()
+    started = time.perf_counter()
     try:
-        print("\n1. Seeding employees (10)...")
-        employees = seed_employees(db)
-        print("\n2. Seeding attendance (last 14 days)...")
-        seed_attendance(db, employees, days_back=14)
-        print("\nDone.")
+        if args.reset:
+            print("\n0. Deleting existing employees and attendance...")
+            reset(db)
+        print(f"\n1. Seeding employees ({config.employees})...")
+        employee_pks = seed_employees(db, config)
+        print(f"\n2. Seeding attendance (last {config.days} days up to {config.last_date})...")
+        rows = seed_attendance(db, config, employee_pks, defer_indexes=args.reset)
+        print(f"  Added {rows} attendance rows for {len(employee_pks)} employees.")
+        print("\n3. Rebuilding attendance rollup...")
+        dashboard_service.rebuild_trends(db)
+        print(f"\nDone in {time.perf_counter() - started:.1f}s.")
     finally:
         db.close()
 
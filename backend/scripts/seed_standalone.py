@@ -5,14 +5,20 @@ Use this when the full app (pydantic/SQLAlchemy) won't install on your Python (e
   cd backend
   pip install python-dotenv psycopg2-binary
   python scripts/seed_standalone.py
+  python scripts/seed_standalone.py --reset --employees 100000 --days 365 --workers 4 --end-date 2026-01-31
 
-Uses DATABASE_URL from backend/.env. Safe to run multiple times (skips existing).
+Takes the same parameters and generates the same rows as seed_data.py
+(scripts/datagen.py), loading each batch with COPY.
+Uses DATABASE_URL from backend/.env. Safe to run multiple times (skips existing employees).
 """
 
+import argparse
+import csv
+import io
 import os
-import random
+import time
+from datetime import date
 from pathlib import Path
-from datetime import date, timedelta
 
 BACKEND_DIR = Path(__file__).resolve().parent.parent
 os.chdir(BACKEND_DIR)
@@ -29,26 +35,48 @@ except ImportError:
     print("Install: pip install psycopg2-binary python-dotenv")
     raise
 
-DEPARTMENTS = [
-    "Engineering", "Product", "HR", "Sales",
-    "Marketing", "Design", "Operations", "Finance",
-]
-FAKE_EMPLOYEES = [
-    ("EMP001", "Alex Chen", "alex.chen"),
-    ("EMP002", "Jordan Smith", "jordan.smith"),
-    ("EMP003", "Sam Williams", "sam.williams"),
-    ("EMP004", "Riley Davis", "riley.davis"),
-    ("EMP005", "Morgan Taylor", "morgan.taylor"),
-    ("EMP006", "Casey Brown", "casey.brown"),
-    ("EMP007", "Jamie Lee", "jamie.lee"),
-    ("EMP008", "Quinn Martinez", "quinn.martinez"),
-    ("EMP009", "Skyler Johnson", "skyler.johnson"),
-    ("EMP010", "Taylor Wilson", "taylor.wilson"),
-]
+import datagen
+
+
+def copy(cur, table: str, columns: tuple, records) -> None:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(records)
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def bitmap_records(batch):
+    """attendance_bitmaps rows for a batch of whole employee histories.
+
+    Same layout as app/repositories/bitmap_repo.py: bit n of a 46-byte
+    little-endian bitset is day n of the year; bytea goes in as hex.
+    """
+    bits = {}
+    for pk, day, present in batch:
+        bit = 1 << (day.toordinal() - date(day.year, 1, 1).toordinal())
+        marked, present_bits = bits.get((pk, day.year), (0, 0))
+        bits[(pk, day.year)] = (marked | bit, present_bits | bit if present else present_bits)
+    return [
+        (pk, year, "\\x" + marked.to_bytes(46, "little").hex(), "\\x" + present_bits.to_bytes(46, "little").hex())
+        for (pk, year), (marked, present_bits) in bits.items()
+    ]
+
+
+def bump_version(cur, table: str) -> None:
+    """Same upsert as app/repositories/version_repo.py; running API workers see the change."""
+    cur.execute(
+        """INSERT INTO table_versions (name, version) VALUES (%s, 1)
+           ON CONFLICT (name) DO UPDATE SET version = table_versions.version + 1, updated_at = now()""",
+        (table,)
+    )
 
 
 def main():
-    random.seed(42)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    datagen.add_arguments(parser)
+    args = parser.parse_args()
+    config = datagen.config_from_args(args)
+
     url = os.getenv("DATABASE_URL")
     if not url or not url.startswith("postgresql"):
         print("Set DATABASE_URL in backend/.env to your PostgreSQL URL.")
@@ -60,50 +88,61 @@ def main():
     conn = psycopg2.connect(url)
     conn.autocommit = False
     cur = conn.cursor()
+    started = time.perf_counter()
 
     try:
+        if args.reset:
+            print("0. Deleting existing employees and attendance...")
+            cur.execute("TRUNCATE attendance_daily_rollup, attendance_bitmaps, attendance_archive_months, attendance_archive, attendance, employees RESTART IDENTITY")
+            conn.commit()
+
         # 1. Employees
-        print("1. Seeding employees (10)...")
-        emp_ids = {}  # employee_id -> db id
-        for eid, full_name, email_local in FAKE_EMPLOYEES:
-            cur.execute("SELECT id FROM employees WHERE employee_id = %s", (eid,))
-            row = cur.fetchone()
-            if row:
-                emp_ids[eid] = row[0]
-                print(f"  Skip (exists): {eid} {full_name}")
-                continue
-            dept = random.choice(DEPARTMENTS)
-            email = f"{email_local}@company.com"
-            cur.execute(
-                """INSERT INTO employees (employee_id, full_name, email, department)
-                   VALUES (%s, %s, %s, %s) RETURNING id""",
-                (eid, full_name, email, dept),
-            )
-            pk = cur.fetchone()[0]
-            emp_ids[eid] = pk
-            print(f"  Created: {eid} {full_name} ({dept}) {email}")
-        conn.commit()
+        print(f"1. Seeding employees ({config.employees})...")
+        cur.execute("SELECT employee_id FROM employees")
+        existing = {row[0] for row in cur.fetchall()}
+        created = 0
+        for batch in datagen.iter_employee_batches(config):
+            rows = [row for row in batch if row[0] not in existing]
+            if rows:
+                copy(cur, "employees", ("employee_id", "full_name", "email", "department"), rows)
+                conn.commit()
+                created += len(rows)
+        if args.reset or created:
+            # Running API workers reload their employee directory
+            bump_version(cur, "employees")
+            conn.commit()
+        print(f"  Created {created} employees, skipped {config.employees - created} existing.")
 
-        # 2. Attendance (last 14 days)
-        print("\n2. Seeding attendance (last 14 days)...")
-        today = date.today()
+        # 2. Attendance for the new employees
+        print(f"\n2. Seeding attendance (last {config.days} days up to {config.last_date})...")
+        codes = {datagen.employee_code(config, i) for i in range(1, config.employees + 1)} - existing
+        cur.execute("SELECT employee_id, id FROM employees")
+        employee_pks = sorted(pk for code, pk in cur.fetchall() if code in codes)
         count = 0
-        for eid, _, _ in FAKE_EMPLOYEES:
-            pk = emp_ids[eid]
-            for d in range(14):
-                att_date = today - timedelta(days=d)
-                status = "PRESENT" if random.random() < 0.85 else "ABSENT"
-                cur.execute(
-                    """INSERT INTO attendance (employee_id, date, status)
-                       VALUES (%s, %s, %s::attendancestatus)
-                       ON CONFLICT (employee_id, date) DO NOTHING""",
-                    (pk, att_date, status),
-                )
-                if cur.rowcount > 0:
-                    count += 1
-        conn.commit()
+        for batch in datagen.iter_attendance_batches(config, employee_pks):
+            copy(cur, "attendance", ("employee_id", "date", "status"), (
+                (pk, day.isoformat(), "PRESENT" if present else "ABSENT") for pk, day, present in batch
+            ))
+            copy(cur, "attendance_bitmaps", ("employee_id", "year", "marked", "present"), bitmap_records(batch))
+            conn.commit()
+            count += len(batch)
         print(f"  Added {count} attendance rows.")
-        print("\nDone.")
+
+        # 3. Department x day rollup (same aggregate as scripts/rebuild_rollup.py)
+        print("\n3. Rebuilding attendance rollup...")
+        cur.execute("DELETE FROM attendance_daily_rollup")
+        cur.execute(
+            """INSERT INTO attendance_daily_rollup (date, department, present, absent, total)
+               SELECT a.date, e.department,
+                      SUM(CASE WHEN a.status = 'PRESENT' THEN 1 ELSE 0 END),
+                      SUM(CASE WHEN a.status = 'ABSENT' THEN 1 ELSE 0 END),
+                      COUNT(*)
+               FROM attendance a JOIN employees e ON e.id = a.employee_id
+               GROUP BY a.date, e.department"""
+        )
+        bump_version(cur, "attendance")
+        conn.commit()
+        print(f"\nDone in {time.perf_counter() - started:.1f}s.")
     except Exception as e:
         conn.rollback()
         print(f"Error: {e}")
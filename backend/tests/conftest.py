@@ -0,0 +1,77 @@
+"""The app runs against a throwaway SQLite database, emptied before each test.
+
+Settings and engines are created when app modules are imported, so the
+environment is set here before anything from app is imported.
+"""
+
+import os
+import shutil
+import tempfile
+
+_database_dir = tempfile.mkdtemp(prefix="hrms-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'test.db')}"
+os.environ.setdefault("DATABASE_MODE", "sync")
+os.environ.pop("READ_DATABASE_URL", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from app.database import Base, SessionLocal, engine, init_db
+from app.main import app
+from app.repositories import version_repo
+from app.utils.cache import result_cache
+
+# Bookkeeping rows that survive between tests
+KEPT_TABLES = {"schema_version", "table_versions"}
+
+
+def empty_database() -> None:
+    init_db()
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in KEPT_TABLES:
+                connection.execute(delete(table))
+    db = SessionLocal()
+    try:
+        # Moving the versions on makes every in-process cache drop what earlier tests left behind
+        version_repo.bump(db, version_repo.EMPLOYEES)
+        version_repo.bump(db, version_repo.ATTENDANCE)
+        db.commit()
+    finally:
+        db.close()
+    result_cache.clear()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    engine.dispose()
+    shutil.rmtree(_database_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def client():
+    empty_database()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def create_employee(client):
+    def create(employee_id: str, department: str = "Engineering") -> dict:
+        response = client.post("/api/v1/employees", json={
+            "employee_id": employee_id,
+            "full_name": f"Employee {employee_id}",
+            "email": f"{employee_id.lower()}@example.com",
+            "department": department,
+        })
+        assert response.status_code == 201, response.text
+        return response.json()
+    return create
@@ -0,0 +1,100 @@
+import asyncio
+import httpx
+import pytest
+from starlette.responses import JSONResponse
+from app.config import settings
+from app.routers.v1 import attendance
+from app.utils import admission
+from app.utils.group_commit import GroupCommitter, QueueFull
+
+
+@pytest.fixture
+def write_limiter(monkeypatch):
+    """One write slot; each test sets the queue size and timeout."""
+    monkeypatch.setattr(admission, "register_gauges", lambda source: None)
+
+    def limit(max_queue: int, queue_timeout: float = 5.0) -> admission.Limiter:
+        limiter = admission.Limiter(admission.WRITE, 1, max_queue, queue_timeout)
+        monkeypatch.setitem(admission.limiters, admission.WRITE, limiter)
+        return limiter
+    return limit
+
+
+async def _writes(count: int):
+    """count concurrent writes through the admission middleware; the first holds its slot until the rest are answered."""
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await release.wait()
+        await JSONResponse({})(scope, receive, send)
+
+    transport = httpx.ASGITransport(app=admission.AdmissionMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.post("/api/v1/employees"))
+        await asyncio.sleep(0.01)
+        others = await asyncio.gather(*(client.post("/api/v1/employees") for _ in range(count - 1)))
+        release.set()
+        return [await first, *others]
+
+
+def test_full_queue_gets_503_with_retry_after(write_limiter):
+    limiter = write_limiter(max_queue=0)
+
+    first, second = asyncio.run(_writes(2))
+
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert second.headers["Retry-After"] == str(settings.admission_retry_after_seconds)
+    assert (limiter.admitted, limiter.rejected, limiter.timed_out) == (1, 1, 0)
+
+
+def test_wait_past_queue_timeout_gets_503(write_limiter):
+    limiter = write_limiter(max_queue=5, queue_timeout=0.05)
+
+    first, second = asyncio.run(_writes(2))
+
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert second.headers["Retry-After"] == str(settings.admission_retry_after_seconds)
+    assert (limiter.admitted, limiter.rejected, limiter.timed_out) == (1, 0, 1)
+    assert limiter.waiting == 0 and limiter.active == 0
+
+
+def test_group_commit_queue_is_bounded():
+    async def run():
+        release = asyncio.Event()
+
+        async def write_batch(items):
+            await release.wait()
+            return items
+
+        committer = GroupCommitter("test", write_batch, max_batch=1, max_wait_ms=0, max_queue=1)
+        await committer.start()
+        writing = asyncio.create_task(committer.submit("a"))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(committer.submit("b"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(QueueFull):
+            await committer.submit("c")
+        release.set()
+        results = [await writing, await queued]
+        await committer.stop()
+        return results, committer.rejected
+
+    assert asyncio.run(run()) == (["a", "b"], 1)
+
+
+def test_full_group_commit_queue_gets_503(client, create_employee, monkeypatch):
+    employee = create_employee("E001")
+
+    async def full(item):
+        raise QueueFull("attendance: 1000 items already waiting")
+
+    monkeypatch.setattr(attendance.attendance_writer, "_task", object())
+    monkeypatch.setattr(attendance.attendance_writer, "submit", full)
+    response = client.post("/api/v1/attendance", json={
+        "employee_id": employee["id"], "date": "2024-01-02", "status": "Present"
+    })
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.admission_retry_after_seconds)
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from app.config import settings
+from app.repositories import archive_repo
+
+
+def _archived_month() -> date:
+    return (archive_repo.first_open_month() - timedelta(days=40)).replace(day=1)
+
+
+def _mark(client, employee: dict, on_date: date, status: str = "Present") -> dict:
+    response = client.post("/api/v1/attendance", json={
+        "employee_id": employee["id"], "date": on_date.isoformat(), "status": status
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _archive_with_late_mark(client, db, create_employee):
+    """Two employees with marks in an archived month, one late mark into it and one mark today."""
+    month = _archived_month()
+    first, second = create_employee("E001"), create_employee("E002", "Sales")
+    _mark(client, first, month.replace(day=3))
+    _mark(client, second, month.replace(day=3), "Absent")
+    _mark(client, first, month.replace(day=10))
+    assert archive_repo.archive_month(db, month) == 3
+    _mark(client, second, month.replace(day=20))
+    _mark(client, first, date.today())
+    return month
+
+
+def test_export_includes_archived_months(client, db, create_employee):
+    month = _archive_with_late_mark(client, db, create_employee)
+
+    response = client.get("/api/v1/attendance/export")
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["date"], row["employee_code"], row["status"]) for row in rows] == [
+        (date.today().isoformat(), "E001", "Present"),
+        (month.replace(day=20).isoformat(), "E002", "Present"),
+        (month.replace(day=10).isoformat(), "E001", "Present"),
+        (month.replace(day=3).isoformat(), "E002", "Absent"),
+        (month.replace(day=3).isoformat(), "E001", "Present"),
+    ]
+    assert rows[3]["department"] == "Sales"
+
+
+def test_export_filters_archived_rows(client, db, create_employee):
+    month = _archive_with_late_mark(client, db, create_employee)
+
+    response = client.get("/api/v1/attendance/export", params={
+        "format": "ndjson",
+        "from_date": month.replace(day=2).isoformat(),
+        "to_date": month.replace(day=15).isoformat(),
+        "departments": "Engineering",
+    })
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["date"], row["employee_code"]) for row in rows] == [
+        (month.replace(day=10).isoformat(), "E001"),
+        (month.replace(day=3).isoformat(), "E001"),
+    ]
+
+
+def test_stream_matches_list_with_archived_months(client, db, create_employee):
+    _archive_with_late_mark(client, db, create_employee)
+
+    streamed = client.get("/api/v1/attendance", params={"stream": "true"}).json()
+    listed = client.get("/api/v1/attendance").json()
+    assert len(streamed) == 5
+    assert streamed == listed
+
+
+def test_export_merges_several_archived_months_across_batches(client, db, create_employee, monkeypatch):
+    # Smaller than every month, so hot rows and each archive interleave mid-batch
+    monkeypatch.setattr(settings, "stream_batch_size", 2)
+    newer = _archived_month()
+    older = (newer - timedelta(days=1)).replace(day=1)
+    employees = [create_employee(f"E00{n}") for n in range(1, 4)]
+    marks = []
+    for month in (older, newer):
+        for day in (2, 9, 16):
+            for employee in employees:
+                marks.append(_mark(client, employee, month.replace(day=day)))
+    assert archive_repo.archive_month(db, older) == 9
+    assert archive_repo.archive_month(db, newer) == 9
+    # Late marks into both archived months, and this month's
+    for month in (older, newer):
+        marks.append(_mark(client, employees[0], month.replace(day=20)))
+    marks.append(_mark(client, employees[1], date.today()))
+
+    response = client.get("/api/v1/attendance/export", params={"format": "ndjson"})
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    listed = client.get("/api/v1/attendance").json()
+    codes = {employee["id"]: employee["employee_id"] for employee in employees}
+    assert len(rows) == len(marks) == 21
+    assert [(row["date"], row["employee_code"]) for row in rows] == [
+        (record["date"], codes[record["employee_id"]]) for record in listed
+    ]
+    assert {record["id"] for record in listed} == {mark["id"] for mark in marks}
@@ -0,0 +1,98 @@
+import time
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from app import main
+from app.database import SessionLocal
+from app.models import AttendanceBitmap, AttendanceDailyRollup, AttendanceStatus, TableVersion
+from app.repositories import bitmap_repo, version_repo
+from app.services import backfill_service
+from conftest import empty_database
+
+
+def _forget_derived_tables() -> None:
+    """Leave the database as one from before the rollup and the bitmaps existed."""
+    db = SessionLocal()
+    try:
+        db.execute(delete(AttendanceDailyRollup))
+        db.execute(delete(AttendanceBitmap))
+        db.execute(delete(TableVersion).where(TableVersion.name == version_repo.DERIVED))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _wait_for_backfill() -> None:
+    deadline = time.monotonic() + 10
+    while not main._backfill_task.done():
+        assert time.monotonic() < deadline, "backfill did not finish"
+        time.sleep(0.01)
+
+
+def test_startup_backfills_existing_attendance():
+    empty_database()
+    yesterday = date.today() - timedelta(days=1)
+    with TestClient(main.app) as client:
+        employee = client.post("/api/v1/employees", json={
+            "employee_id": "E001", "full_name": "Employee E001", "email": "e001@example.com", "department": "Sales"
+        }).json()
+        for on_date, status in ((yesterday, "Absent"), (date.today(), "Present")):
+            response = client.post("/api/v1/attendance", json={
+                "employee_id": employee["id"], "date": on_date.isoformat(), "status": status
+            })
+            assert response.status_code == 201, response.text
+    _forget_derived_tables()
+
+    with TestClient(main.app) as client:
+        _wait_for_backfill()
+        trends = client.get("/api/v1/dashboard/trends", params={"days": 7}).json()
+        assert [(point["date"], point["present"], point["absent"]) for point in trends] == [
+            (yesterday.isoformat(), 0, 1), (date.today().isoformat(), 1, 0)
+        ]
+        calendar = client.get(f"/api/v1/employees/{employee['id']}/calendar").json()
+        assert (calendar["marked_days"], calendar["present_days"]) == (2, 1)
+        report = client.get("/api/v1/reports/attendance", params={"from_date": yesterday.isoformat()}).json()
+        assert [(row["department"], row["marked_days"]) for row in report["departments"]] == [("Sales", 2)]
+
+    # The marker is set, so later starts skip the rebuild
+    main._backfill_task = None
+    with TestClient(main.app):
+        assert main._backfill_task is None
+
+
+def test_new_database_needs_no_backfill(db):
+    _forget_derived_tables()
+
+    assert not backfill_service.needs_backfill(db)
+    assert version_repo.get_version(db, version_repo.DERIVED) == 1
+
+
+def test_first_mark_of_a_year_racing_another_writer(db, create_employee, monkeypatch):
+    employee = create_employee("E001")
+    on_date = date(2024, 3, 1)
+    other = SessionLocal()
+    try:
+        # Another worker (or the backfill) commits the employee-year just after our locking read
+        marks = {}
+        bitmap_repo.add_mark(marks, employee["id"], date(2024, 1, 1), AttendanceStatus.ABSENT)
+        lock_rows = bitmap_repo._lock_rows
+
+        def read_then_race(session, keys):
+            rows = lock_rows(session, keys)
+            if session is db and not rows:
+                bitmap_repo.apply_marks(other, marks)
+                other.commit()
+            return rows
+
+        monkeypatch.setattr(bitmap_repo, "_lock_rows", read_then_race)
+        ours = {}
+        bitmap_repo.add_mark(ours, employee["id"], on_date, AttendanceStatus.PRESENT)
+        bitmap_repo.apply_marks(db, ours)
+        db.commit()
+    finally:
+        other.close()
+
+    (bitmap,) = bitmap_repo.get_bitmaps(db, employee["id"], 2024)
+    expected = (1 << bitmap_repo.day_index(date(2024, 1, 1))) | (1 << bitmap_repo.day_index(on_date))
+    assert bitmap_repo.from_bytes(bitmap.marked) == expected
+    assert bitmap_repo.from_bytes(bitmap.present) == 1 << bitmap_repo.day_index(on_date)
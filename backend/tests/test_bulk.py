@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+MISSING_ID = 999999
+
+
+def _record(employee_id: int, on_date: date) -> dict:
+    return {"employee_id": employee_id, "date": on_date.isoformat(), "status": "Present"}
+
+
+def test_bulk_mark_reports_each_record(client, create_employee):
+    employee = create_employee("E001")
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    tomorrow = today + timedelta(days=1)
+    client.post("/api/v1/attendance", json=_record(employee["id"], yesterday))
+
+    response = client.post("/api/v1/attendance/bulk", json={"records": [
+        _record(employee["id"], today),
+        _record(employee["id"], yesterday),
+        _record(employee["id"], today),
+        _record(employee["id"], tomorrow),
+        _record(MISSING_ID, today),
+        # An unknown employee is reported as such even on a future date, as a single mark does
+        _record(MISSING_ID, tomorrow),
+    ]})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [item["result"] for item in body["results"]] == [
+        "created", "duplicate", "duplicate", "future_date", "employee_not_found", "employee_not_found"
+    ]
+    assert [item["index"] for item in body["results"]] == list(range(6))
+    assert (body["created"], body["duplicate"], body["future_date"], body["employee_not_found"]) == (1, 2, 1, 2)
+
+    marked = client.get("/api/v1/attendance", params={"employee_id": employee["id"]}).json()
+    assert body["results"][0]["id"] in {record["id"] for record in marked}
+    assert all(item["id"] is None for item in body["results"][1:])
+    assert len(marked) == 2
+
+
+def test_bulk_delete_reports_missing_ids(client, create_employee):
+    first = create_employee("E001")
+    second = create_employee("E002")
+    kept = create_employee("E003")
+
+    response = client.post("/api/v1/employees/bulk-delete", json={
+        "ids": [second["id"], MISSING_ID, first["id"], MISSING_ID]
+    })
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "deleted": 2,
+        "not_found": 1,
+        "deleted_ids": sorted([first["id"], second["id"]]),
+        "not_found_ids": [MISSING_ID],
+    }
+    remaining = client.get("/api/v1/employees").json()
+    assert [employee["id"] for employee in remaining] == [kept["id"]]
+
+
+def test_bulk_delete_of_only_missing_ids(client, create_employee):
+    create_employee("E001")
+
+    response = client.post("/api/v1/employees/bulk-delete", json={"ids": [MISSING_ID]})
+
+    assert response.json() == {"deleted": 0, "not_found": 1, "deleted_ids": [], "not_found_ids": [MISSING_ID]}
+    assert len(client.get("/api/v1/employees").json()) == 1
@@ -0,0 +1,73 @@
+import threading
+from datetime import date, timedelta
+from app.utils.cache import LRUTTLBackend, ResultCache, cache_bypass, result_cache
+
+
+def _cache() -> ResultCache:
+    return ResultCache(LRUTTLBackend(max_entries=10, ttl_seconds=60), max_result_rows=100, max_result_bytes=1000)
+
+
+def test_bypass_neither_reads_nor_populates():
+    cache = _cache()
+    cache.get_or_load(("ns", 1), lambda: "cached")
+
+    token = cache_bypass.set(True)
+    try:
+        assert cache.get_or_load(("ns", 1), lambda: "fresh") == "fresh"
+        assert cache.get_or_load(("ns", 2), lambda: "fresh") == "fresh"
+    finally:
+        cache_bypass.reset(token)
+
+    assert len(cache.backend) == 1
+    assert cache.get_or_load(("ns", 1), lambda: "reloaded") == "cached"
+    assert cache.get_or_load(("ns", 2), lambda: "loaded") == "loaded"
+    assert (cache.hits, cache.misses, cache.stats()["bypassed"]) == (1, 2, 2)
+
+
+def test_counters_are_exact_under_concurrency():
+    cache = _cache()
+    cache.get_or_load(("ns", 1), lambda: "value")
+
+    def read():
+        for _ in range(2000):
+            cache.get_or_load(("ns", 1), lambda: "value")
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (cache.hits, cache.misses) == (16000, 1)
+
+
+def _list(client, params: dict, etag: str = None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get("/api/v1/attendance", params=params, headers=headers)
+
+
+def test_mark_evicts_only_cached_ranges_covering_its_date(client, create_employee):
+    first = create_employee("E001")
+    create_employee("E002", "Sales")
+    marked = date.today() - timedelta(days=2)
+    covering = {"from_date": (marked - timedelta(days=1)).isoformat(), "to_date": marked.isoformat()}
+    earlier = {"from_date": (marked - timedelta(days=20)).isoformat(), "to_date": (marked - timedelta(days=10)).isoformat()}
+    sales = {"departments": "Sales"}
+    etags = {name: _list(client, params).headers["ETag"] for name, params in
+             (("covering", covering), ("earlier", earlier), ("sales", sales))}
+
+    response = client.post("/api/v1/attendance", json={
+        "employee_id": first["id"], "date": marked.isoformat(), "status": "Present"
+    })
+    assert response.status_code == 201
+
+    hits, misses = result_cache.hits, result_cache.misses
+    # Conditional GETs: the ETag moved with the write, so each gets a full 200
+    assert _list(client, earlier, etags["earlier"]).status_code == 200
+    assert _list(client, sales, etags["sales"]).status_code == 200
+    assert (result_cache.hits - hits, result_cache.misses - misses) == (2, 0)
+
+    response = _list(client, covering, etags["covering"])
+    assert response.status_code == 200
+    assert [row["employee_id"] for row in response.json()] == [first["id"]]
+    assert result_cache.misses == misses + 1
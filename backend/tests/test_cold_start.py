@@ -0,0 +1,69 @@
+"""Boot time, the bound benchmarks/cold_start.py --max-seconds checks, as a test.
+
+Each boot is a fresh uvicorn process against its own SQLite file, so the
+time includes interpreter start, every app import and startup until /health
+answers. The first boot creates the schema and is not bounded; the second
+is what a restarted deploy sees.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+WARM_BOOT_SECONDS = 3.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _environment(db_path: Path) -> dict:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    env.pop("READ_DATABASE_URL", None)
+    return env
+
+
+def _seconds_to_healthy(db_path: Path, timeout: float = 30.0) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=_environment(db_path), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+            while time.perf_counter() - started < timeout:
+                assert server.poll() is None, "server exited during startup"
+                try:
+                    if client.get("/health").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.HTTPError:
+                    time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+    raise AssertionError(f"not healthy within {timeout:.0f}s")
+
+
+def test_warm_boot_is_healthy_within_bound():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "boot.db"
+        _seconds_to_healthy(db_path)
+        assert _seconds_to_healthy(db_path) < WARM_BOOT_SECONDS
+
+
+def test_app_import_leaves_numpy_for_reports():
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, app.main; print('numpy' in sys.modules)"],
+            cwd=BACKEND_DIR, env=_environment(Path(tmp) / "import.db"), capture_output=True, text=True, check=True
+        )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,107 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from app.repositories import version_repo
+from app.utils.cache import result_cache
+from app.utils.diagnostics import query_budget
+
+
+def _mark(client, employee: dict, on_date: date) -> None:
+    response = client.post("/api/v1/attendance", json={
+        "employee_id": employee["id"], "date": on_date.isoformat(), "status": "Present"
+    })
+    assert response.status_code == 201, response.text
+
+
+def _last_week() -> dict:
+    start = date.today() - timedelta(days=10)
+    return {"from_date": start.isoformat(), "to_date": (start + timedelta(days=5)).isoformat()}
+
+
+def test_local_mark_keeps_cached_ranges_it_does_not_cover(client, create_employee):
+    employee = create_employee("E001")
+    _mark(client, employee, date.today() - timedelta(days=8))
+    before = client.get("/api/v1/attendance", params=_last_week())
+
+    _mark(client, employee, date.today())
+    hits = result_cache.hits
+    # The version lookup only: the list comes from the cache
+    with query_budget(1):
+        after = client.get("/api/v1/attendance", params=_last_week())
+
+    assert result_cache.hits == hits + 1
+    assert after.json() == before.json()
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+def test_other_workers_write_drops_cached_ranges(client, db, create_employee):
+    employee = create_employee("E001")
+    _mark(client, employee, date.today() - timedelta(days=8))
+    client.get("/api/v1/attendance", params=_last_week())
+
+    # Committed without this process evicting anything, as another worker's write would be
+    version_repo.bump(db, version_repo.ATTENDANCE)
+    db.commit()
+    misses = result_cache.misses
+    client.get("/api/v1/attendance", params=_last_week())
+
+    assert result_cache.misses == misses + 1
+
+
+CONDITIONAL_PATHS = ["/api/v1/employees", "/api/v1/attendance", "/api/v1/dashboard"]
+
+
+@pytest.mark.parametrize("path", CONDITIONAL_PATHS)
+def test_validators_are_sent(client, create_employee, path):
+    employee = create_employee("E001")
+    _mark(client, employee, date.today())
+
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Cache-Control"] == "no-cache"
+    last_modified = parsedate_to_datetime(response.headers["Last-Modified"])
+    assert abs((datetime.now(timezone.utc) - last_modified).total_seconds()) < 60
+
+
+@pytest.mark.parametrize("path", CONDITIONAL_PATHS)
+def test_matching_etag_gets_304_without_the_list_query(client, create_employee, path):
+    employee = create_employee("E001")
+    _mark(client, employee, date.today())
+    etag = client.get(path).headers["ETag"]
+    result_cache.clear()
+
+    with query_budget(1) as statements:
+        response = client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert "Last-Modified" in response.headers
+    assert all("table_versions" in statement for statement in statements)
+
+
+def test_if_none_match_uses_weak_comparison(client, create_employee):
+    create_employee("E001")
+    etag = client.get("/api/v1/employees").headers["ETag"]
+    strong = etag.removeprefix("W/")
+
+    for if_none_match in (strong, f'"other", {etag}', "*"):
+        response = client.get("/api/v1/employees", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+
+
+def test_stale_or_foreign_etag_gets_the_full_response(client, create_employee):
+    employee = create_employee("E001")
+    etag = client.get("/api/v1/attendance").headers["ETag"]
+
+    other = client.get("/api/v1/attendance", params={"employee_id": employee["id"]}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["ETag"] != etag
+
+    _mark(client, employee, date.today())
+    changed = client.get("/api/v1/attendance", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 1
+    assert changed.headers["ETag"] != etag
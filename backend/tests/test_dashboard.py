@@ -0,0 +1,46 @@
+from datetime import date
+import pytest
+from app.services.employee_directory import employee_directory
+from app.utils.diagnostics import query_budget
+
+# Version lookup for the ETag, today's counts by status, recent activity
+DASHBOARD_QUERIES = 3
+
+
+@pytest.fixture
+def directory_without_checks(monkeypatch):
+    # Otherwise a slow run may add the directory's periodic version check to the count
+    monkeypatch.setattr(employee_directory, "check_seconds", 3600)
+
+
+def _populate(client, create_employee, employees: int) -> None:
+    records = []
+    for n in range(employees):
+        employee = create_employee(f"D{n:04d}", "Engineering" if n % 2 else "Sales")
+        records.append({"employee_id": employee["id"], "date": date.today().isoformat(),
+                        "status": "Present" if n % 3 else "Absent"})
+    response = client.post("/api/v1/attendance/bulk", json={"records": records})
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("employees", [3, 40])
+def test_dashboard_query_count_is_fixed(client, create_employee, directory_without_checks, employees):
+    _populate(client, create_employee, employees)
+
+    with query_budget(DASHBOARD_QUERIES) as statements:
+        response = client.get("/api/v1/dashboard")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_employees"] == employees
+    assert body["today_total"] == employees
+    assert len(body["recent_activity"]) == min(employees, 10)
+    assert sum(statements.values()) == DASHBOARD_QUERIES, statements
+
+
+def test_cached_dashboard_only_checks_versions(client, create_employee, directory_without_checks):
+    _populate(client, create_employee, 5)
+    client.get("/api/v1/dashboard")
+
+    with query_budget(1):
+        response = client.get("/api/v1/dashboard")
+    assert response.status_code == 200
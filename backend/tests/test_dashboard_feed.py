@@ -0,0 +1,51 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.repositories import version_repo
+from app.services import dashboard_feed
+from conftest import empty_database
+
+
+def test_snapshot_skipped_after_published_writes(monkeypatch):
+    # The watcher must not run checks of its own during the test
+    monkeypatch.setattr(settings, "dashboard_stream_check_seconds", 3600)
+    empty_database()
+    with TestClient(app) as client:
+        subscription = dashboard_feed.subscribe()
+        db = SessionLocal()
+        try:
+            assert dashboard_feed.publish_snapshot_if_changed(db)
+
+            employee = client.post("/api/v1/employees", json={
+                "employee_id": "E001", "full_name": "Employee E001", "email": "e001@example.com",
+                "department": "Sales"
+            }).json()
+            response = client.post("/api/v1/attendance", json={
+                "employee_id": employee["id"], "date": date.today().isoformat(), "status": "Present"
+            })
+            assert response.status_code == 201
+            # Both changes went out as deltas
+            assert not dashboard_feed.publish_snapshot_if_changed(db)
+
+            # A change no delta described, as another worker's write would be
+            version_repo.bump(db, version_repo.ATTENDANCE)
+            db.commit()
+            assert dashboard_feed.publish_snapshot_if_changed(db)
+
+            # A new subscriber's first snapshot may overlap a delta, so the next change is followed by one
+            second = dashboard_feed.subscribe()
+            client.post("/api/v1/employees", json={
+                "employee_id": "E002", "full_name": "Employee E002", "email": "e002@example.com",
+                "department": "Sales"
+            })
+            assert dashboard_feed.publish_snapshot_if_changed(db)
+            dashboard_feed.hub.unsubscribe(second)
+
+            # Deletes are not fully described by their delta
+            client.delete(f"/api/v1/employees/{employee['id']}")
+            assert dashboard_feed.publish_snapshot_if_changed(db)
+        finally:
+            dashboard_feed.hub.unsubscribe(subscription)
+            db.close()
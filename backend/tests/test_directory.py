@@ -0,0 +1,67 @@
+import threading
+from datetime import date
+from sqlalchemy import text
+from app.database import SessionLocal
+from app.services.employee_directory import EmployeeDirectory, employee_directory
+
+
+def _delete_elsewhere(employee: dict) -> None:
+    """Delete as another worker would: straight from the table, unseen by this process's directory."""
+    db = SessionLocal()
+    try:
+        db.execute(text("DELETE FROM employees WHERE id = :id"), {"id": employee["id"]})
+        db.commit()
+    finally:
+        db.close()
+
+
+def _record(employee: dict) -> dict:
+    return {"employee_id": employee["id"], "date": date.today().isoformat(), "status": "Present"}
+
+
+def test_mark_for_employee_deleted_elsewhere_is_not_found(client, db, create_employee):
+    employee = create_employee("E001")
+    _delete_elsewhere(employee)
+    assert employee_directory.get(db, employee["id"]) is not None
+
+    response = client.post("/api/v1/attendance", json=_record(employee))
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": f"Employee with ID {employee['id']} not found"}
+    assert employee_directory.get(db, employee["id"]) is None
+
+
+def test_bulk_mark_skips_employees_deleted_elsewhere(client, create_employee):
+    deleted = create_employee("E001")
+    kept = create_employee("E002")
+    _delete_elsewhere(deleted)
+
+    response = client.post("/api/v1/attendance/bulk", json={"records": [_record(deleted), _record(kept)]})
+
+    assert response.status_code == 200, response.text
+    assert [item["result"] for item in response.json()["results"]] == ["employee_not_found", "created"]
+    assert [record["employee_id"] for record in client.get("/api/v1/attendance").json()] == [kept["id"]]
+
+
+def test_counters_are_exact_under_concurrency(client, db, create_employee):
+    employee = create_employee("E001")
+    directory = EmployeeDirectory(max_entries=10, check_seconds=3600)
+    directory.load(db)
+
+    def look_up():
+        session = SessionLocal()
+        try:
+            for _ in range(500):
+                directory.get(session, employee["id"])
+                directory.get_by_code(session, "E001")
+                directory.get_by_code(session, "NOPE")
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=look_up) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (directory.hits, directory.misses) == (8 * 500 * 3, 0)
@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.routers.v1 import attendance
+from app.utils.group_commit import GroupCommitter
+
+
+@pytest.fixture
+def writer(client, monkeypatch):
+    """The attendance group committer, started on the app's loop, with the batches it wrote and the commits they took."""
+    batches = []
+    commits = []
+
+    async def write_batch(records):
+        batches.append(len(records))
+        return await attendance._write_marks(records)
+
+    def count_commit(connection):
+        commits.append(connection)
+
+    # Long enough for every request a test sends at once to join the first batch
+    committer = GroupCommitter("attendance", write_batch, max_batch=50, max_wait_ms=500, max_queue=50)
+    monkeypatch.setattr(attendance, "attendance_writer", committer)
+    client.portal.call(committer.start)
+    event.listen(Engine, "commit", count_commit)
+    try:
+        yield batches, commits
+    finally:
+        event.remove(Engine, "commit", count_commit)
+        client.portal.call(committer.stop)
+
+
+def _mark_concurrently(client, records: list) -> list:
+    with ThreadPoolExecutor(len(records)) as pool:
+        return list(pool.map(lambda record: client.post("/api/v1/attendance", json=record), records))
+
+
+def _record(employee_id: int, days_ago: int) -> dict:
+    return {
+        "employee_id": employee_id,
+        "date": (date.today() - timedelta(days=days_ago)).isoformat(),
+        "status": "Present",
+    }
+
+
+def test_concurrent_marks_share_one_transaction(client, create_employee, writer):
+    employees = [create_employee(f"E00{n}") for n in range(1, 5)]
+    batches, commits = writer
+    commits.clear()
+
+    responses = _mark_concurrently(client, [_record(employee["id"], 1) for employee in employees])
+
+    assert [response.status_code for response in responses] == [201] * 4
+    assert batches == [4]
+    assert len(commits) == 1
+    marked = client.get("/api/v1/attendance").json()
+    assert sorted(record["id"] for record in marked) == sorted(response.json()["id"] for response in responses)
+
+
+def test_failing_mark_answers_alone(client, create_employee, writer):
+    first = create_employee("E001")
+    second = create_employee("E002")
+    client.post("/api/v1/attendance", json=_record(first["id"], 2))
+    batches, _ = writer
+
+    responses = _mark_concurrently(client, [
+        _record(first["id"], 1),
+        _record(first["id"], 2),
+        _record(999999, 1),
+        _record(second["id"], 1),
+    ])
+
+    assert batches[-1] == 4
+    assert [response.status_code for response in responses] == [201, 400, 404, 201]
+    assert "already marked" in responses[1].json()["detail"]
+    assert "not found" in responses[2].json()["detail"]
+    assert responses[3].json()["employee_id"] == second["id"]
+    assert len(client.get("/api/v1/attendance").json()) == 3
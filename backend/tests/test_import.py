@@ -0,0 +1,68 @@
+from app.config import settings
+from app.services.employee_directory import employee_directory
+
+HEADER = "employee_id,full_name,email,department\n"
+
+
+def _import(client, body: bytes):
+    return client.post("/api/v1/employees/import", content=body, headers={"Content-Type": "text/csv"})
+
+
+def test_non_utf8_file_is_rejected_with_its_position(client, monkeypatch):
+    monkeypatch.setattr(settings, "import_chunk_size", 2)
+    body = (
+        HEADER
+        + "IMP001,Ana Lima,ana@example.com,Sales\n"
+        + "IMP002,Bo Chen,bo@example.com,Sales\n"
+        + "IMP003,José Ruiz,jose@example.com,Sales\n"
+    ).encode("latin-1")
+
+    response = _import(client, body)
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    offset = body.index("é".encode("latin-1"))
+    assert f"line 4, byte offset {offset}" in detail
+    assert "2 rows before it were imported" in detail
+    assert len(client.get("/api/v1/employees").json()) == 2
+
+
+def test_utf8_file_with_byte_order_mark_imports(client):
+    body = ("﻿" + HEADER + "IMP001,José Ruiz,jose@example.com,Sales\n").encode("utf-8")
+
+    report = _import(client, body).json()
+    assert report["imported"] == 1
+    assert client.get("/api/v1/employees").json()[0]["full_name"] == "José Ruiz"
+
+
+def test_emails_are_unique_regardless_of_case(client, create_employee):
+    create_employee("IMP001")  # imp001@example.com
+    body = (
+        HEADER
+        + "IMP002,Ana Lima,IMP001@Example.com,Sales\n"
+        + "IMP003,Bo Chen,bo@example.com,Sales\n"
+        + "IMP004,Bo Chen,BO@example.com,Sales\n"
+    ).encode()
+
+    report = _import(client, body).json()
+    assert report["imported"] == 1
+    assert [(error["line"], error["error"]) for error in report["errors"]] == [
+        (2, "Email 'IMP001@example.com' already exists"),
+        (4, "Email 'BO@example.com' already exists"),
+    ]
+
+
+def test_imported_employees_are_visible_immediately(client, create_employee, monkeypatch):
+    # The directory must not depend on its periodic check to notice the import
+    monkeypatch.setattr(employee_directory, "check_seconds", 3600)
+    create_employee("IMP001")
+    assert client.get("/api/v1/dashboard").json()["total_employees"] == 1
+
+    body = (HEADER + "".join(f"IMP00{n},Person {n},p{n}@example.com,Sales\n" for n in (2, 3, 4))).encode()
+    assert _import(client, body).json()["imported"] == 3
+
+    assert client.get("/api/v1/dashboard").json()["total_employees"] == 4
+    duplicate = client.post("/api/v1/employees", json={
+        "employee_id": "IMP003", "full_name": "Someone Else", "email": "else@example.com", "department": "Sales"
+    })
+    assert duplicate.status_code == 400
+    assert client.get("/health/directory").json()["entries"] == 4
@@ -0,0 +1,45 @@
+from typing import Dict
+from sqlalchemy import select
+from app.database import engine
+
+
+def _types(text: str) -> Dict[str, str]:
+    return dict(line.split()[2:4] for line in text.splitlines() if line.startswith("# TYPE "))
+
+
+def test_stream_counts_are_counters(client):
+    types = _types(client.get("/metrics").text)
+
+    assert types["hrms_sse_subscribers"] == "gauge"
+    for name in ("hrms_sse_events_published", "hrms_sse_subscribers_dropped", "hrms_sse_subscribers_rejected"):
+        assert types[f"{name}_total"] == "counter"
+        assert name not in types
+
+
+def test_admission_counts_are_counters(client):
+    types = _types(client.get("/metrics").text)
+
+    assert types["hrms_admission_active"] == "gauge"
+    for name in ("hrms_admission_admitted", "hrms_admission_rejected", "hrms_admission_timed_out"):
+        assert types[f"{name}_total"] == "counter"
+        assert name not in types
+
+
+def _sample(text: str, name: str) -> float:
+    return next(float(line.split()[-1]) for line in text.splitlines() if line.startswith(name + " "))
+
+
+def test_pool_metrics_survive_dispose(client, db):
+    before = client.get("/metrics").text
+    engine.dispose()
+    db.execute(select(1))
+    db.close()
+    after = client.get("/metrics").text
+
+    labels = '{engine="sync"}'
+    for name in ("hrms_db_pool_checkout_wait_seconds_count", "hrms_db_pool_hold_seconds_count"):
+        assert _sample(after, name + labels) > _sample(before, name + labels)
+    assert _sample(after, "hrms_db_pool_connections_opened_total" + labels) > _sample(
+        before, "hrms_db_pool_connections_opened_total" + labels
+    )
+    assert _types(after)["hrms_db_pool_size"] == "gauge"
@@ -0,0 +1,65 @@
+import pytest
+from datetime import date, timedelta
+from app.utils.pagination import encode_cursor
+
+
+@pytest.fixture
+def attendance(client, create_employee):
+    employees = [create_employee(f"E00{n}") for n in range(1, 5)]
+    # Every employee on the same three days, so most rows share their date
+    days = [date.today() - timedelta(days=offset) for offset in (1, 2, 3)]
+    response = client.post("/api/v1/attendance/bulk", json={"records": [
+        {"employee_id": employee["id"], "date": day.isoformat(), "status": "Present"}
+        for day in days for employee in employees
+    ]})
+    assert response.json()["created"] == 12, response.text
+    return client.get("/api/v1/attendance").json()
+
+
+def _walk(client, path: str, limit: int) -> list:
+    pages = []
+    params = {"limit": limit}
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+@pytest.mark.parametrize("limit", [4, 5])
+def test_attendance_pages_cover_every_row_once(client, attendance, limit):
+    pages = _walk(client, "/api/v1/attendance", limit)
+
+    assert [len(page) for page in pages[:-1]] == [limit] * (len(pages) - 1)
+    assert 0 < len(pages[-1]) <= limit
+    assert [record for page in pages for record in page] == attendance
+
+
+@pytest.mark.parametrize("limit", [2, 3])
+def test_employee_pages_cover_every_row_once(client, create_employee, limit):
+    for n in range(1, 7):
+        create_employee(f"E00{n}")
+    everyone = client.get("/api/v1/employees").json()
+
+    pages = _walk(client, "/api/v1/employees", limit)
+
+    assert [employee for page in pages for employee in page] == everyone
+    assert len(pages) == 6 // limit
+
+
+MALFORMED = ["not a cursor", encode_cursor({"i": "x"}), "WzFd"]  # the last is a JSON list, not an object
+
+
+@pytest.mark.parametrize("path, cursor", [
+    *(("/api/v1/employees", cursor) for cursor in MALFORMED),
+    *(("/api/v1/attendance", cursor) for cursor in MALFORMED),
+    ("/api/v1/attendance", encode_cursor({"d": "yesterday", "i": 1})),
+])
+def test_malformed_cursor_is_rejected(client, path, cursor):
+    response = client.get(path, params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid pagination cursor"}
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+import pytest
+from app.services.employee_directory import employee_directory
+from app.utils.diagnostics import QueryBudgetExceeded, query_budget
+
+HISTORY_DAYS = 5
+
+
+@pytest.fixture
+def employees(client, create_employee, monkeypatch, request):
+    """request.param employees, each with HISTORY_DAYS days of attendance; returns their ids."""
+    monkeypatch.setattr(employee_directory, "check_seconds", 3600)
+    ids = [create_employee(f"Q{n:04d}", "Operations")["id"] for n in range(request.param)]
+    records = [
+        {"employee_id": id, "date": (date.today() - timedelta(days=day)).isoformat(), "status": "Present"}
+        for id in ids
+        for day in range(HISTORY_DAYS)
+    ]
+    assert client.post("/api/v1/attendance/bulk", json={"records": records}).status_code == 200
+    return ids
+
+
+# Budgets must hold however many employees and records there are
+SIZES = pytest.mark.parametrize("employees", [3, 30], indirect=True)
+
+
+@SIZES
+def test_read_budgets(client, employees):
+    with query_budget(3):
+        assert client.get("/api/v1/dashboard").status_code == 200
+    with query_budget(2):
+        assert client.get("/api/v1/employees", params={"limit": 10}).status_code == 200
+    with query_budget(3):
+        assert client.get("/api/v1/attendance", params={"limit": 50}).status_code == 200
+    with query_budget(1):
+        assert client.get(f"/api/v1/employees/{employees[0]}/calendar").status_code == 200
+
+
+@SIZES
+def test_write_budgets(client, employees):
+    earlier = date.today() - timedelta(days=HISTORY_DAYS + 1)
+    with query_budget(7):
+        response = client.post("/api/v1/attendance", json={
+            "employee_id": employees[0], "date": earlier.isoformat(), "status": "Absent"
+        })
+        assert response.status_code == 201
+    with query_budget(7):
+        response = client.post("/api/v1/attendance/bulk", json={"records": [
+            {"employee_id": id, "date": (earlier - timedelta(days=1)).isoformat(), "status": "Absent"}
+            for id in employees
+        ]})
+        assert response.status_code == 200
+    # Deleting never loads the employee's attendance history row by row
+    with query_budget(8):
+        assert client.delete(f"/api/v1/employees/{employees[-1]}").status_code == 204
+
+
+def test_query_budget_lists_statements_when_exceeded(client):
+    with pytest.raises(QueryBudgetExceeded, match="budget is 0"):
+        with query_budget(0):
+            client.get("/api/v1/employees", params={"limit": 10})
@@ -0,0 +1,73 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app import database
+from app.main import app
+from app.utils.cache import result_cache
+from app.utils.replica import READ_YOUR_WRITES_COOKIE, ReadYourWritesMiddleware
+
+
+@pytest.fixture
+def replica_reads(client, monkeypatch):
+    """Pretend a replica is configured: its sessions are the primary's, counted as they are opened."""
+    opened = []
+
+    def counting(factory):
+        def open_session():
+            opened.append(factory)
+            return factory()
+        return open_session
+
+    monkeypatch.setattr(database, "read_engine", object())
+    if database.AsyncSessionLocal is not None:
+        monkeypatch.setattr(database, "AsyncReadSessionLocal", counting(database.AsyncSessionLocal))
+    else:
+        monkeypatch.setattr(database, "ReadSessionLocal", counting(database.SessionLocal))
+    return opened
+
+
+@pytest.fixture
+def replica_client(client):
+    # The middleware is only installed when READ_DATABASE_URL is set; the app is already started by client
+    return TestClient(ReadYourWritesMiddleware(app))
+
+
+def _employee(employee_id: str) -> dict:
+    return {
+        "employee_id": employee_id,
+        "full_name": f"Employee {employee_id}",
+        "email": f"{employee_id.lower()}@example.com",
+        "department": "Engineering",
+    }
+
+
+def test_read_after_write_goes_to_primary(replica_client, replica_reads):
+    assert replica_client.get("/api/v1/employees").json() == []
+    assert len(replica_reads) == 1
+
+    response = replica_client.post("/api/v1/employees", json=_employee("E001"))
+    assert response.status_code == 201
+    assert float(response.cookies[READ_YOUR_WRITES_COOKIE]) > time.time()
+
+    bypassed = result_cache.stats()["bypassed"]
+    employees = replica_client.get("/api/v1/employees").json()
+
+    assert [employee["employee_id"] for employee in employees] == ["E001"]
+    assert len(replica_reads) == 1
+    # The cache may hold rows loaded from the lagging replica
+    assert result_cache.stats()["bypassed"] == bypassed + 1
+
+
+def test_expired_cookie_reads_from_replica(replica_client, replica_reads):
+    replica_client.cookies.set(READ_YOUR_WRITES_COOKIE, f"{time.time() - 1:.3f}")
+
+    replica_client.get("/api/v1/employees")
+
+    assert len(replica_reads) == 1
+
+
+def test_failed_write_sets_no_cookie(replica_client, replica_reads):
+    response = replica_client.post("/api/v1/employees", json={**_employee("E001"), "email": "not-an-email"})
+
+    assert response.status_code == 422
+    assert READ_YOUR_WRITES_COOKIE not in response.cookies
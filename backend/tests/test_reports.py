@@ -0,0 +1,78 @@
+import pytest
+
+# 28 December 2024 is a Saturday; the year ends on a Tuesday
+E001_MARKS = [
+    ("2024-12-28", "Absent"),
+    ("2024-12-29", "Absent"),
+    ("2024-12-30", "Absent"),
+    ("2024-12-31", "Absent"),
+    ("2025-01-01", "Absent"),
+    ("2025-01-02", "Present"),
+    ("2025-01-03", "Absent"),
+    # 4 and 5 January unmarked, which ends the run
+    ("2025-01-06", "Absent"),
+]
+
+
+@pytest.fixture
+def marked(client, create_employee):
+    employees = [create_employee("E001"), create_employee("E002"), create_employee("E003", "Sales")]
+    records = [(employees[0], day, status) for day, status in E001_MARKS]
+    records += [(employees[1], "2025-01-01", "Absent"), (employees[1], "2025-01-02", "Present")]
+    records += [(employees[2], "2025-01-02", "Present")]
+    response = client.post("/api/v1/attendance/bulk", json={"records": [
+        {"employee_id": employee["id"], "date": day, "status": status} for employee, day, status in records
+    ]})
+    assert response.json()["created"] == len(records), response.text
+    return employees
+
+
+def _report(client, **params) -> dict:
+    response = client.get("/api/v1/reports/attendance", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _figures(report: dict) -> tuple:
+    return (
+        report["marked_days"],
+        report["present_days"],
+        report["absent_days"],
+        report["attendance_rate"],
+        report["longest_absence"],
+        report["absences_by_weekday"],
+    )
+
+
+def test_employee_figures_across_a_year_boundary(client, marked):
+    report = _report(client, from_date="2024-12-20", to_date="2025-01-10", group_by="employee")
+
+    first, second, third = report["employees"]
+    assert first["employee_code"] == "E001"
+    assert _figures(first) == (8, 1, 7, 0.125, 5, [2, 1, 1, 0, 1, 1, 1])
+    assert _figures(second) == (2, 1, 1, 0.5, 1, [0, 0, 1, 0, 0, 0, 0])
+    assert _figures(third) == (1, 1, 0, 1.0, 0, [0] * 7)
+
+
+def test_range_edges_cut_runs_and_weekdays(client, marked):
+    report = _report(client, from_date="2024-12-29", to_date="2025-01-05", group_by="employee")
+
+    assert _figures(report["employees"][0]) == (6, 1, 5, round(1 / 6, 4), 4, [1, 1, 1, 0, 1, 0, 1])
+
+
+def test_department_figures(client, marked):
+    report = _report(client, from_date="2024-12-20", to_date="2025-01-10")
+
+    assert report["from_date"] == "2024-12-20"
+    engineering, sales = report["departments"]
+    assert (engineering["department"], engineering["employees"]) == ("Engineering", 2)
+    # Summed over employees, except the longest run, which is the longest of theirs
+    assert _figures(engineering) == (10, 2, 8, 0.2, 5, [2, 1, 2, 0, 1, 1, 1])
+    assert (sales["department"], _figures(sales)) == ("Sales", (1, 1, 0, 1.0, 0, [0] * 7))
+
+
+def test_range_without_marks(client, marked):
+    report = _report(client, from_date="2024-06-01", to_date="2024-06-30", group_by="employee")
+
+    assert [_figures(employee) for employee in report["employees"]] == [(0, 0, 0, None, 0, [0] * 7)] * 3
+    assert _report(client, from_date="2024-06-01", to_date="2024-06-30")["departments"] == []
@@ -0,0 +1,41 @@
+from sqlalchemy import inspect, text
+from app import database
+from app.database import init_db
+from app.utils.diagnostics import query_budget
+
+
+def test_init_db_adds_indexes_missing_from_existing_tables(client):
+    with database.engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_attendance_date_id"))
+        connection.execute(text("DELETE FROM schema_version"))
+
+    assert init_db() is True
+    indexes = {index["name"] for index in inspect(database.engine).get_indexes("attendance")}
+    assert "ix_attendance_date_id" in indexes
+
+
+def test_current_schema_costs_one_lookup_and_no_ddl(client):
+    init_db()
+
+    with query_budget(1) as statements:
+        assert init_db() is False
+    assert [statement.upper().split()[0] for statement in statements] == ["SELECT"]
+
+
+def test_schema_is_not_marked_current_while_a_column_is_missing(client):
+    with database.engine.begin() as connection:
+        connection.execute(text("ALTER TABLE attendance_archive_months DROP COLUMN archived_at"))
+        connection.execute(text("DELETE FROM schema_version"))
+    try:
+        assert init_db() is True
+        with database.engine.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM schema_version")).scalar() == 0
+        # A few PRAGMAs per table to find what is missing, then the DDL
+        with query_budget(15 * len(database.Base.metadata.tables)) as statements:
+            init_db()
+        assert any(statement.upper().startswith("PRAGMA") for statement in statements)
+    finally:
+        with database.engine.begin() as connection:
+            connection.execute(text("ALTER TABLE attendance_archive_months ADD COLUMN archived_at DATETIME"))
+    assert init_db() is True
+    assert init_db() is False
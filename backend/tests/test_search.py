@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.repositories import employee_search
+
+EMPLOYEES = [
+    ("ENG", "Ann Lee"),
+    ("ENG2", "Bob Stone"),
+    ("XYZ", "Zed Engle"),
+    ("A_B", "Carl 100% Sure"),
+    ("QRS", "Dana Hey!"),
+]
+
+
+@pytest.fixture
+def employees(client):
+    for employee_id, full_name in EMPLOYEES:
+        response = client.post("/api/v1/employees", json={
+            "employee_id": employee_id,
+            "full_name": full_name,
+            "email": f"{employee_id.lower()}@example.com",
+            "department": "Engineering",
+        })
+        assert response.status_code == 201, response.text
+
+
+@pytest.fixture(params=["fts5", "like"])
+def backend(request, monkeypatch):
+    monkeypatch.setattr(employee_search, "_backend", employee_search._backend)
+    employee_search.use_search(request.param)
+    return request.param
+
+
+def _search(client, term: str, limit: int = None) -> list:
+    params = {"search": term}
+    if limit:
+        params["limit"] = limit
+    response = client.get("/api/v1/employees", params=params)
+    assert response.status_code == 200, response.text
+    return [employee["employee_id"] for employee in response.json()]
+
+
+def test_exact_id_ranks_before_prefix_before_substring(client, employees, backend):
+    assert _search(client, "eng") == ["ENG", "ENG2", "XYZ"]
+    assert _search(client, "ENG", limit=2) == ["ENG", "ENG2"]
+
+
+def test_short_terms_fall_back_to_substring_scan(client, employees, backend):
+    assert len("an") < employee_search.SqliteFtsSearch.MIN_TERM_LENGTH
+    assert _search(client, "an") == ["ENG", "QRS"]
+
+
+def test_like_wildcards_are_matched_literally(client, employees, backend):
+    assert _search(client, "_") == ["A_B"]
+    assert _search(client, "%") == ["A_B"]
+    assert _search(client, "0% s") == ["A_B"]
+    assert _search(client, "!") == ["QRS"]
+
+
+def test_blank_search_returns_nothing(client, employees):
+    assert _search(client, "   ") == []
+
+
+class _CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    def scalars(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def all(self):
+        return []
+
+
+def test_trigram_search_statement():
+    session = _CapturingSession()
+    employee_search.PostgresTrigramSearch().search(session, "a_b", 5)
+
+    sql = str(session.statements[0].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    # The psycopg2 dialect doubles literal percent signs
+    sql = sql.replace("%%", "%")
+    assert "employees.full_name % 'a_b'" in sql
+    assert "ILIKE '%a!_b%' ESCAPE '!'" in sql
+    assert "similarity(employees.employee_id, 'a_b')" in sql
+    assert "LIMIT 5" in sql
@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+from sqlalchemy import select
+from starlette.responses import JSONResponse
+from app.models import Attendance, Employee
+from app.schemas import AttendanceResponse, EmployeeResponse
+
+NAMES = ["Zoë Ñúñez", "李小龙", 'Quote "Q" Back\\slash', "Tag </script> 🙂"]
+
+
+def _pydantic_body(schema, objects) -> bytes:
+    """The body FastAPI produced for response_model=List[schema] before the raw JSON path."""
+    return JSONResponse([schema.model_validate(obj).model_dump(mode="json") for obj in objects]).body
+
+
+def _create(client, n: int, full_name: str) -> dict:
+    response = client.post("/api/v1/employees", json={
+        "employee_id": f"E00{n}",
+        "full_name": full_name,
+        "email": f"e00{n}@example.com",
+        "department": "Engineering",
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_employee_list_is_byte_compatible(client, db):
+    for n, name in enumerate(NAMES, 1):
+        _create(client, n, name)
+
+    response = client.get("/api/v1/employees")
+
+    by_id = {employee.id: employee for employee in db.scalars(select(Employee))}
+    expected = _pydantic_body(EmployeeResponse, [by_id[item["id"]] for item in response.json()])
+    assert response.content == expected
+    assert response.headers["Content-Type"] == "application/json"
+
+
+def test_attendance_list_is_byte_compatible(client, db):
+    employees = [_create(client, n, name) for n, name in enumerate(NAMES, 1)]
+    for days_ago, status in ((0, "Present"), (1, "Absent"), (40, "Present")):
+        for employee in employees:
+            client.post("/api/v1/attendance", json={
+                "employee_id": employee["id"],
+                "date": (date.today() - timedelta(days=days_ago)).isoformat(),
+                "status": status,
+            })
+
+    for params, count in (({}, 12), ({"limit": 5}, 5)):
+        response = client.get("/api/v1/attendance", params=params)
+        assert len(response.json()) == count
+
+        by_id = {record.id: record for record in db.scalars(select(Attendance))}
+        expected = _pydantic_body(AttendanceResponse, [by_id[item["id"]] for item in response.json()])
+        assert response.content == expected
@@ -4,6 +4,8 @@ import { ApiError } from '../types';
 
 const api = axios.create({
   baseURL: API_BASE_URL,
+  // Sends the backend's read-your-writes cookie so reads after a write see it
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },